@@ -5,13 +5,16 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
+from ._pages.browser_pool import BrowserPool
 from ._pages.chromium_page import ChromiumPage
 from ._pages.session_page import SessionPage
 from ._pages.web_page import WebPage
+from ._functions.parallel import run_parallel
 
 # 启动配置类
 from ._configs.chromium_options import ChromiumOptions
 from ._configs.session_options import SessionOptions
 
-__all__ = ['ChromiumPage', 'ChromiumOptions', 'SessionOptions', 'SessionPage', 'WebPage', '__version__']
+__all__ = ['ChromiumPage', 'BrowserPool', 'ChromiumOptions', 'SessionOptions', 'SessionPage', 'WebPage', 'run_parallel',
+           '__version__']
 __version__ = '4.0.4.21'
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from asyncio import Queue, ensure_future, wait_for, get_event_loop, TimeoutError as AsyncTimeoutError, iscoroutine
+from functools import partial
+
+try:
+    from asyncio import current_task
+except ImportError:  # python3.6
+    from asyncio import Task
+
+    current_task = Task.current_task
+
+from .driver import get_json_codec, _peek_method
+from .._functions.settings import Settings
+from ..errors import TargetNotFoundError
+
+
+class AsyncDriver(object):
+    """以asyncio方式与浏览器通讯的驱动，一个事件循环可同时管理多个标签页，不额外创建线程"""
+
+    def __init__(self, tab_id, tab_type, address, owner=None):
+        """
+        :param tab_id: 标签页id
+        :param tab_type: 标签页类型
+        :param address: 浏览器连接地址
+        :param owner: 创建这个驱动的对象
+        """
+        self.id = tab_id
+        self.address = address
+        self.type = tab_type
+        self.owner = owner
+        self.alert_flag = False  # 标记alert出现
+
+        self._websocket_url = f'ws://{address}/devtools/{tab_type}/{tab_id}'
+        self._cur_id = 0
+        self._ws = None
+        self._dumps, self._loads = get_json_codec(Settings.json_codec)
+        self._recv_task = None
+        self._tasks = set()  # 协程回调方法生成的任务
+        self._stopped = True
+
+        self.event_handlers = {}
+        self.event_streams = {}
+        self.method_results = {}
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    async def _send(self, message, timeout=None):
+        """发送信息到浏览器，并返回浏览器返回的信息
+        :param message: 发送给浏览器的数据
+        :param timeout: 超时时间，为None表示无限
+        :return: 浏览器返回的数据
+        """
+        self._cur_id += 1
+        ws_id = self._cur_id
+        message['id'] = ws_id
+        future = get_event_loop().create_future()
+        self.method_results[ws_id] = (message['method'], future)
+        try:
+            message_json = self._dumps(message)
+            if isinstance(message_json, bytes):  # websockets会把bytes作为二进制帧发送
+                message_json = message_json.decode()
+            await self._ws.send(message_json)
+            if timeout == 0:
+                self.method_results.pop(ws_id, None)
+                return {'id': ws_id, 'result': {}}
+
+        except Exception:
+            self.method_results.pop(ws_id, None)
+            return {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
+
+        try:
+            return await wait_for(future, timeout)
+        except AsyncTimeoutError:
+            return {'error': {'message': 'alert exists.'}, 'type': 'alert_exists'} \
+                if self.alert_flag else {'error': {'message': 'timeout'}, 'type': 'timeout'}
+        finally:
+            self.method_results.pop(ws_id, None)
+
+    async def _recv_loop(self):
+        """接收浏览器信息的任务"""
+        while not self._stopped:
+            try:
+                msg_json = await self._ws.recv()
+                method = _peek_method(msg_json)
+                if method is not None and not (method in self.event_handlers or method in self.event_streams
+                                               or method.startswith('Page.javascriptDialog')):
+                    continue
+                msg = self._loads(msg_json)
+            except Exception:  # 连接断开或数据无法解析
+                await self._stop()
+                return
+
+            if 'method' in msg:
+                if msg['method'].startswith('Page.javascriptDialog'):
+                    self.alert_flag = msg['method'].endswith('Opening')
+                    if self.alert_flag:
+                        self._cancel_by_alert()
+                self._dispatch(msg)
+
+            elif msg.get('id') in self.method_results:
+                future = self.method_results[msg['id']][1]
+                if not future.done():
+                    future.set_result(msg)
+
+    def _dispatch(self, event):
+        """把事件分发给回调方法和事件流，回调方法出错时交给事件循环的异常处理方法记录，不中断接收任务
+        :param event: 事件数据
+        :return: None
+        """
+        function = self.event_handlers.get(event['method'])
+        if function:
+            try:
+                r = function(**event['params'])
+                if iscoroutine(r):
+                    task = ensure_future(r)
+                    self._tasks.add(task)
+                    task.add_done_callback(partial(self._on_task_done, event['method']))
+            except Exception as e:
+                get_event_loop().call_exception_handler({'message': f'{event["method"]}事件的回调方法出错',
+                                                         'exception': e})
+
+        for stream in self.event_streams.get(event['method'], ()):
+            stream._queue.put_nowait(event['params'])
+
+    def _on_task_done(self, method, task):
+        """协程回调方法结束时调用，移除任务记录，出错时交给事件循环的异常处理方法记录
+        :param method: 事件名称
+        :param task: 已结束的任务
+        :return: None
+        """
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            get_event_loop().call_exception_handler({'message': f'{method}事件的回调方法出错',
+                                                     'exception': task.exception(), 'task': task})
+
+    def _cancel_by_alert(self):
+        """alert出现时，使等待中的Input和Runtime指令立即返回"""
+        for method, future in list(self.method_results.values()):
+            if method.startswith(('Input.', 'Runtime.')) and not future.done():
+                future.set_result({'error': {'message': 'alert exists.'}, 'type': 'alert_exists'})
+
+    async def run(self, _method, **kwargs):
+        """执行cdp方法
+        :param _method: cdp方法名
+        :param kwargs: cdp参数
+        :return: 执行结果
+        """
+        if self._stopped:
+            return {'error': 'connection disconnected', 'type': 'connection_error'}
+
+        timeout = kwargs.pop('_timeout', Settings.cdp_timeout)
+        result = await self._send({'method': _method, 'params': kwargs}, timeout=timeout)
+        if 'result' not in result and 'error' in result:
+            kwargs['_timeout'] = timeout
+            return {'error': result['error']['message'], 'type': result.get('type', 'call_method_error'),
+                    'method': _method, 'args': kwargs}
+        else:
+            return result['result']
+
+    async def start(self):
+        """启动连接"""
+        try:
+            from websockets import connect
+            from websockets.exceptions import InvalidHandshake
+        except ImportError:
+            raise ImportError('请先安装：pip install websockets')
+
+        try:
+            self._ws = await connect(self._websocket_url, max_size=None, ping_interval=None, compression=None)
+        except InvalidHandshake as e:
+            response = getattr(e, 'response', None)
+            status = getattr(response, 'status_code', None) or getattr(e, 'status_code', None)
+            if status == 403:
+                raise RuntimeError('请升级websockets库。')
+            elif status is not None:
+                raise TargetNotFoundError(f'找不到页面：{self.id}。')
+            raise e
+
+        self._stopped = False
+        self._recv_task = ensure_future(self._recv_loop())
+        return True
+
+    async def stop(self):
+        """中断连接"""
+        await self._stop()
+        if self._recv_task and not self._recv_task.done():
+            self._recv_task.cancel()
+        return True
+
+    async def _stop(self):
+        """中断连接"""
+        if self._stopped:
+            return False
+
+        self._stopped = True
+        if self._ws:
+            await self._ws.close()
+            self._ws = None
+
+        for _, future in self.method_results.values():
+            if not future.done():
+                future.set_result({'error': {'message': 'connection disconnected'}, 'type': 'connection_error'})
+        self.method_results.clear()
+        self.event_handlers.clear()
+        for streams in self.event_streams.values():
+            for stream in streams:
+                stream._queue.put_nowait(None)
+        self.event_streams.clear()
+        current = current_task()
+        for task in list(self._tasks):
+            if task is not current:  # 在回调方法中断开连接时不取消自身
+                task.cancel()
+
+        if hasattr(self.owner, '_on_disconnect'):
+            self.owner._on_disconnect()
+
+    def set_callback(self, event, callback):
+        """绑定cdp event和回调方法，回调方法可以是普通方法或协程方法
+        :param event: cdp event
+        :param callback: 绑定到cdp event的回调方法
+        :return: None
+        """
+        if callback:
+            self.event_handlers[event] = callback
+        else:
+            self.event_handlers.pop(event, None)
+
+    def listen(self, event):
+        """返回一个异步迭代器，用async for逐个获取cdp event的参数
+        :param event: cdp event
+        :return: AsyncEventStream对象
+        """
+        return AsyncEventStream(self, event)
+
+
+class AsyncEventStream(object):
+    """以异步迭代器方式获取cdp event的类"""
+
+    def __init__(self, driver, event):
+        """
+        :param driver: AsyncDriver对象
+        :param event: cdp event
+        """
+        self._driver = driver
+        self._event = event
+        self._queue = Queue()
+        driver.event_streams.setdefault(event, []).append(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        params = await self._queue.get()
+        if params is None:
+            raise StopAsyncIteration
+        return params
+
+    def close(self):
+        """停止接收事件"""
+        streams = self._driver.event_streams.get(self._event, [])
+        if self in streams:
+            streams.remove(self)
+        self._queue.put_nowait(None)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from asyncio import Queue, Future, Task
+from typing import Union, Callable, Dict, Optional, List, Tuple, Awaitable, Set
+
+
+class AsyncDriver(object):
+    id: str
+    address: str
+    type: str
+    owner = ...
+    alert_flag: bool
+    _websocket_url: str
+    _cur_id: int
+    _ws = ...
+    _dumps: Callable[[dict], Union[str, bytes]]
+    _loads: Callable[[Union[str, bytes]], dict]
+    _recv_task: Optional[Task]
+    _tasks: Set[Task]
+    _stopped: bool
+    event_handlers: Dict[str, Callable]
+    event_streams: Dict[str, List[AsyncEventStream]]
+    method_results: Dict[int, Tuple[str, Future]]
+
+    def __init__(self, tab_id: str, tab_type: str, address: str, owner=None): ...
+
+    async def __aenter__(self) -> AsyncDriver: ...
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    async def _send(self, message: dict, timeout: float = None) -> dict: ...
+
+    async def _recv_loop(self) -> None: ...
+
+    def _dispatch(self, event: dict) -> None: ...
+
+    def _on_task_done(self, method: str, task: Task) -> None: ...
+
+    def _cancel_by_alert(self) -> None: ...
+
+    async def run(self, _method: str, **kwargs) -> dict: ...
+
+    async def start(self) -> bool: ...
+
+    async def stop(self) -> bool: ...
+
+    async def _stop(self) -> bool: ...
+
+    def set_callback(self, event: str, callback: Union[Callable[..., Union[None, Awaitable]], None]) -> None: ...
+
+    def listen(self, event: str) -> AsyncEventStream: ...
+
+
+class AsyncEventStream(object):
+    _driver: AsyncDriver
+    _event: str
+    _queue: Queue
+
+    def __init__(self, driver: AsyncDriver, event: str): ...
+
+    def __aiter__(self) -> AsyncEventStream: ...
+
+    async def __anext__(self) -> dict: ...
+
+    def close(self) -> None: ...
@@ -8,12 +8,12 @@
 from os import waitpid
 from pathlib import Path
 from shutil import rmtree
+from threading import Condition
 from time import perf_counter, sleep
 
-from websocket import WebSocketBadStatusException
-
-from .driver import BrowserDriver, Driver
-from .._functions.tools import raise_error
+from .driver import BrowserDriver, Driver, SessionDriver
+from .._functions.settings import Settings
+from .._functions.tools import raise_error, wait_pids_exit
 from .._units.downloader import DownloadManager
 from ..errors import PageDisconnectedError
 
@@ -46,12 +46,23 @@ class Browser(object):
 
         self.page = page
         self.address = address
+        self._flat_session = page._chromium_options.is_flat_session
+        self._pipe = page._chromium_options.is_pipe
         self._driver = BrowserDriver(browser_id, 'browser', address, self)
         self.id = browser_id
         self._frames = {}
         self._drivers = {}
         self._all_drivers = {}
+        self._closing = set()  # 已发出关闭指令，未收到关闭事件的标签页id
+        self._driver_errors = {}  # 标签页创建事件中新建Driver失败的异常，格式：{tab_id: Exception}
+        self._own_contexts = {}  # 用new_context参数自动新建的上下文，最后一个标签页关闭时销毁，格式：{context_id: {tab_id}}
+        # 由事件维护的目标信息，按新建和activate_tab()的顺序排列，最近的在最后，格式：{target_id: info}
+        # 用户手动切换标签页时浏览器不发出事件，需要准确的激活顺序时先调用_sync_targets()
+        self._targets = {}
+        self._targets_changed = Condition()
         self._connected = False
+        self._supervisor = None  # 浏览器或标签页崩溃时负责恢复的Supervisor对象
+        self._quitting = False
 
         self._process_id = None
         try:
@@ -66,6 +77,9 @@ class Browser(object):
         self.run_cdp('Target.setDiscoverTargets', discover=True)
         self._driver.set_callback('Target.targetDestroyed', self._onTargetDestroyed)
         self._driver.set_callback('Target.targetCreated', self._onTargetCreated)
+        self._driver.set_callback('Target.targetInfoChanged', self._onTargetInfoChanged)
+        self._driver.set_callback('Target.targetCrashed', self._onTargetCrashed)
+        self._sync_targets()
 
     def _get_driver(self, tab_id, owner=None):
         """新建并返回指定tab id的Driver
@@ -75,33 +89,89 @@ class Browser(object):
         """
         d = self._drivers.pop(tab_id, None)
         if not d:
-            d = Driver(tab_id, 'page', self.address)
+            d = self._new_driver(tab_id)
         d.owner = owner
         self._all_drivers.setdefault(tab_id, set()).add(d)
         return d
 
+    def _new_driver(self, tab_id, owner=None):
+        """新建一个连接到指定tab id的Driver，flat session模式下复用浏览器连接
+        :param tab_id: 标签页id
+        :param owner: 使用该驱动的对象
+        :return: Driver或SessionDriver对象
+        """
+        if self._flat_session:
+            return SessionDriver(tab_id, 'page', self._driver, owner)
+        return Driver(tab_id, 'page', self.address, owner)
+
     def _onTargetCreated(self, **kwargs):
         """标签页创建时执行"""
+        if kwargs['targetInfo']['type'] != 'browser':
+            with self._targets_changed:
+                tid = kwargs['targetInfo']['targetId']
+                self._targets[tid] = self._target_info(kwargs['targetInfo'], self._targets.get(tid))
+                context = self._own_contexts.get(kwargs['targetInfo'].get('browserContextId'))
+                if context is not None:  # 自动新建的上下文中打开的其它标签页，如弹出窗口
+                    context.add(tid)
+
         if (kwargs['targetInfo']['type'] in ('page', 'webview')
                 and kwargs['targetInfo']['targetId'] not in self._all_drivers
                 and not kwargs['targetInfo']['url'].startswith('devtools://')):
             try:
                 tab_id = kwargs['targetInfo']['targetId']
-                d = Driver(tab_id, 'page', self.address)
+                d = self._new_driver(tab_id)
                 self._drivers[tab_id] = d
                 self._all_drivers.setdefault(tab_id, set()).add(d)
-            except WebSocketBadStatusException:
-                pass
+            except Exception as e:
+                self._driver_errors[tab_id] = e
+            with self._targets_changed:
+                self._targets_changed.notify_all()
 
     def _onTargetDestroyed(self, **kwargs):
         """标签页关闭时执行"""
         tab_id = kwargs['targetId']
+        with self._targets_changed:  # 先移除记录，使Driver断开时能判断标签页是否已关闭
+            self._targets.pop(tab_id, None)
+            self._driver_errors.pop(tab_id, None)
+            empty = [k for k, v in self._own_contexts.items() if tab_id in v and len(v) == 1]
+            for v in self._own_contexts.values():
+                v.discard(tab_id)
+            for k in empty:
+                self._own_contexts.pop(k)
+        self._clear_target(tab_id)
+        with self._targets_changed:
+            self._closing.discard(tab_id)
+            self._targets_changed.notify_all()
+        for context_id in empty:
+            self._driver.run('Target.disposeBrowserContext', browserContextId=context_id, _timeout=0)
+
+    def _onTargetInfoChanged(self, **kwargs):
+        """标签页信息变化时执行，不改变激活顺序"""
+        info = kwargs['targetInfo']
+        with self._targets_changed:
+            if info['targetId'] in self._targets:
+                self._targets[info['targetId']] = self._target_info(info, self._targets[info['targetId']])
+
+    def _onTargetCrashed(self, **kwargs):
+        """标签页渲染进程崩溃时执行"""
+        if self._supervisor is not None:
+            self._supervisor._on_target_crashed(kwargs['targetId'], kwargs.get('status'))
+
+    def _on_reconnect(self):
+        """连接断开并重连后执行，重新获取目标信息"""
+        self._sync_targets()
+
+    def _clear_target(self, tab_id):
+        """清除标签页相关数据并停止其Driver
+        :param tab_id: 标签页id
+        :return: None
+        """
         if hasattr(self, '_dl_mgr'):
             self._dl_mgr.clear_tab_info(tab_id)
         for key in [k for k, i in self._frames.items() if i == tab_id]:
             self._frames.pop(key, None)
         for d in self._all_drivers.get(tab_id, tuple()):
-            d.stop()
+            d._stop()  # 不等待线程结束，避免批量关闭时逐个等待
         self._drivers.pop(tab_id, None)
         self._all_drivers.pop(tab_id, None)
 
@@ -128,15 +198,54 @@ class Browser(object):
     @property
     def tabs_count(self):
         """返回标签页数量"""
-        j = self.run_cdp('Target.getTargets')['targetInfos']  # 不要改用get，避免卡死
-        return len([i for i in j if i['type'] in ('page', 'webview') and not i['url'].startswith('devtools://')])
+        return len([i for i in self._get_targets()
+                    if i['type'] in ('page', 'webview') and not i['url'].startswith('devtools://')])
 
     @property
     def tab_ids(self):
         """返回所有标签页id组成的列表"""
-        j = self._driver.get(f'http://{self.address}/json').json()  # 不要改用cdp，因为顺序不对
+        j = self._get_targets()
         return [i['id'] for i in j if i['type'] in ('page', 'webview') and not i['url'].startswith('devtools://')]
 
+    def _get_targets(self):
+        """从本地记录返回/json接口格式的所有目标信息，最近激活的在前
+        :return: dict格式的目标信息列表
+        """
+        with self._targets_changed:
+            return [dict(i) for i in reversed(self._targets.values())]
+
+    def _sync_targets(self):
+        """从浏览器重新获取所有目标信息，重建本地记录。
+        管道模式下没有http接口，用cdp获取，其结果不含激活顺序，已有记录的目标保持原来的顺序
+        :return: None
+        """
+        if self._pipe:
+            infos = {i['targetId']: self._target_info(i) for i in self.run_cdp('Target.getTargets')['targetInfos']
+                     if i['type'] != 'browser'}
+            with self._targets_changed:
+                targets = {k: infos.pop(k) for k in self._targets if k in infos}
+                targets.update(infos)
+                self._targets = targets
+                self._targets_changed.notify_all()
+            return
+
+        infos = self._driver.get(f'http://{self.address}/json').json()
+        with self._targets_changed:
+            self._targets = {i['id']: i for i in reversed(infos)}
+            self._targets_changed.notify_all()
+
+    def _target_info(self, info, old=None):
+        """把cdp的targetInfo转换为/json接口格式
+        :param info: targetInfo
+        :param old: 已有的记录，会保留其中targetInfo没有的项
+        :return: dict格式的目标信息
+        """
+        r = dict(old) if old else {'description': '', 'devtoolsFrontendUrl': ''}
+        r.update({'id': info['targetId'], 'title': info['title'], 'type': info['type'], 'url': info['url']})
+        if not self._pipe:
+            r['webSocketDebuggerUrl'] = f'ws://{self.address}/devtools/{info["type"]}/{info["targetId"]}'
+        return r
+
     @property
     def process_id(self):
         """返回浏览器进程id"""
@@ -149,7 +258,7 @@ class Browser(object):
         :param tab_type: tab类型，可用列表输入多个
         :return: dict格式的tab信息列表列表
         """
-        tabs = self._driver.get(f'http://{self.address}/json').json()  # 不要改用cdp
+        tabs = self._get_targets()
 
         if isinstance(tab_type, str):
             tab_type = {tab_type}
@@ -166,8 +275,24 @@ class Browser(object):
         :param tab_id: 标签页id
         :return: None
         """
-        self._onTargetDestroyed(targetId=tab_id)
-        self.driver.run('Target.closeTarget', targetId=tab_id)
+        self.close_tabs((tab_id,), timeout=0)
+
+    def close_tabs(self, tab_ids, timeout=3):
+        """同时关闭多个标签页，并等待浏览器确认关闭
+        :param tab_ids: 标签页id组成的列表
+        :param timeout: 等待浏览器发出关闭事件的超时时间（秒），为0时不等待
+        :return: None
+        """
+        tab_ids = set(tab_ids)
+        with self._targets_changed:
+            self._closing.update(tab_ids)
+        for tab_id in tab_ids:
+            self._clear_target(tab_id)
+        self.driver.run_many([('Target.closeTarget', {'targetId': i}) for i in tab_ids])
+        with self._targets_changed:
+            if timeout:
+                self._targets_changed.wait_for(lambda: not self._closing & tab_ids, timeout)
+            self._closing -= tab_ids
 
     def stop_driver(self, driver):
         """停止一个Driver
@@ -183,6 +308,9 @@ class Browser(object):
         :return: None
         """
         self.run_cdp('Target.activateTarget', targetId=tab_id)
+        with self._targets_changed:
+            if tab_id in self._targets:
+                self._targets[tab_id] = self._targets.pop(tab_id)
 
     def get_window_bounds(self, tab_id=None):
         """返回浏览器窗口位置和大小信息
@@ -191,29 +319,93 @@ class Browser(object):
         """
         return self.run_cdp('Browser.getWindowForTarget', targetId=tab_id or self.id)['bounds']
 
-    def new_tab(self, new_window=False, background=False, new_context=False):
+    def new_tab(self, new_window=False, background=False, new_context=False, context=None):
         """新建一个标签页
         :param new_window: 是否在新窗口打开标签页
         :param background: 是否不激活新标签页，如new_window为True则无效
-        :param new_context: 是否创建新的上下文
+        :param new_context: 是否创建新的上下文，标签页关闭时自动销毁
+        :param context: 在指定id的上下文中创建，new_context为True时无效
         :return: 新标签页id
         """
-        bid = None
+        return self.new_tabs(1, None, new_window, background, new_context, context)[0]
+
+    def new_tabs(self, count=None, urls=None, new_window=False, background=False, new_context=False, context=None):
+        """同时新建多个标签页，所有指令一次发出，并等待浏览器发出创建事件
+        :param count: 要新建的标签页数量，为None时与urls数量相同
+        :param urls: 各标签页创建时打开的网址组成的列表，不足count个的打开空白页
+        :param new_window: 是否在新窗口打开标签页
+        :param background: 是否不激活新标签页，如new_window为True则无效
+        :param new_context: 是否为每个标签页创建新的上下文，标签页关闭时自动销毁
+        :param context: 在指定id的上下文中创建，new_context为True时无效
+        :return: 新标签页id组成的列表
+        """
+        urls = list(urls or ())
+        if count is None:
+            count = len(urls)
+        urls += [''] * (count - len(urls))
+
+        bids = self.new_contexts(count) if new_context else [context] * count
+
+        cmds = []
+        for url, bid in zip(urls, bids):
+            kwargs = {'url': url}
+            if new_window:
+                kwargs['newWindow'] = True
+            if background:
+                kwargs['background'] = True
+            if bid:
+                kwargs['browserContextId'] = bid
+            cmds.append(('Target.createTarget', kwargs))
+
+        results = self._driver.run_many(cmds)
+        tids = [i['targetId'] for i in results if __ERROR__ not in i]
         if new_context:
-            bid = self.run_cdp('Target.createBrowserContext')['browserContextId']
+            with self._targets_changed:
+                for bid, r in zip(bids, results):
+                    if __ERROR__ not in r:
+                        self._own_contexts.setdefault(bid, set()).add(r['targetId'])
+        with self._targets_changed:  # 超时也不影响使用，_get_driver()会自行新建Driver
+            self._targets_changed.wait_for(lambda: all(i in self._drivers or i in self._driver_errors for i in tids),
+                                           Settings.cdp_timeout)
+            errors = [self._driver_errors.pop(i) for i in tids if i in self._driver_errors]
+
+        failed = [i for i in results if __ERROR__ in i]
+        if failed or errors:  # 有标签页创建失败时关闭已创建的，不留下部分结果
+            if tids:
+                self.close_tabs(tids)
+            if new_context and failed:
+                self.dispose_contexts([bid for bid, r in zip(bids, results) if __ERROR__ in r])
+            if failed:
+                raise_error(failed[0])
+            raise errors[0]
+        return tids
 
-        kwargs = {'url': ''}
-        if new_window:
-            kwargs['newWindow'] = True
-        if background:
-            kwargs['background'] = True
-        if bid:
-            kwargs['browserContextId'] = bid
+    @property
+    def context_ids(self):
+        """返回除默认上下文外所有上下文的id"""
+        return self.run_cdp('Target.getBrowserContexts')['browserContextIds']
+
+    def new_contexts(self, count=1):
+        """同时新建多个上下文，每个上下文的cookies、缓存和存储互相隔离
+        :param count: 要新建的数量
+        :return: 新上下文id组成的列表
+        """
+        r = self._driver.run_many(['Target.createBrowserContext'] * count)
+        return [raise_error(i) if __ERROR__ in i else i['browserContextId'] for i in r]
 
-        tid = self.run_cdp('Target.createTarget', **kwargs)['targetId']
-        while tid not in self._drivers:
-            sleep(.1)
-        return tid
+    def dispose_contexts(self, context_ids):
+        """同时销毁多个上下文，其中的标签页会被关闭，数据会被清除
+        :param context_ids: 上下文id组成的列表
+        :return: None
+        """
+        context_ids = list(context_ids)
+        with self._targets_changed:
+            for i in context_ids:
+                self._own_contexts.pop(i, None)
+        for r in self._driver.run_many([('Target.disposeBrowserContext', {'browserContextId': i})
+                                        for i in context_ids]):
+            if __ERROR__ in r:
+                raise_error(r)
 
     def reconnect(self):
         """断开重连"""
@@ -223,6 +415,9 @@ class Browser(object):
         self.run_cdp('Target.setDiscoverTargets', discover=True)
         self._driver.set_callback('Target.targetDestroyed', self._onTargetDestroyed)
         self._driver.set_callback('Target.targetCreated', self._onTargetCreated)
+        self._driver.set_callback('Target.targetInfoChanged', self._onTargetInfoChanged)
+        self._driver.set_callback('Target.targetCrashed', self._onTargetCrashed)
+        self._sync_targets()
 
     def quit(self, timeout=5, force=False):
         """关闭浏览器
@@ -230,6 +425,7 @@ class Browser(object):
         :param force: 是否立刻强制终止进程
         :return: None
         """
+        self._quitting = True
         try:
             self.run_cdp('Browser.close')
         except PageDisconnectedError:
@@ -256,25 +452,7 @@ class Browser(object):
             except:
                 pass
 
-        from os import popen
-        from platform import system
-        end_time = perf_counter() + timeout
-        while perf_counter() < end_time:
-            ok = True
-            for pid in pids:
-                txt = f'tasklist | findstr {pid}' if system().lower() == 'windows' else f'ps -ef | grep {pid}'
-                p = popen(txt)
-                sleep(.05)
-                try:
-                    if f'  {pid} ' in p.read():
-                        ok = False
-                        break
-                except TypeError:
-                    pass
-
-            if ok:
-                break
-            sleep(.05)
+        wait_pids_exit(pids, timeout)
 
         if self.process_id:
             waitpid(self.process_id, 0)
@@ -282,6 +460,8 @@ class Browser(object):
     def _on_disconnect(self):
         self.page._on_disconnect()
         Browser.BROWSERS.pop(self.id, None)
+        if BrowserDriver.BROWSERS.get(self.id) is self._driver:
+            BrowserDriver.BROWSERS.pop(self.id)
         if self.page._chromium_options.is_auto_port and self.page._chromium_options.user_data_path:
             path = Path(self.page._chromium_options.user_data_path)
             end_time = perf_counter() + 7
@@ -294,3 +474,5 @@ class Browser(object):
                 except (PermissionError, FileNotFoundError, OSError):
                     pass
                 sleep(.05)
+        if self._supervisor is not None and not self._quitting:
+            self._supervisor._on_browser_exit(self)
@@ -5,11 +5,13 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
-from typing import List, Optional, Union, Set, Dict
+from threading import Condition
+from typing import List, Optional, Union, Set, Dict, Iterable
 
-from .driver import BrowserDriver, Driver
+from .driver import BrowserDriver, Driver, SessionDriver
 from .._pages.chromium_page import ChromiumPage
 from .._units.downloader import DownloadManager
+from .._units.supervisor import Supervisor
 
 
 class Browser(object):
@@ -21,9 +23,18 @@ class Browser(object):
     _frames: dict = ...
     _drivers: Dict[str, Driver] = ...
     _all_drivers: Dict[str, Set[Driver]] = ...
+    _closing: Set[str] = ...
+    _driver_errors: Dict[str, Exception] = ...
+    _own_contexts: Dict[str, Set[str]] = ...
+    _targets: Dict[str, dict] = ...
+    _targets_changed: Condition = ...
     _process_id: Optional[int] = ...
     _dl_mgr: DownloadManager = ...
     _connected: bool = ...
+    _flat_session: bool = ...
+    _pipe: bool = ...
+    _supervisor: Optional[Supervisor] = ...
+    _quitting: bool = ...
 
     def __new__(cls, address: str, browser_id: str, page: ChromiumPage): ...
 
@@ -31,6 +42,8 @@ class Browser(object):
 
     def _get_driver(self, tab_id: str, owner=None) -> Driver: ...
 
+    def _new_driver(self, tab_id: str, owner=None) -> Union[Driver, SessionDriver]: ...
+
     def run_cdp(self, cmd, **cmd_args) -> dict: ...
 
     @property
@@ -50,13 +63,31 @@ class Browser(object):
 
     def close_tab(self, tab_id: str) -> None: ...
 
+    def close_tabs(self, tab_ids: Iterable[str], timeout: float = 3) -> None: ...
+
     def stop_driver(self, driver: Driver) -> None: ...
 
     def activate_tab(self, tab_id: str) -> None: ...
 
     def get_window_bounds(self, tab_id: str = None) -> dict: ...
 
-    def new_tab(self, new_window: bool = False, background: bool = False, new_context: bool = False) -> str: ...
+    def new_tab(self, new_window: bool = False, background: bool = False, new_context: bool = False,
+                context: str = None) -> str: ...
+
+    def new_tabs(self,
+                 count: int = None,
+                 urls: List[str] = None,
+                 new_window: bool = False,
+                 background: bool = False,
+                 new_context: bool = False,
+                 context: str = None) -> List[str]: ...
+
+    @property
+    def context_ids(self) -> List[str]: ...
+
+    def new_contexts(self, count: int = 1) -> List[str]: ...
+
+    def dispose_contexts(self, context_ids: Iterable[str]) -> None: ...
 
     def reconnect(self) -> None: ...
 
@@ -66,6 +97,20 @@ class Browser(object):
 
     def _onTargetDestroyed(self, **kwargs) -> None: ...
 
+    def _clear_target(self, tab_id: str) -> None: ...
+
+    def _get_targets(self) -> List[dict]: ...
+
+    def _sync_targets(self) -> None: ...
+
+    def _target_info(self, info: dict, old: Optional[dict] = None) -> dict: ...
+
+    def _onTargetInfoChanged(self, **kwargs) -> None: ...
+
+    def _onTargetCrashed(self, **kwargs) -> None: ...
+
+    def _on_reconnect(self) -> None: ...
+
     def quit(self, timeout: float = 5, force: bool = False) -> None: ...
 
     def _on_disconnect(self) -> None: ...
@@ -0,0 +1,651 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from base64 import b64encode
+from hashlib import sha1
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from json import dumps, loads
+from socketserver import ThreadingMixIn
+from struct import pack, unpack
+from threading import Thread, Lock
+from urllib.parse import unquote
+from uuid import uuid4
+
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """每个请求一个线程的HTTPServer，与python3.7起的http.server.ThreadingHTTPServer相同"""
+    daemon_threads = True
+
+
+class DevToolsHandler(object):
+    """DevToolsServer处理websocket连接的基类，子类重写on_connect()和handle()方法"""
+    server = None  # 使用此对象的DevToolsServer，由DevToolsServer设置
+
+    def on_http(self, method, path):
+        """接收到http请求时调用
+        :param method: 请求方法，'GET'或'PUT'
+        :param path: 请求路径
+        :return: 返回给客户端的数据，可json序列化的对象或str，为None时返回404
+        """
+        return None
+
+    def accept(self, path):
+        """返回是否接受连接到指定路径的websocket连接
+        :param path: 连接路径
+        :return: bool
+        """
+        return True
+
+    def on_connect(self, conn):
+        """有websocket连接建立时调用
+        :param conn: WebSocketConnection对象
+        :return: None
+        """
+        pass
+
+    def handle(self, conn, msg):
+        """接收到客户端发来的一条指令时调用，通过conn.send()返回数据
+        :param conn: WebSocketConnection对象
+        :param msg: 已解析的指令
+        :return: None
+        """
+        pass
+
+
+class DevToolsServer(object):
+    """在本进程中运行的DevTools协议服务器，用于在没有浏览器的环境中测试和基准测试"""
+
+    def __init__(self, handler=None, host='127.0.0.1', port=0):
+        """
+        :param handler: 处理websocket指令的DevToolsHandler对象
+        :param host: 监听的ip
+        :param port: 监听的端口，为0时自动分配
+        """
+        self.handler = handler or DevToolsHandler()
+        self.handler.server = self
+        self.host = host
+        self.port = port
+        self.connections = []
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def address(self):
+        """返回服务器地址，格式为ip:port"""
+        return f'{self.host}:{self.port}'
+
+    def start(self):
+        """启动服务器"""
+        self._server = _ThreadingHTTPServer((self.host, self.port), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.devtools = self
+        self.port = self._server.server_address[1]
+        self._thread = Thread(target=self._server.serve_forever, kwargs={'poll_interval': .1})
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止服务器并断开所有连接"""
+        for conn in list(self.connections):
+            conn.close()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def broadcast(self, msg, path=None):
+        """向所有websocket连接发送数据
+        :param msg: 要发送的数据，dict或str
+        :param path: 只发送给连接到此路径的客户端，为None时发送给所有客户端
+        :return: None
+        """
+        for conn in list(self.connections):
+            if path is None or conn.path == path:
+                conn.send(msg)
+
+
+class WebSocketConnection(object):
+    """DevToolsServer中的一个websocket连接"""
+
+    def __init__(self, server, path, rfile, wfile):
+        """
+        :param server: 所属DevToolsServer对象
+        :param path: 客户端连接的路径
+        :param rfile: 读取数据的文件对象
+        :param wfile: 写入数据的文件对象
+        """
+        self.server = server
+        self.path = path
+        self.closed = False
+        self._rfile = rfile
+        self._wfile = wfile
+        self._lock = Lock()
+
+    def send(self, msg):
+        """发送一条数据给客户端
+        :param msg: 要发送的数据，dict或str
+        :return: None
+        """
+        if not isinstance(msg, str):
+            msg = dumps(msg, separators=(',', ':'))  # 与浏览器一样使用紧凑格式
+        self._send_frame(0x1, msg.encode())
+
+    def close(self):
+        """关闭连接"""
+        if not self.closed:
+            self._send_frame(0x8, b'')
+            self.closed = True
+
+    def _send_frame(self, opcode, data):
+        """发送一个websocket帧
+        :param opcode: 帧类型
+        :param data: 数据
+        :return: None
+        """
+        length = len(data)
+        if length < 126:
+            head = pack('!BB', 0x80 | opcode, length)
+        elif length < 65536:
+            head = pack('!BBH', 0x80 | opcode, 126, length)
+        else:
+            head = pack('!BBQ', 0x80 | opcode, 127, length)
+        with self._lock:
+            if self.closed:
+                return
+            try:
+                self._wfile.write(head + data)
+            except OSError:
+                self.closed = True
+
+    def _recv_frame(self):
+        """读取一个websocket帧
+        :return: (fin, opcode, data)，连接断开时返回(None, None, None)
+        """
+        head = self._rfile.read(2)
+        if len(head) < 2:
+            return None, None, None
+        fin, opcode = head[0] & 0x80, head[0] & 0x0f
+        length = head[1] & 0x7f
+        if length == 126:
+            length = unpack('!H', self._rfile.read(2))[0]
+        elif length == 127:
+            length = unpack('!Q', self._rfile.read(8))[0]
+        mask = self._rfile.read(4) if head[1] & 0x80 else None
+        data = self._rfile.read(length)
+        if mask and length:
+            mask = (mask * (length // 4 + 1))[:length]
+            data = (int.from_bytes(data, 'big') ^ int.from_bytes(mask, 'big')).to_bytes(length, 'big')
+        return fin, opcode, data
+
+    def _serve(self):
+        """读取并处理客户端发来的数据，直到连接断开"""
+        self.server.connections.append(self)
+        try:
+            self.server.handler.on_connect(self)
+            buffer = b''
+            while not self.closed:
+                fin, opcode, data = self._recv_frame()
+                if opcode is None or opcode == 0x8:
+                    break
+                elif opcode == 0x9:
+                    self._send_frame(0xA, data)
+                    continue
+                elif opcode not in (0x0, 0x1, 0x2):
+                    continue
+
+                buffer += data
+                if fin:
+                    msg, buffer = buffer, b''
+                    self.server.handler.handle(self, loads(msg))
+        except OSError:
+            pass
+        finally:
+            self.closed = True
+            if self in self.server.connections:
+                self.server.connections.remove(self)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.headers.get('Upgrade', '').lower() != 'websocket':
+            self._reply_http('GET')
+            return
+
+        handler = self.server.devtools.handler
+        if not handler.accept(self.path):
+            self._reply(404, f'No such target id: {self.path.split("/")[-1]}')
+            return
+
+        key = self.headers.get('Sec-WebSocket-Key', '')
+        accept = b64encode(sha1((key + WS_GUID).encode()).digest()).decode()
+        self.send_response(101, 'Switching Protocols')
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', accept)
+        self.end_headers()
+        self.wfile.flush()
+        WebSocketConnection(self.server.devtools, self.path, self.rfile, self.wfile)._serve()
+        self.close_connection = True
+
+    def do_PUT(self):
+        self._reply_http('PUT')
+
+    def _reply_http(self, method):
+        """处理普通http请求
+        :param method: 请求方法
+        :return: None
+        """
+        data = self.server.devtools.handler.on_http(method, self.path)
+        if data is None:
+            self._reply(404, f'Unknown url: {self.path}')
+        else:
+            self._reply(200, data if isinstance(data, str) else dumps(data, indent=3), 'application/json')
+
+    def _reply(self, status, body, content_type='text/plain'):
+        """返回http响应
+        :param status: 状态码
+        :param body: 响应正文
+        :param content_type: 正文类型
+        :return: None
+        """
+        body = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', f'{content_type}; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeBrowser(DevToolsHandler):
+    """模拟浏览器的DevToolsHandler，对Target、Page、DOM、Runtime、Network等常用域的指令返回预设数据，
+    可用set_handler()修改或添加指令的返回值，用于在没有浏览器的环境中测试库本身的开销"""
+
+    def __init__(self, tabs=1, strict=False):
+        """
+        :param tabs: 初始标签页数量
+        :param strict: 收到没有预设的指令时是否返回错误，为False时返回空结果
+        """
+        self.browser_id = uuid4().hex
+        self.strict = strict
+        self.targets = {}  # 标签页信息，最近激活的在前，格式：{target_id: targetInfo}
+        self.sessions = {}  # flat session，格式：{session_id: (target_id, WebSocketConnection)}
+        self.handlers = {}  # 用户设置的指令处理方法，格式：{method: (result, events)}
+        self.calls = {}  # 每种指令收到的次数
+        self.html = '<html><head></head><body></body></html>'
+        self._enabled = {}  # 每个标签页已启用的域，格式：{target_id: set}
+        self.contexts = set()  # 新建的上下文id
+        self._lock = Lock()
+        for _ in range(tabs):
+            self.new_target()
+
+    def serve(self, host='127.0.0.1', port=0):
+        """启动模拟浏览器
+        :param host: 监听的ip
+        :param port: 监听的端口，为0时自动分配
+        :return: 已启动的DevToolsServer对象
+        """
+        return DevToolsServer(self, host, port).start()
+
+    def set_handler(self, method, result=None, events=None):
+        """设置指令的返回值
+        :param method: cdp方法名
+        :param result: 返回的结果dict，或接收(target_id, params)参数并返回结果的方法，方法抛出异常时返回错误信息，
+                       为None时移除设置
+        :param events: 返回结果后向同一标签页发送的事件，格式：[(event, params), ...]
+        :return: None
+        """
+        if result is None:
+            self.handlers.pop(method, None)
+        else:
+            self.handlers[method] = (result, events or [])
+
+    def new_target(self, url='about:blank', context_id=None):
+        """新建一个标签页
+        :param url: 标签页url
+        :param context_id: 标签页所属上下文id，为None时使用默认上下文
+        :return: 标签页id
+        """
+        target_id = uuid4().hex.upper()
+        info = {'targetId': target_id, 'type': 'page', 'title': url, 'url': url, 'attached': False,
+                'canAccessOpener': False, 'browserContextId': context_id or self.browser_id}
+        with self._lock:
+            self.targets = {target_id: info, **self.targets}
+            self._enabled[target_id] = set()
+        self.emit(None, 'Target.targetCreated', {'targetInfo': info})
+        return target_id
+
+    def close_target(self, target_id):
+        """关闭一个标签页
+        :param target_id: 标签页id
+        :return: 是否存在该标签页
+        """
+        with self._lock:
+            targets = dict(self.targets)
+            info = targets.pop(target_id, None)
+            self.targets = targets
+            self._enabled.pop(target_id, None)
+            sessions = [k for k, v in self.sessions.items() if v[0] == target_id]
+            for s in sessions:
+                self.sessions.pop(s)
+        if info is None:
+            return False
+
+        for s in sessions:
+            self.emit(None, 'Target.detachedFromTarget', {'sessionId': s, 'targetId': target_id})
+        self.emit(None, 'Target.targetDestroyed', {'targetId': target_id})
+        if self.server:
+            for conn in list(self.server.connections):
+                if conn.path == f'/devtools/page/{target_id}':
+                    conn.close()
+        return True
+
+    def activate_target(self, target_id):
+        """激活一个标签页
+        :param target_id: 标签页id
+        :return: 是否存在该标签页
+        """
+        with self._lock:
+            info = self.targets.get(target_id)
+            if info:
+                self.targets = {target_id: info, **{k: v for k, v in self.targets.items() if k != target_id}}
+        return info is not None
+
+    def emit(self, target_id, event, params):
+        """发送一个事件
+        :param target_id: 接收事件的标签页id，为None时发送给浏览器连接
+        :param event: 事件名称
+        :param params: 事件参数
+        :return: None
+        """
+        if not self.server:
+            return
+        msg = {'method': event, 'params': params}
+        for conn in list(self.server.connections):
+            if ((target_id is None and conn.path.startswith('/devtools/browser/'))
+                    or (target_id and conn.path == f'/devtools/page/{target_id}')):
+                conn.send(msg)
+        if target_id:
+            for session_id, (tid, conn) in list(self.sessions.items()):
+                if tid == target_id:
+                    conn.send(dict(msg, sessionId=session_id))
+
+    def accept(self, path):
+        if path.startswith('/devtools/page/'):
+            return path[15:] in self.targets
+        return path == f'/devtools/browser/{self.browser_id}'
+
+    def on_http(self, method, path):
+        path, _, query = path.partition('?')
+        path = path.rstrip('/')
+        if path in ('/json', '/json/list'):
+            return [self._target_json(i) for i in self.targets.values()]
+        elif path == '/json/version':
+            return {'Browser': 'Chrome/120.0.0.0', 'Protocol-Version': '1.3', 'User-Agent': _USER_AGENT,
+                    'V8-Version': '12.0.0.0', 'WebKit-Version': '537.36',
+                    'webSocketDebuggerUrl': f'ws://{self.server.address}/devtools/browser/{self.browser_id}'}
+        elif path == '/json/new':
+            return self._target_json(self.targets[self.new_target(unquote(query) or 'about:blank')])
+        elif path.startswith('/json/close/'):
+            return 'Target is closing' if self.close_target(path[12:]) else None
+        elif path.startswith('/json/activate/'):
+            return 'Target activated' if self.activate_target(path[15:]) else None
+
+    def handle(self, conn, msg):
+        method = msg['method']
+        params = msg.get('params', {})
+        session_id = msg.get('sessionId')
+        response = {'id': msg['id']}
+        if session_id:
+            response['sessionId'] = session_id
+            target_id = self.sessions.get(session_id, (None,))[0]
+            if target_id is None:
+                response['error'] = {'code': -32001, 'message': 'Session with given id not found.'}
+                conn.send(response)
+                return
+        elif conn.path.startswith('/devtools/page/'):
+            target_id = conn.path[15:]
+        else:
+            target_id = None
+
+        self.calls[method] = self.calls.get(method, 0) + 1
+        events = []
+        try:
+            if method in self.handlers:
+                result, after = self.handlers[method]
+                result = result(target_id, params) if callable(result) else result
+                events = [(target_id, e, p) for e, p in after]
+            else:
+                func = getattr(self, f'_{method.replace(".", "_")}', None)
+                if func:
+                    result = func(conn, target_id, params, events)
+                elif self.strict:
+                    raise ValueError(f"'{method}' wasn't found")
+                else:
+                    result = {}
+            response['result'] = result
+        except Exception as e:
+            response['error'] = {'code': -32000, 'message': str(e)}
+
+        conn.send(response)
+        for target_id, event, params in events:
+            self.emit(target_id, event, params)
+
+    def _target_json(self, info):
+        """返回/json接口中一个标签页的信息
+        :param info: targetInfo
+        :return: dict
+        """
+        return {'description': '', 'devtoolsFrontendUrl': '', 'id': info['targetId'], 'title': info['title'],
+                'type': info['type'], 'url': info['url'],
+                'webSocketDebuggerUrl': f'ws://{self.server.address}/devtools/page/{info["targetId"]}'}
+
+    def _target(self, target_id):
+        """获取标签页信息，不存在时抛出异常
+        :param target_id: 标签页id
+        :return: targetInfo
+        """
+        info = self.targets.get(target_id)
+        if info is None:
+            raise ValueError('No target with given id found')
+        return info
+
+    # ----------Browser、Target----------
+
+    def _Browser_getVersion(self, conn, target_id, params, events):
+        return {'protocolVersion': '1.3', 'product': 'Chrome/120.0.0.0', 'revision': '@0',
+                'userAgent': _USER_AGENT, 'jsVersion': '12.0.0.0'}
+
+    def _SystemInfo_getProcessInfo(self, conn, target_id, params, events):
+        return {'processInfo': []}
+
+    def _Target_setDiscoverTargets(self, conn, target_id, params, events):
+        if params.get('discover'):
+            events.extend((None, 'Target.targetCreated', {'targetInfo': i}) for i in self.targets.values())
+        return {}
+
+    def _Target_getTargets(self, conn, target_id, params, events):
+        return {'targetInfos': list(self.targets.values())}
+
+    def _Target_getTargetInfo(self, conn, target_id, params, events):
+        return {'targetInfo': self._target(params.get('targetId', target_id))}
+
+    def _Target_createTarget(self, conn, target_id, params, events):
+        return {'targetId': self.new_target(params.get('url') or 'about:blank', params.get('browserContextId'))}
+
+    def _Target_createBrowserContext(self, conn, target_id, params, events):
+        context_id = uuid4().hex.upper()
+        self.contexts.add(context_id)
+        return {'browserContextId': context_id}
+
+    def _Target_disposeBrowserContext(self, conn, target_id, params, events):
+        if params['browserContextId'] not in self.contexts:
+            raise ValueError('Failed to find context with id ' + params['browserContextId'])
+        self.contexts.discard(params['browserContextId'])
+        for i in [k for k, v in self.targets.items() if v['browserContextId'] == params['browserContextId']]:
+            self.close_target(i)
+        return {}
+
+    def _Target_getBrowserContexts(self, conn, target_id, params, events):
+        return {'browserContextIds': list(self.contexts)}
+
+    def _Target_closeTarget(self, conn, target_id, params, events):
+        self._target(params['targetId'])
+        self.close_target(params['targetId'])
+        return {'success': True}
+
+    def _Target_activateTarget(self, conn, target_id, params, events):
+        self._target(params['targetId'])
+        self.activate_target(params['targetId'])
+        return {}
+
+    def _Target_attachToTarget(self, conn, target_id, params, events):
+        info = self._target(params['targetId'])
+        session_id = uuid4().hex.upper()
+        self.sessions[session_id] = (info['targetId'], conn)
+        events.append((None, 'Target.attachedToTarget',
+                       {'sessionId': session_id, 'targetInfo': info, 'waitingForDebugger': False}))
+        return {'sessionId': session_id}
+
+    def _Target_detachFromTarget(self, conn, target_id, params, events):
+        session = self.sessions.pop(params.get('sessionId'), None)
+        if session is None:
+            raise ValueError('No session with given id')
+        events.append((None, 'Target.detachedFromTarget', {'sessionId': params['sessionId'],
+                                                           'targetId': session[0]}))
+        return {}
+
+    # ----------Page----------
+
+    def _Page_enable(self, conn, target_id, params, events):
+        self._enabled.get(target_id, set()).add('Page')
+        return {}
+
+    def _Network_enable(self, conn, target_id, params, events):
+        self._enabled.get(target_id, set()).add('Network')
+        return {}
+
+    def _Network_disable(self, conn, target_id, params, events):
+        self._enabled.get(target_id, set()).discard('Network')
+        return {}
+
+    def _Page_getFrameTree(self, conn, target_id, params, events):
+        info = self._target(target_id)
+        return {'frameTree': {'frame': {'id': target_id, 'loaderId': target_id, 'url': info['url'],
+                                        'domainAndRegistry': '', 'securityOrigin': '://', 'mimeType': 'text/html',
+                                        'adFrameStatus': {'adFrameType': 'none'}, 'secureContextType': 'Secure',
+                                        'crossOriginIsolatedContextType': 'NotIsolated',
+                                        'gatedAPIFeatures': []}}}
+
+    def _Page_navigate(self, conn, target_id, params, events):
+        info = self._target(target_id)
+        info['url'] = info['title'] = params['url']
+        loader_id = uuid4().hex.upper()
+        if 'Network' in self._enabled.get(target_id, ()):
+            request_id = loader_id
+            events.append((target_id, 'Network.requestWillBeSent', {
+                'requestId': request_id, 'loaderId': loader_id, 'documentURL': params['url'], 'frameId': target_id,
+                'request': {'url': params['url'], 'method': 'GET', 'headers': {}}, 'timestamp': 0, 'wallTime': 0,
+                'initiator': {'type': 'other'}, 'type': 'Document'}))
+            events.append((target_id, 'Network.responseReceived', {
+                'requestId': request_id, 'loaderId': loader_id, 'frameId': target_id, 'timestamp': 0,
+                'type': 'Document', 'response': {'url': params['url'], 'status': 200, 'statusText': 'OK',
+                                                 'headers': {'Content-Type': 'text/html'}, 'mimeType': 'text/html'}}))
+            events.append((target_id, 'Network.loadingFinished',
+                           {'requestId': request_id, 'timestamp': 0, 'encodedDataLength': len(self.html)}))
+        frame = self._Page_getFrameTree(conn, target_id, params, events)['frameTree']['frame']
+        events.append((target_id, 'Page.frameStartedLoading', {'frameId': target_id}))
+        events.append((target_id, 'Page.frameNavigated', {'frame': frame, 'type': 'Navigation'}))
+        events.append((target_id, 'Page.domContentEventFired', {'timestamp': 0}))
+        events.append((target_id, 'Page.loadEventFired', {'timestamp': 0}))
+        events.append((target_id, 'Page.frameStoppedLoading', {'frameId': target_id}))
+        events.append((None, 'Target.targetInfoChanged', {'targetInfo': info}))
+        return {'frameId': target_id, 'loaderId': loader_id}
+
+    def _Page_addScriptToEvaluateOnNewDocument(self, conn, target_id, params, events):
+        return {'identifier': uuid4().hex}
+
+    def _Page_reload(self, conn, target_id, params, events):
+        self._Page_navigate(conn, target_id, {'url': self._target(target_id)['url']}, events)
+        return {}
+
+    def _Page_getNavigationHistory(self, conn, target_id, params, events):
+        info = self._target(target_id)
+        return {'currentIndex': 0, 'entries': [{'id': 0, 'url': info['url'], 'userTypedURL': info['url'],
+                                                'title': info['title'], 'transitionType': 'typed'}]}
+
+    # ----------DOM----------
+
+    def _DOM_getDocument(self, conn, target_id, params, events):
+        info = self._target(target_id)
+        return {'root': {'nodeId': 1, 'backendNodeId': 1, 'nodeType': 9, 'nodeName': '#document', 'localName': '',
+                         'nodeValue': '', 'childNodeCount': 1, 'documentURL': info['url'], 'baseURL': info['url'],
+                         'xmlVersion': '', 'compatibilityMode': 'NoQuirksMode', 'frameId': target_id}}
+
+    def _DOM_describeNode(self, conn, target_id, params, events):
+        node_id = params.get('nodeId') or params.get('backendNodeId') or _object_node_id(params.get('objectId'))
+        if node_id == 1:
+            return {'node': self._DOM_getDocument(conn, target_id, params, events)['root']}
+        return {'node': {'nodeId': 0, 'backendNodeId': node_id, 'nodeType': 1, 'nodeName': 'DIV',
+                         'localName': 'div', 'nodeValue': '', 'childNodeCount': 0, 'attributes': []}}
+
+    def _DOM_resolveNode(self, conn, target_id, params, events):
+        node_id = params.get('nodeId') or params.get('backendNodeId') or 1
+        return {'object': {'type': 'object', 'subtype': 'node', 'className': 'HTMLDivElement',
+                           'description': 'div', 'objectId': f'node.{node_id}'}}
+
+    def _DOM_requestNode(self, conn, target_id, params, events):
+        return {'nodeId': _object_node_id(params.get('objectId'))}
+
+    def _DOM_getOuterHTML(self, conn, target_id, params, events):
+        return {'outerHTML': self.html}
+
+    def _DOM_performSearch(self, conn, target_id, params, events):
+        return {'searchId': uuid4().hex, 'resultCount': 0}
+
+    def _DOM_getSearchResults(self, conn, target_id, params, events):
+        return {'nodeIds': []}
+
+    def _DOM_querySelector(self, conn, target_id, params, events):
+        return {'nodeId': 0}
+
+    def _DOM_querySelectorAll(self, conn, target_id, params, events):
+        return {'nodeIds': []}
+
+    # ----------Runtime、Network----------
+
+    def _Runtime_evaluate(self, conn, target_id, params, events):
+        if params.get('expression', '').strip(' ;') == 'document.readyState':
+            return {'result': {'type': 'string', 'value': 'complete'}}
+        return {'result': {'type': 'undefined'}}
+
+    def _Runtime_callFunctionOn(self, conn, target_id, params, events):
+        return {'result': {'type': 'undefined'}}
+
+    def _Network_getResponseBody(self, conn, target_id, params, events):
+        return {'body': self.html, 'base64Encoded': False}
+
+
+_USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+def _object_node_id(object_id):
+    """从FakeBrowser生成的objectId中获取节点id"""
+    return int(object_id[5:]) if object_id and object_id.startswith('node.') else 1
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+from threading import Thread, Lock
+from typing import Optional, List, Union, Tuple, BinaryIO, Dict, Callable, Any, Set
+
+WS_GUID: str
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads: bool
+
+
+class DevToolsHandler(object):
+    server: Optional[DevToolsServer]
+
+    def on_http(self, method: str, path: str) -> Union[dict, list, str, None]: ...
+
+    def accept(self, path: str) -> bool: ...
+
+    def on_connect(self, conn: WebSocketConnection) -> None: ...
+
+    def handle(self, conn: WebSocketConnection, msg: dict) -> None: ...
+
+
+class DevToolsServer(object):
+    handler: DevToolsHandler
+    host: str
+    port: int
+    connections: List[WebSocketConnection]
+    _server: Optional[_ThreadingHTTPServer]
+    _thread: Optional[Thread]
+
+    def __init__(self, handler: DevToolsHandler = None, host: str = '127.0.0.1', port: int = 0): ...
+
+    def __enter__(self) -> DevToolsServer: ...
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    @property
+    def address(self) -> str: ...
+
+    def start(self) -> DevToolsServer: ...
+
+    def stop(self) -> None: ...
+
+    def broadcast(self, msg: Union[dict, str], path: str = None) -> None: ...
+
+
+class WebSocketConnection(object):
+    server: DevToolsServer
+    path: str
+    closed: bool
+    _rfile: BinaryIO
+    _wfile: BinaryIO
+    _lock: Lock
+
+    def __init__(self, server: DevToolsServer, path: str, rfile: BinaryIO, wfile: BinaryIO): ...
+
+    def send(self, msg: Union[dict, str]) -> None: ...
+
+    def close(self) -> None: ...
+
+    def _send_frame(self, opcode: int, data: bytes) -> None: ...
+
+    def _recv_frame(self) -> Tuple[Optional[int], Optional[int], Optional[bytes]]: ...
+
+    def _serve(self) -> None: ...
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None: ...
+
+    def do_PUT(self) -> None: ...
+
+    def _reply_http(self, method: str) -> None: ...
+
+    def _reply(self, status: int, body: str, content_type: str = 'text/plain') -> None: ...
+
+
+class FakeBrowser(DevToolsHandler):
+    browser_id: str
+    strict: bool
+    targets: Dict[str, dict]
+    sessions: Dict[str, Tuple[str, WebSocketConnection]]
+    handlers: Dict[str, Tuple[Union[dict, Callable[[Optional[str], dict], dict]], List[Tuple[str, dict]]]]
+    calls: Dict[str, int]
+    html: str
+    _enabled: Dict[str, Set[str]]
+    contexts: Set[str]
+    _lock: Lock
+
+    def __init__(self, tabs: int = 1, strict: bool = False): ...
+
+    def serve(self, host: str = '127.0.0.1', port: int = 0) -> DevToolsServer: ...
+
+    def set_handler(self,
+                    method: str,
+                    result: Union[dict, Callable[[Optional[str], dict], dict], None] = None,
+                    events: List[Tuple[str, dict]] = None) -> None: ...
+
+    def new_target(self, url: str = 'about:blank', context_id: str = None) -> str: ...
+
+    def close_target(self, target_id: str) -> bool: ...
+
+    def activate_target(self, target_id: str) -> bool: ...
+
+    def emit(self, target_id: Optional[str], event: str, params: dict) -> None: ...
+
+    def accept(self, path: str) -> bool: ...
+
+    def on_http(self, method: str, path: str) -> Union[dict, list, str, None]: ...
+
+    def handle(self, conn: WebSocketConnection, msg: dict) -> None: ...
+
+    def _target_json(self, info: dict) -> dict: ...
+
+    def _target(self, target_id: str) -> dict: ...
@@ -5,8 +5,9 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
-from json import dumps, loads, JSONDecodeError
-from queue import Queue, Empty
+from concurrent.futures import ThreadPoolExecutor
+from json import dumps as json_dumps, loads as json_loads
+from queue import Queue, Empty, Full
 from threading import Thread, Event
 from time import perf_counter, sleep
 
@@ -14,6 +15,9 @@ from requests import get
 from websocket import (WebSocketTimeoutException, WebSocketConnectionClosedException, create_connection,
                        WebSocketException, WebSocketBadStatusException)
 
+from .event_queue import EventQueue
+from .metrics import CDPMetrics, cdp_metrics
+from .pipe import get_pipe
 from .._functions.settings import Settings
 from ..errors import PageDisconnectedError, TargetNotFoundError
 
@@ -36,6 +40,7 @@ class Driver(object):
         self._websocket_url = f'ws://{address}/devtools/{tab_type}/{tab_id}'
         self._cur_id = 0
         self._ws = None
+        self._dumps, self._loads = get_json_codec(Settings.json_codec)
 
         self._recv_th = Thread(target=self._recv_loop)
         self._handle_event_th = Thread(target=self._handle_event_loop)
@@ -48,8 +53,23 @@ class Driver(object):
         self.event_handlers = {}
         self.immediate_event_handlers = {}
         self.method_results = {}
-        self.event_queue = Queue()
+        self._queue_limit = (Settings.event_queue_size, Settings.event_queue_policy, Settings.event_queue_events)
+        self.event_queue = EventQueue(*self._queue_limit)
         self.immediate_event_queue = Queue()
+        self.subscribers = {}  # 通过add_callback()添加的订阅者，格式：{event: [(callback, lane, concurrent), ...]}
+        self._lanes = {}  # 有名称的事件处理通道，格式：{lane: (EventQueue, Thread)}
+        self._executor = None  # 处理可并发订阅者的线程池
+        self._recorder = None  # 记录收发数据的Recorder对象
+        if Settings.cdp_record_path:
+            from .recorder import get_shared_recorder
+            self._recorder = get_shared_recorder()
+        self._record_conn = f'/devtools/{tab_type}/{tab_id}'  # 记录数据时使用的连接路径
+        self.metrics = cdp_metrics if Settings.cdp_metrics else None  # 记录性能数据的CDPMetrics对象
+        self._calls = {}  # 开启统计时记录等待结果的指令，格式：{ws_id: (method, 发送时间, 发送字节数)}
+        self.reconnect_times = Settings.reconnect_times  # 连接断开时自动重连的次数
+        self.reconnect_interval = Settings.reconnect_interval  # 第一次重连前等待的秒数，之后每次加倍
+        self._in_flight = {}  # 开启自动重连时记录等待结果的指令，格式：{ws_id: message}
+        self._states = {}  # 开启自动重连时记录的已启用域和设置，重连后重新发送，格式：{method: params}
 
         self.start()
 
@@ -59,10 +79,26 @@ class Driver(object):
         :param timeout: 超时时间，为None表示无限
         :return: 浏览器返回的数据
         """
+        end_time = perf_counter() + timeout if timeout is not None else None
+        ws_id = self._post(message)
+        if ws_id is None:
+            return {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
+        if timeout == 0:
+            self.method_results.pop(ws_id, None)
+            self._in_flight.pop(ws_id, None)
+            self._end_call(ws_id, waited=False)
+            return {'id': ws_id, 'result': {}}
+        return self._get_result(ws_id, message['method'], end_time)
+
+    def _post(self, message):
+        """发送信息到浏览器，不等待返回
+        :param message: 发送给浏览器的数据
+        :return: 信息的id，发送失败返回None
+        """
         self._cur_id += 1
         ws_id = self._cur_id
         message['id'] = ws_id
-        message_json = dumps(message)
+        message_json = self._dumps(message)
 
         # if self._debug:
         #     if self._debug is True or (isinstance(self._debug, str) and
@@ -74,30 +110,47 @@ class Driver(object):
         #                 print(f'发> {message_json}')
         #                 break
 
-        end_time = perf_counter() + timeout if timeout is not None else None
         self.method_results[ws_id] = Queue()
+        recorder = self._recorder
+        if recorder:
+            recorder.record('send', message_json, self._record_conn)
+        if self.metrics:
+            self._calls[ws_id] = (message['method'], perf_counter(), len(message_json))
+        if self.reconnect_times:
+            self._remember(message)
         try:
             self._ws.send(message_json)
-            if timeout == 0:
-                self.method_results.pop(ws_id, None)
-                return {'id': ws_id, 'result': {}}
+            return ws_id
 
-        except (OSError, WebSocketConnectionClosedException):
+        except (OSError, AttributeError, WebSocketConnectionClosedException):
             self.method_results.pop(ws_id, None)
-            return {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
-
+            self._calls.pop(ws_id, None)
+            return None
+
+    def _get_result(self, ws_id, method, end_time=None):
+        """等待并返回一条已发送信息的结果
+        :param ws_id: 信息id
+        :param method: cdp方法名
+        :param end_time: 结束等待的时间点，为None表示无限
+        :return: 浏览器返回的数据
+        """
         while not self._stopped.is_set():
+            result_queue = self.method_results.get(ws_id)
+            if result_queue is None:
+                break
             try:
-                result = self.method_results[ws_id].get(timeout=.2)
+                result = result_queue.get(timeout=.2)
                 self.method_results.pop(ws_id, None)
                 return result
 
             except Empty:
-                if self.alert_flag and message['method'].startswith(('Input.', 'Runtime.')):
+                if self.alert_flag and method.startswith(('Input.', 'Runtime.')):
                     return {'error': {'message': 'alert exists.'}, 'type': 'alert_exists'}
 
-                if timeout is not None and perf_counter() > end_time:
+                if end_time is not None and perf_counter() > end_time:
                     self.method_results.pop(ws_id, None)
+                    self._in_flight.pop(ws_id, None)
+                    self._end_call(ws_id, error='timeout')
                     return {'error': {'message': 'alert exists.'}, 'type': 'alert_exists'} \
                         if self.alert_flag else {'error': {'message': 'timeout'}, 'type': 'timeout'}
 
@@ -111,10 +164,23 @@ class Driver(object):
             try:
                 # self._ws.settimeout(1)
                 msg_json = self._ws.recv()
-                msg = loads(msg_json)
+                recorder = self._recorder
+                if recorder:
+                    recorder.record('recv', msg_json, self._record_conn)
+                method = _peek_method(msg_json)
+                metrics = self.metrics
+                if metrics and method is not None:
+                    metrics.record_event(method, len(msg_json))
+                if method is not None and not self._event_wanted(method, msg_json):
+                    continue
+                msg = self._loads(msg_json)
+                if metrics and method is None and 'method' in msg:
+                    metrics.record_event(msg['method'], len(msg_json))
             except WebSocketTimeoutException:
                 continue
-            except (WebSocketException, OSError, WebSocketConnectionClosedException, JSONDecodeError):
+            except (WebSocketException, OSError, WebSocketConnectionClosedException, ValueError):
+                if self._reconnect():
+                    continue
                 self._stop()
                 return
 
@@ -128,20 +194,81 @@ class Driver(object):
             #                 print(f'<收 {msg_json}')
             #                 break
 
-            if 'method' in msg:
-                if msg['method'].startswith('Page.javascriptDialog'):
-                    self.alert_flag = msg['method'].endswith('Opening')
-                function = self.immediate_event_handlers.get(msg['method'])
-                if function:
-                    self._handle_immediate_event(function, msg['params'])
-                else:
-                    self.event_queue.put(msg)
+            self._handle_msg(msg, len(msg_json))
 
-            elif msg.get('id') in self.method_results:
-                self.method_results[msg['id']].put(msg)
+    def _event_wanted(self, method, msg_json):
+        """返回是否需要处理一个事件，不需要的事件不进行解析直接丢弃
+        :param method: 事件名称
+        :param msg_json: 未解析的原始数据
+        :return: bool
+        """
+        return (method in self.event_handlers or method in self.immediate_event_handlers
+                or method in self.subscribers or method.startswith('Page.javascriptDialog'))
 
-            # elif self._debug:
-            #     print(f'未知信息：{msg}')
+    def _handle_msg(self, msg, size=0):
+        """处理接收到的一条信息
+        :param msg: 浏览器发来的数据
+        :param size: 原始数据的长度
+        :return: None
+        """
+        if 'method' in msg:
+            if msg['method'].startswith('Page.javascriptDialog'):
+                self.alert_flag = msg['method'].endswith('Opening')
+            function = self.immediate_event_handlers.get(msg['method'])
+            if function:
+                self._handle_immediate_event(function, msg['params'])
+            else:
+                self._put_event(self.event_queue, msg)
+
+            for callback, lane, concurrent in self.subscribers.get(msg['method'], ()):
+                if concurrent:
+                    self._submit(callback, msg['params'])
+                elif lane is not None:
+                    self._put_event(self._lane(lane)[0], (callback, msg['method'], msg['params']))
+
+        elif msg.get('id') in self.method_results:
+            if self._in_flight:
+                self._in_flight.pop(msg['id'], None)
+            if self._calls:
+                self._end_call(msg['id'], size, 'call_method_error' if 'error' in msg else None)
+            self.method_results[msg['id']].put(msg)
+
+        # elif self._debug:
+        #     print(f'未知信息：{msg}')
+
+    def _put_event(self, queue, item):
+        """在接收线程中把事件放入队列。队列满需要阻塞时，只在没有指令等待结果时阻塞，
+        否则超出长度限制放入，使接收线程能继续读取指令结果，避免回调方法中执行指令时互相等待
+        :param queue: EventQueue对象
+        :param item: 事件
+        :return: None
+        """
+        while True:
+            try:
+                queue.put(item, timeout=.05)
+                return
+            except Full:
+                if self._stopped.is_set() or self._awaiting_results():
+                    queue.put(item, force=True)
+                    return
+
+    def _awaiting_results(self):
+        """返回同一连接上是否有指令在等待结果"""
+        return bool(self.method_results)
+
+    def _end_call(self, ws_id, size=0, error=None, waited=True):
+        """结束一条指令的统计
+        :param ws_id: 信息id
+        :param size: 返回数据的长度
+        :param error: 出错类型
+        :param waited: 是否等待了结果
+        :return: None
+        """
+        call = self._calls.pop(ws_id, None)
+        metrics = self.metrics
+        if call and metrics:
+            method, start_time, bytes_out = call
+            metrics.record_call(method, perf_counter() - start_time if waited else None, bytes_out, size, error)
 
     def _handle_event_loop(self):
         """当接收到浏览器信息，执行已绑定的方法"""
@@ -155,7 +282,56 @@ class Driver(object):
             if function:
                 function(**event['params'])
 
-            self.event_queue.task_done()
+            for callback, lane, concurrent in self.subscribers.get(event['method'], ()):
+                if lane is None and not concurrent:
+                    callback(**event['params'])
+
+            try:
+                self.event_queue.task_done()
+            except ValueError:  # 处理期间连接断开，队列已被清空
+                pass
+
+    def _handle_lane_loop(self, queue):
+        """按顺序执行一个事件处理通道中的回调方法
+        :param queue: 通道的队列
+        :return: None
+        """
+        while not self._stopped.is_set():
+            try:
+                function, _, kwargs = queue.get(timeout=1)
+            except Empty:
+                continue
+            try:
+                function(**kwargs)
+            except PageDisconnectedError:
+                pass
+
+    def _lane(self, name):
+        """获取一个事件处理通道，不存在时创建
+        :param name: 通道名称
+        :return: (EventQueue, Thread)
+        """
+        lane = self._lanes.get(name)
+        if lane is None or not lane[1].is_alive():
+            queue = lane[0] if lane else EventQueue(*self._queue_limit, key=_get_lane_method)
+            th = Thread(target=self._handle_lane_loop, args=(queue,))
+            th.daemon = True
+            lane = self._lanes[name] = (queue, th)
+            th.start()
+        return lane
+
+    def _submit(self, function, kwargs):
+        """把回调方法交给线程池执行
+        :param function: 回调方法
+        :param kwargs: 方法参数
+        :return: None
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=Settings.event_workers)
+        try:
+            self._executor.submit(function, **kwargs)
+        except RuntimeError:  # 线程池已关闭
+            pass
 
     def _handle_immediate_event_loop(self):
         while not self._stopped.is_set() and not self.immediate_event_queue.empty():
@@ -188,18 +364,42 @@ class Driver(object):
 
         timeout = kwargs.pop('_timeout', Settings.cdp_timeout)
         result = self._send({'method': _method, 'params': kwargs}, timeout=timeout)
-        if 'result' not in result and 'error' in result:
-            kwargs['_timeout'] = timeout
-            return {'error': result['error']['message'], 'type': result.get('type', 'call_method_error'),
-                    'method': _method, 'args': kwargs}
-        else:
-            return result['result']
+        return _format_result(_method, kwargs, timeout, result)
 
-    def start(self):
-        """启动连接"""
-        self._stopped.clear()
+    def run_many(self, cmds, timeout=None):
+        """批量执行cdp方法，所有指令连续发出后再统一等待结果，用于执行多条互不依赖的指令
+        :param cmds: (cdp方法名, 参数dict)组成的列表，无参数时可只传入方法名
+        :param timeout: 所有指令共用的超时时间（秒），为None时使用Settings.cdp_timeout
+        :return: 与cmds顺序对应的执行结果列表，每项格式与run()返回值一致
+        """
+        if self._stopped.is_set():
+            return [{'error': 'connection disconnected', 'type': 'connection_error'} for _ in cmds]
+
+        timeout = Settings.cdp_timeout if timeout is None else timeout
+        end_time = perf_counter() + timeout
+        sent = []
+        for cmd in cmds:
+            if isinstance(cmd, str):
+                method, kwargs = cmd, {}
+            else:
+                method, kwargs = cmd[0], dict(cmd[1]) if len(cmd) > 1 and cmd[1] else {}
+            sent.append((method, kwargs, self._post({'method': method, 'params': kwargs})))
+
+        results = []
+        for method, kwargs, ws_id in sent:
+            if ws_id is None:
+                result = {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
+            else:
+                result = self._get_result(ws_id, method, end_time)
+            results.append(_format_result(method, kwargs, timeout, result))
+        return results
+
+    def _connect(self):
+        """建立websocket连接
+        :return: WebSocket对象
+        """
         try:
-            self._ws = create_connection(self._websocket_url, enable_multithread=True, suppress_origin=True)
+            return create_connection(self._websocket_url, enable_multithread=True, suppress_origin=True)
         except WebSocketBadStatusException as e:
             txt = str(e)
             if 'No such target id' in txt:
@@ -208,6 +408,86 @@ class Driver(object):
                 raise RuntimeError('请升级websocket-client库。')
             else:
                 raise e
+
+    def _remember(self, message):
+        """记录重连后需要恢复的指令
+        :param message: 发送的数据
+        :return: None
+        """
+        method = message['method']
+        self._in_flight[message['id']] = message
+        if method.endswith('.enable') or method in STATE_METHODS:
+            self._states[method] = message['params']
+        elif method.endswith('.disable'):
+            self._states.pop(f'{method[:-8]}.enable', None)
+
+    def _reconnect(self):
+        """连接断开时按设置重连，成功后恢复已启用的域并重发可重复执行的未完成指令
+        :return: 是否重连成功
+        """
+        interval = self.reconnect_interval
+        for _ in range(self.reconnect_times):
+            if self._stopped.is_set():
+                return False
+            sleep(interval)
+            interval = min(interval * 2, 2)
+            try:
+                ws = self._connect()
+            except TargetNotFoundError:
+                return False
+            except (WebSocketException, OSError):
+                continue
+
+            if self._stopped.is_set():
+                ws.close()
+                return False
+            old, self._ws = self._ws, ws
+            try:
+                old.close()
+            except Exception:
+                pass
+            self._recover()
+            return True
+        return False
+
+    def _recover(self):
+        """重连后重新启用已启用的域，重发可重复执行的未完成指令，其它未完成指令返回连接错误"""
+        for method, params in list(self._states.items()):
+            ws_id = self._post({'method': method, 'params': params})
+            self.method_results.pop(ws_id, None)
+            self._in_flight.pop(ws_id, None)
+
+        for ws_id, message in list(self._in_flight.items()):
+            result_queue = self.method_results.get(ws_id)
+            if result_queue is None:
+                self._in_flight.pop(ws_id, None)
+            elif message['method'].split('.')[-1].startswith(IDEMPOTENT_PREFIXES):
+                try:
+                    self._resend(message)
+                    continue
+                except (OSError, AttributeError, WebSocketConnectionClosedException):
+                    pass
+            else:
+                self._in_flight.pop(ws_id, None)
+                self._calls.pop(ws_id, None)
+                result_queue.put({'error': {'message': 'connection disconnected'}, 'type': 'connection_error'})
+
+        if hasattr(self.owner, '_on_reconnect'):
+            th = Thread(target=self.owner._on_reconnect)
+            th.daemon = True
+            th.start()
+
+    def _resend(self, message):
+        """以原来的id重新发送一条指令
+        :param message: 发送过的数据
+        :return: None
+        """
+        self._ws.send(self._dumps(message))
+
+    def start(self):
+        """启动连接"""
+        self._stopped.clear()
+        self._ws = self._connect()
         self._recv_th.start()
         self._handle_event_th.start()
         return True
@@ -240,8 +520,18 @@ class Driver(object):
         #     pass
 
         self.event_handlers.clear()
+        self.subscribers.clear()
         self.method_results.clear()
-        self.event_queue.queue.clear()
+        self._calls.clear()
+        self._in_flight.clear()
+        self.event_queue.clear()
+        for queue, _ in self._lanes.values():
+            queue.clear()
+        self._lanes.clear()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.stop_recording()
 
         if hasattr(self.owner, '_on_disconnect'):
             self.owner._on_disconnect()
@@ -259,6 +549,99 @@ class Driver(object):
         else:
             handler.pop(event, None)
 
+    @property
+    def dropped_events(self):
+        """返回因队列溢出而丢弃的事件数量，格式：{event: count}"""
+        dropped = dict(self.event_queue.dropped)
+        for queue, _ in list(self._lanes.values()):
+            for k, v in queue.dropped.items():
+                dropped[k] = dropped.get(k, 0) + v
+        return dropped
+
+    def set_queue_limit(self, size=0, policy='block', events=None):
+        """设置事件队列和各事件处理通道队列的长度和溢出策略
+        :param size: 队列最大长度，0表示不限制
+        :param policy: 队列满时的处理策略，可选：
+                       'block'：阻塞直到有空位，期间不接收浏览器数据，但有指令等待结果时不阻塞，超出长度放入；
+                       'drop_oldest'：丢弃最早的事件；
+                       'drop_type'：优先丢弃events中指定类型的事件；
+                       'coalesce'：events中指定类型的事件在队列中只保留最新一个
+        :param events: drop_type和coalesce策略适用的事件名称
+        :return: None
+        """
+        self.event_queue.set_limit(size, policy, events)
+        self._queue_limit = (size, policy, events)
+        for queue, _ in list(self._lanes.values()):
+            queue.set_limit(size, policy, events)
+
+    def add_callback(self, event, callback, lane=None, concurrent=False):
+        """为cdp event添加一个订阅者，与set_callback()设置的回调方法及其它订阅者共存
+        :param event: cdp event
+        :param callback: 回调方法
+        :param lane: 执行回调方法的通道名称，同一通道中的回调方法按事件顺序逐个执行，为None时在默认事件线程中执行
+        :param concurrent: 是否交给线程池并发执行，为True时lane参数无效，不保证执行顺序
+        :return: None
+        """
+        if lane is not None and not concurrent:
+            self._lane(lane)
+        self.subscribers[event] = self.subscribers.get(event, []) + [(callback, lane, concurrent)]
+
+    def remove_callback(self, event, callback=None):
+        """移除cdp event的订阅者
+        :param event: cdp event
+        :param callback: 要移除的回调方法，为None时移除该事件所有订阅者
+        :return: None
+        """
+        if callback is None:
+            self.subscribers.pop(event, None)
+            return
+        subscribers = [i for i in self.subscribers.get(event, ()) if i[0] != callback]
+        if subscribers:
+            self.subscribers[event] = subscribers
+        else:
+            self.subscribers.pop(event, None)
+
+    def set_reconnect(self, times=3, interval=.1):
+        """设置连接断开时自动重连
+        :param times: 重连次数，为0时不重连
+        :param interval: 第一次重连前等待的秒数，之后每次加倍，最多2秒
+        :return: None
+        """
+        self.reconnect_times = times
+        self.reconnect_interval = interval
+        if not times:
+            self._in_flight.clear()
+            self._states.clear()
+
+    def enable_metrics(self, metrics=None):
+        """开始统计cdp指令耗时、收发字节数和事件数量
+        :param metrics: 记录数据的CDPMetrics对象，可让多个Driver共用，为None时新建一个
+        :return: CDPMetrics对象
+        """
+        self.metrics = metrics or CDPMetrics()
+        return self.metrics
+
+    def disable_metrics(self):
+        """停止统计"""
+        self.metrics = None
+        self._calls.clear()
+
+    def start_recording(self, path):
+        """开始把收发的cdp数据记录到NDJSON文件，可用Replayer回放
+        :param path: 记录文件路径
+        :return: None
+        """
+        from .recorder import Recorder
+        self.stop_recording()
+        self._recorder = Recorder(path)
+
+    def stop_recording(self):
+        """停止记录cdp数据，多个Driver共用的Recorder不关闭"""
+        if self._recorder:
+            if not self._recorder.shared:
+                self._recorder.close()
+            self._recorder = None
+
 
 class BrowserDriver(Driver):
     BROWSERS = {}
@@ -273,12 +656,251 @@ class BrowserDriver(Driver):
             return
         self._created = True
         BrowserDriver.BROWSERS[tab_id] = self
+        self.sessions = {}
         super().__init__(tab_id, tab_type, address, owner)
 
     def __repr__(self):
         return f'<BrowserDriver {self.id}>'
 
+    def _connect(self):
+        """建立连接，以管道方式启动的浏览器使用已建立的管道
+        :return: WebSocket或PipeConnection对象
+        """
+        pipe = get_pipe(self.address)
+        if pipe is None:
+            return super()._connect()
+        if pipe.closed:
+            raise OSError('管道已关闭。')
+        return pipe
+
+    def _event_wanted(self, method, msg_json):
+        """返回是否需要处理一个事件，flat session的事件由对应SessionDriver判断
+        :param method: 事件名称
+        :param msg_json: 未解析的原始数据
+        :return: bool
+        """
+        if self.sessions:
+            i = msg_json.rfind('"sessionId":"')
+            if i != -1:
+                i += 13
+                end = msg_json.find('"', i)
+                # 顶层的sessionId总在最后，Target.attachedToTarget等浏览器事件的params中也有sessionId，不能据此分发
+                if msg_json[end + 1:].rstrip() == '}':
+                    session = self.sessions.get(msg_json[i:end])
+                    return session._event_wanted(method, msg_json) if session else False
+                elif not method.startswith('Target.'):
+                    return True  # 无法判断所属时解析后由_handle_msg()分发
+        return method == 'Target.detachedFromTarget' or super()._event_wanted(method, msg_json)
+
+    def _handle_msg(self, msg, size=0):
+        """处理接收到的一条信息，属于flat session的信息转交给对应SessionDriver
+        :param msg: 浏览器发来的数据
+        :param size: 原始数据的长度
+        :return: None
+        """
+        session_id = msg.get('sessionId')
+        if session_id is None:
+            if msg.get('method') == 'Target.detachedFromTarget':
+                session = self.sessions.get(msg['params']['sessionId'])
+                if session:
+                    session._stop()
+            super()._handle_msg(msg, size)
+
+        else:
+            session = self.sessions.get(session_id)
+            if session:
+                session._handle_msg(msg, size)
+
+    def _awaiting_results(self):
+        """返回浏览器连接或其中的flat session是否有指令在等待结果"""
+        return bool(self.method_results) or any(i.method_results for i in list(self.sessions.values()))
+
+    def _recover(self):
+        """重连后恢复浏览器连接的状态，并在新线程中重新附加所有flat session"""
+        super()._recover()
+        if self.sessions:
+            th = Thread(target=self._reattach_sessions)
+            th.daemon = True
+            th.start()
+
+    def _reattach_sessions(self):
+        """重新附加所有flat session"""
+        for session in list(self.sessions.values()):
+            session._reattach()
+
+    def _stop(self):
+        """中断连接，同时中断所有flat session"""
+        if self._stopped.is_set():
+            return False
+        for session in list(self.sessions.values()):
+            session._stop()
+        return super()._stop()
+
     def get(self, url):
         r = get(url, headers={'Connection': 'close'})
         r.close()
+        record_http(url, r)
         return r
+
+
+class SessionDriver(Driver):
+    """通过浏览器连接的flat session控制标签页的驱动，不单独建立websocket连接"""
+
+    def __init__(self, tab_id, tab_type, browser_driver, owner=None):
+        """
+        :param tab_id: 标签页id
+        :param tab_type: 标签页类型
+        :param browser_driver: 所在浏览器的BrowserDriver对象
+        :param owner: 创建这个驱动的对象
+        """
+        self._browser_driver = browser_driver
+        self.session_id = None
+        super().__init__(tab_id, tab_type, browser_driver.address, owner)
+        self._record_conn = browser_driver._record_conn  # 数据经浏览器连接收发
+        self.reconnect_times = browser_driver.reconnect_times
+        self.reconnect_interval = browser_driver.reconnect_interval
+
+    def __repr__(self):
+        return f'<SessionDriver {self.id} {self.session_id}>'
+
+    def _post(self, message):
+        """发送信息到浏览器，不等待返回
+        :param message: 发送给浏览器的数据
+        :return: 信息的id，发送失败返回None
+        """
+        message['sessionId'] = self.session_id
+        return super()._post(message)
+
+    def _awaiting_results(self):
+        """返回所在浏览器连接上是否有指令在等待结果"""
+        return self._browser_driver._awaiting_results()
+
+    def _resend(self, message):
+        """以原来的id和新的sessionId重新发送一条指令
+        :param message: 发送过的数据
+        :return: None
+        """
+        message['sessionId'] = self.session_id
+        super()._resend(message)
+
+    def _reattach(self):
+        """浏览器连接重连后重新附加到目标，并恢复状态"""
+        r = self._browser_driver.run('Target.attachToTarget', targetId=self.id, flatten=True)
+        self._browser_driver.sessions.pop(self.session_id, None)
+        if 'error' in r:
+            self._stop()
+            return
+        self.session_id = r['sessionId']
+        self._ws = self._browser_driver._ws
+        self._browser_driver.sessions[self.session_id] = self
+        self._recover()
+
+    def start(self):
+        """附加到目标并启动事件处理"""
+        self._stopped.clear()
+        r = self._browser_driver.run('Target.attachToTarget', targetId=self.id, flatten=True)
+        if 'error' in r:
+            raise TargetNotFoundError(f'找不到页面：{self.id}。')
+        self.session_id = r['sessionId']
+        self._ws = self._browser_driver._ws
+        self._browser_driver.sessions[self.session_id] = self
+        self._handle_event_th.start()
+        return True
+
+    def _stop(self):
+        """中断连接，只从目标分离，不关闭浏览器连接"""
+        if self._stopped.is_set():
+            return False
+
+        self._browser_driver.sessions.pop(self.session_id, None)
+        self._ws = None
+        if not self._browser_driver._stopped.is_set():
+            self._browser_driver.run('Target.detachFromTarget', sessionId=self.session_id, _timeout=0)
+        return super()._stop()
+
+
+# 重连后需要重新发送的设置类指令，另外所有以.enable结尾的指令也会重新发送
+STATE_METHODS = ('Target.setDiscoverTargets', 'Target.setAutoAttach', 'Page.setLifecycleEventsEnabled',
+                 'Emulation.setFocusEmulationEnabled', 'Network.setCacheDisabled', 'Network.setBlockedURLs',
+                 'Network.setExtraHTTPHeaders', 'Network.setUserAgentOverride', 'Emulation.setUserAgentOverride')
+# 方法名以这些开头的指令可重复执行，重连后会重新发送
+IDEMPOTENT_PREFIXES = ('get', 'describe', 'resolve', 'query', 'request', 'capture', 'enable', 'disable', 'set')
+
+
+def record_http(url, response):
+    """设置了Settings.cdp_record_path时，记录一个/json接口返回的数据
+    :param url: 请求的网址
+    :param response: requests的Response对象
+    :return: None
+    """
+    if Settings.cdp_record_path and response is not None:
+        from .recorder import get_shared_recorder
+        get_shared_recorder().record_http(url, response.text)
+
+
+def get_json_codec(codec=None):
+    """获取json编码和解码方法
+    :param codec: 'orjson'、'ujson'、'json'或(dumps, loads)元组，为None时自动选择已安装的最快的库
+    :return: (dumps, loads)元组
+    """
+    if isinstance(codec, (tuple, list)):
+        return codec[0], codec[1]
+
+    if codec in (None, 'orjson'):
+        try:
+            from orjson import dumps as orjson_dumps, loads as orjson_loads
+
+            def _dumps(obj):
+                try:
+                    return orjson_dumps(obj)
+                except TypeError:  # orjson不支持的类型用标准库处理
+                    return json_dumps(obj)
+
+            return _dumps, orjson_loads
+        except ImportError:
+            if codec == 'orjson':
+                raise ImportError('请先安装：pip install orjson')
+
+    if codec in (None, 'ujson'):
+        try:
+            from ujson import dumps as ujson_dumps, loads as ujson_loads
+            return lambda obj: ujson_dumps(obj, ensure_ascii=False), ujson_loads
+        except ImportError:
+            if codec == 'ujson':
+                raise ImportError('请先安装：pip install ujson')
+
+    if codec in (None, 'json'):
+        return json_dumps, json_loads
+
+    raise ValueError(f"codec参数只能是'orjson'、'ujson'、'json'、None或(dumps, loads)元组，现在是：{codec}")
+
+
+def _get_lane_method(item):
+    return item[1]
+
+
+def _peek_method(msg_json):
+    """不解析json，从浏览器发来的原始数据中读取事件名称
+    :param msg_json: 原始数据
+    :return: 事件名称，不是事件或无法读取时返回None
+    """
+    if isinstance(msg_json, str) and msg_json.startswith('{"method":"'):
+        end = msg_json.find('"', 11)
+        if end != -1:
+            return msg_json[11:end]
+
+
+def _format_result(method, kwargs, timeout, result):
+    """把浏览器返回的数据整理成run()的返回格式
+    :param method: cdp方法名
+    :param kwargs: cdp参数
+    :param timeout: 超时时间
+    :param result: 浏览器返回的数据
+    :return: 执行结果
+    """
+    if 'result' not in result and 'error' in result:
+        kwargs['_timeout'] = timeout
+        return {'error': result['error']['message'], 'type': result.get('type', 'call_method_error'),
+                'method': method, 'args': kwargs}
+    else:
+        return result['result']
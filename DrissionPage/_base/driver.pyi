@@ -5,14 +5,20 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from queue import Queue
 from threading import Thread, Event
-from typing import Union, Callable, Dict, Optional
+from typing import Union, Callable, Dict, Optional, List, Tuple, Iterable, Literal
 
 from requests import Response
 from websocket import WebSocket
 
 from .browser import Browser
+from .event_queue import EventQueue
+from .metrics import CDPMetrics
+from .pipe import PipeConnection
+from .recorder import Recorder
 
 
 class GenericAttr(object):
@@ -32,6 +38,8 @@ class Driver(object):
     _websocket_url: str
     _cur_id: int
     _ws: Optional[WebSocket]
+    _dumps: Callable[[dict], Union[str, bytes]]
+    _loads: Callable[[Union[str, bytes]], dict]
     _recv_th: Thread
     _handle_event_th: Thread
     _handle_immediate_event_th: Optional[Thread]
@@ -39,23 +47,67 @@ class Driver(object):
     event_handlers: dict
     immediate_event_handlers: dict
     method_results: dict
-    event_queue: Queue
+    _queue_limit: Tuple[int, str, Optional[Iterable[str]]]
+    event_queue: EventQueue
     immediate_event_queue: Queue
+    subscribers: Dict[str, List[Tuple[Callable, Optional[str], bool]]]
+    _lanes: Dict[str, Tuple[EventQueue, Thread]]
+    _executor: Optional[ThreadPoolExecutor]
+    _recorder: Optional[Recorder]
+    _record_conn: str
+    metrics: Optional[CDPMetrics]
+    _calls: Dict[int, Tuple[str, float, int]]
+    reconnect_times: int
+    reconnect_interval: float
+    _in_flight: Dict[int, dict]
+    _states: Dict[str, dict]
 
     def __init__(self, tab_id: str, tab_type: str, address: str, owner=None): ...
 
     def _send(self, message: dict, timeout: float = None) -> dict: ...
 
+    def _post(self, message: dict) -> Optional[int]: ...
+
+    def _get_result(self, ws_id: int, method: str, end_time: float = None) -> dict: ...
+
     def _recv_loop(self) -> None: ...
 
+    def _event_wanted(self, method: str, msg_json: str) -> bool: ...
+
+    def _handle_msg(self, msg: dict, size: int = 0) -> None: ...
+
+    def _put_event(self, queue: EventQueue, item: Union[dict, tuple]) -> None: ...
+
+    def _awaiting_results(self) -> bool: ...
+
+    def _end_call(self, ws_id: int, size: int = 0, error: Optional[str] = None, waited: bool = True) -> None: ...
+
     def _handle_event_loop(self) -> None: ...
 
+    def _handle_lane_loop(self, queue: Queue) -> None: ...
+
+    def _lane(self, name: str) -> Tuple[EventQueue, Thread]: ...
+
+    def _submit(self, function: Callable, kwargs: dict) -> None: ...
+
     def _handle_immediate_event_loop(self): ...
 
     def _handle_immediate_event(self, function: Callable, kwargs: dict): ...
 
     def run(self, _method: str, **kwargs) -> dict: ...
 
+    def run_many(self, cmds: List[Union[str, Tuple[str], Tuple[str, dict]]], timeout: float = None) -> List[dict]: ...
+
+    def _connect(self) -> WebSocket: ...
+
+    def _remember(self, message: dict) -> None: ...
+
+    def _reconnect(self) -> bool: ...
+
+    def _recover(self) -> None: ...
+
+    def _resend(self, message: dict) -> None: ...
+
     def start(self) -> bool: ...
 
     def stop(self) -> bool: ...
@@ -64,10 +116,37 @@ class Driver(object):
 
     def set_callback(self, event: str, callback: Union[Callable, None], immediate: bool = False) -> None: ...
 
+    @property
+    def dropped_events(self) -> Dict[str, int]: ...
+
+    def set_queue_limit(self,
+                        size: int = 0,
+                        policy: Literal['block', 'drop_oldest', 'drop_type', 'coalesce'] = 'block',
+                        events: Optional[Iterable[str]] = None) -> None: ...
+
+    def add_callback(self,
+                     event: str,
+                     callback: Callable,
+                     lane: Optional[str] = None,
+                     concurrent: bool = False) -> None: ...
+
+    def remove_callback(self, event: str, callback: Optional[Callable] = None) -> None: ...
+
+    def set_reconnect(self, times: int = 3, interval: float = .1) -> None: ...
+
+    def enable_metrics(self, metrics: Optional[CDPMetrics] = None) -> CDPMetrics: ...
+
+    def disable_metrics(self) -> None: ...
+
+    def start_recording(self, path: Union[str, Path]) -> None: ...
+
+    def stop_recording(self) -> None: ...
+
 
 class BrowserDriver(Driver):
     BROWSERS: Dict[str, Driver] = ...
     owner: Browser = ...
+    sessions: Dict[str, SessionDriver] = ...
 
     def __new__(cls, tab_id: str, tab_type: str, address: str, owner: Browser): ...
 
@@ -79,3 +158,42 @@ class BrowserDriver(Driver):
         ...
 
     def get(self, url) -> Response: ...
+
+    def _connect(self) -> Union[WebSocket, PipeConnection]: ...
+
+    def _event_wanted(self, method: str, msg_json: str) -> bool: ...
+
+    def _awaiting_results(self) -> bool: ...
+
+    def _recover(self) -> None: ...
+
+    def _reattach_sessions(self) -> None: ...
+
+
+class SessionDriver(Driver):
+    _browser_driver: BrowserDriver
+    session_id: Optional[str]
+
+    def __init__(self, tab_id: str, tab_type: str, browser_driver: BrowserDriver, owner=None): ...
+
+    def _post(self, message: dict) -> Optional[int]: ...
+
+    def _awaiting_results(self) -> bool: ...
+
+    def _resend(self, message: dict) -> None: ...
+
+    def _reattach(self) -> None: ...
+
+    def start(self) -> bool: ...
+
+    def _stop(self) -> None: ...
+
+
+STATE_METHODS: Tuple[str, ...]
+IDEMPOTENT_PREFIXES: Tuple[str, ...]
+
+
+def record_http(url: str, response: Optional[Response]) -> None: ...
+
+
+def get_json_codec(codec: Union[str, Tuple[Callable, Callable], None] = None) -> Tuple[Callable, Callable]: ...
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from queue import Queue, Full
+from time import perf_counter
+
+POLICIES = ('block', 'drop_oldest', 'drop_type', 'coalesce')
+
+
+class EventQueue(Queue):
+    """可限制长度的事件队列，队列满时按指定策略处理新事件，并记录丢弃的事件数量"""
+
+    def __init__(self, maxsize=0, policy='block', events=None, key=None):
+        """
+        :param maxsize: 队列最大长度，0表示不限制
+        :param policy: 队列满时的处理策略，可选：
+                       'block'：阻塞直到有空位；
+                       'drop_oldest'：丢弃最早的事件；
+                       'drop_type'：丢弃events中指定类型的事件，先丢弃新事件，再丢弃队列中最早的同类事件，没有可丢弃事件时阻塞；
+                       'coalesce'：events中指定类型的事件在队列中只保留最新一个，队列满时阻塞
+        :param events: drop_type和coalesce策略适用的事件名称
+        :param key: 从队列元素中获取事件名称的方法，默认取元素的'method'值
+        """
+        super().__init__(maxsize)
+        self.policy = None
+        self.events = None
+        self._key = key or _get_method
+        self.dropped = {}  # 丢弃的事件数量，格式：{event: count}
+        self.set_limit(maxsize, policy, events)
+
+    @property
+    def dropped_count(self):
+        """返回丢弃的事件总数"""
+        return sum(self.dropped.values())
+
+    def set_limit(self, maxsize=0, policy='block', events=None):
+        """设置队列长度和溢出策略
+        :param maxsize: 队列最大长度，0表示不限制
+        :param policy: 队列满时的处理策略，'block'、'drop_oldest'、'drop_type'或'coalesce'
+        :param events: drop_type和coalesce策略适用的事件名称
+        :return: None
+        """
+        if policy not in POLICIES:
+            raise ValueError(f'policy参数只能是{POLICIES}之一，现在是：{policy}')
+        with self.mutex:
+            self.maxsize = maxsize or 0
+            self.policy = policy
+            self.events = set(events or ())
+            self.not_full.notify_all()
+
+    def put(self, item, block=True, timeout=None, force=False):
+        """把事件放入队列，队列满时按策略处理
+        :param item: 事件
+        :param block: 是否在需要时阻塞
+        :param timeout: 阻塞超时时间，为None表示无限
+        :param force: 需要阻塞时是否不阻塞，直接超出长度限制放入
+        :return: None
+        """
+        method = self._key(item)
+        with self.not_full:
+            if self.policy == 'coalesce' and method in self.events:
+                for n, i in enumerate(self.queue):
+                    if self._key(i) == method:
+                        self.queue[n] = item
+                        self._drop(method)
+                        return
+
+            if 0 < self.maxsize <= self._qsize():
+                if self.policy == 'drop_oldest':
+                    self._remove(0)
+                elif self.policy == 'drop_type':
+                    if method in self.events:
+                        self._drop(method)
+                        return
+                    for n, i in enumerate(self.queue):
+                        if self._key(i) in self.events:
+                            self._remove(n)
+                            break
+
+            if self.maxsize > 0 and not force:
+                if not block:
+                    if self._qsize() >= self.maxsize:
+                        raise Full
+                elif timeout is None:
+                    while 0 < self.maxsize <= self._qsize():
+                        self.not_full.wait()
+                else:
+                    end_time = perf_counter() + timeout
+                    while 0 < self.maxsize <= self._qsize():
+                        remaining = end_time - perf_counter()
+                        if remaining <= 0:
+                            raise Full
+                        self.not_full.wait(remaining)
+
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def clear(self):
+        """清空队列，并唤醒等待放入的线程"""
+        with self.mutex:
+            self.queue.clear()
+            self.unfinished_tasks = 0
+            self.all_tasks_done.notify_all()
+            self.not_full.notify_all()
+
+    def _remove(self, index):
+        """从队列中移除一个事件并计数
+        :param index: 事件在队列中的序号
+        :return: None
+        """
+        item = self.queue[index]
+        del self.queue[index]
+        self.unfinished_tasks -= 1
+        self._drop(self._key(item))
+
+    def _drop(self, method):
+        """记录一个被丢弃的事件
+        :param method: 事件名称
+        :return: None
+        """
+        self.dropped[method] = self.dropped.get(method, 0) + 1
+
+
+def _get_method(item):
+    return item['method']
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from queue import Queue
+from typing import Any, Callable, Dict, Iterable, Literal, Optional, Set, Tuple
+
+POLICIES: Tuple[str, ...]
+
+
+class EventQueue(Queue):
+    policy: str
+    events: Set[str]
+    _key: Callable[[Any], str]
+    dropped: Dict[str, int]
+
+    def __init__(self,
+                 maxsize: int = 0,
+                 policy: Literal['block', 'drop_oldest', 'drop_type', 'coalesce'] = 'block',
+                 events: Optional[Iterable[str]] = None,
+                 key: Optional[Callable[[Any], str]] = None): ...
+
+    @property
+    def dropped_count(self) -> int: ...
+
+    def set_limit(self,
+                  maxsize: int = 0,
+                  policy: Literal['block', 'drop_oldest', 'drop_type', 'coalesce'] = 'block',
+                  events: Optional[Iterable[str]] = None) -> None: ...
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None, force: bool = False) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def _remove(self, index: int) -> None: ...
+
+    def _drop(self, method: str) -> None: ...
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from json import dumps
+from threading import Lock
+from time import perf_counter
+
+BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+
+
+class CDPMetrics(object):
+    """统计cdp指令调用次数、耗时分布、超时、收发字节数和事件数量，可被多个Driver共用"""
+
+    def __init__(self, buckets=BUCKETS):
+        """
+        :param buckets: 耗时直方图各区间的上限（秒），从小到大排列
+        """
+        self.buckets = tuple(buckets)
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        """清空所有统计数据"""
+        with self._lock:
+            self._start_time = perf_counter()
+            self._methods = {}
+            self._events = {}
+
+    def record_call(self, method, duration=None, bytes_out=0, bytes_in=0, error=None):
+        """记录一次指令调用
+        :param method: cdp方法名
+        :param duration: 从发出到收到结果的秒数，为None表示没有等待结果
+        :param bytes_out: 发送的字节数
+        :param bytes_in: 接收的字节数
+        :param error: 出错类型，'timeout'表示超时，其它值表示浏览器返回错误，为None表示成功
+        :return: None
+        """
+        with self._lock:
+            m = self._methods.get(method)
+            if m is None:
+                m = self._methods[method] = {'count': 0, 'errors': 0, 'timeouts': 0, 'total_time': 0., 'max_time': 0.,
+                                             'bytes_out': 0, 'bytes_in': 0, 'buckets': [0] * (len(self.buckets) + 1)}
+            m['count'] += 1
+            m['bytes_out'] += bytes_out
+            m['bytes_in'] += bytes_in
+            if error == 'timeout':
+                m['timeouts'] += 1
+            elif error:
+                m['errors'] += 1
+            if duration is not None:
+                m['total_time'] += duration
+                if duration > m['max_time']:
+                    m['max_time'] = duration
+                for n, b in enumerate(self.buckets):
+                    if duration <= b:
+                        m['buckets'][n] += 1
+                        break
+                else:
+                    m['buckets'][-1] += 1
+
+    def record_event(self, event, size=0):
+        """记录收到的一个事件
+        :param event: 事件名称
+        :param size: 事件数据的字节数
+        :return: None
+        """
+        with self._lock:
+            e = self._events.get(event)
+            if e is None:
+                e = self._events[event] = {'count': 0, 'bytes': 0}
+            e['count'] += 1
+            e['bytes'] += size
+
+    def snapshot(self):
+        """返回当前统计数据
+        :return: {'elapsed': 统计时长, 'methods': {method: {...}}, 'events': {event: {...}}}，
+                 methods按总耗时从大到小排列，每项包含time_share（占所有指令总耗时比例）和累计直方图buckets
+        """
+        with self._lock:
+            elapsed = perf_counter() - self._start_time
+            methods = {k: dict(v, buckets=list(v['buckets'])) for k, v in self._methods.items()}
+            events = {k: dict(v) for k, v in self._events.items()}
+
+        total = sum(m['total_time'] for m in methods.values()) or 1
+        for m in methods.values():
+            waited = sum(m['buckets'])
+            m['avg_time'] = m['total_time'] / waited if waited else 0.
+            m['time_share'] = m['total_time'] / total
+            acc = 0
+            buckets = {}
+            for b, c in zip(self.buckets + (float('inf'),), m['buckets']):
+                acc += c
+                buckets['+Inf' if b == float('inf') else str(b)] = acc
+            m['buckets'] = buckets
+        for e in events.values():
+            e['rate'] = e['count'] / elapsed if elapsed else 0.
+
+        methods = dict(sorted(methods.items(), key=lambda i: i[1]['total_time'], reverse=True))
+        return {'elapsed': elapsed, 'methods': methods, 'events': events}
+
+    def to_json(self, indent=None):
+        """以json格式返回当前统计数据
+        :param indent: 缩进
+        :return: json文本
+        """
+        return dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix='drissionpage_cdp'):
+        """以Prometheus文本格式返回当前统计数据
+        :param prefix: 指标名称前缀
+        :return: Prometheus文本
+        """
+        data = self.snapshot()
+        lines = [f'# TYPE {prefix}_call_duration_seconds histogram']
+        for method, m in data['methods'].items():
+            label = f'method="{method}"'
+            for b, c in m['buckets'].items():
+                lines.append(f'{prefix}_call_duration_seconds_bucket{{{label},le="{b}"}} {c}')
+            lines.append(f'{prefix}_call_duration_seconds_sum{{{label}}} {m["total_time"]}')
+            lines.append(f'{prefix}_call_duration_seconds_count{{{label}}} {m["buckets"]["+Inf"]}')
+
+        for name, key in (('calls_total', 'count'), ('errors_total', 'errors'), ('timeouts_total', 'timeouts'),
+                          ('sent_bytes_total', 'bytes_out'), ('received_bytes_total', 'bytes_in')):
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            lines.extend(f'{prefix}_{name}{{method="{k}"}} {m[key]}' for k, m in data['methods'].items())
+
+        for name, key in (('events_total', 'count'), ('event_bytes_total', 'bytes')):
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            lines.extend(f'{prefix}_{name}{{event="{k}"}} {e[key]}' for k, e in data['events'].items())
+
+        return '\n'.join(lines) + '\n'
+
+
+cdp_metrics = CDPMetrics()  # Settings.cdp_metrics为True时所有Driver共用的统计对象
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from threading import Lock
+from typing import Tuple, Iterable, Optional, Dict, Any
+
+BUCKETS: Tuple[float, ...]
+
+
+class CDPMetrics(object):
+    buckets: Tuple[float, ...]
+    _lock: Lock
+    _start_time: float
+    _methods: Dict[str, dict]
+    _events: Dict[str, dict]
+
+    def __init__(self, buckets: Iterable[float] = BUCKETS): ...
+
+    def reset(self) -> None: ...
+
+    def record_call(self,
+                    method: str,
+                    duration: Optional[float] = None,
+                    bytes_out: int = 0,
+                    bytes_in: int = 0,
+                    error: Optional[str] = None) -> None: ...
+
+    def record_event(self, event: str, size: int = 0) -> None: ...
+
+    def snapshot(self) -> Dict[str, Any]: ...
+
+    def to_json(self, indent: Optional[int] = None) -> str: ...
+
+    def to_prometheus(self, prefix: str = 'drissionpage_cdp') -> str: ...
+
+
+cdp_metrics: CDPMetrics
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from json import dumps, loads
+from os import read, write, close
+from select import select
+from threading import Lock
+from time import perf_counter
+
+from ..errors import BrowserConnectError
+
+PIPES = {}  # 已建立的管道连接，格式：{address: PipeConnection}
+
+
+class PipeConnection(object):
+    """通过--remote-debugging-pipe与浏览器通讯的连接，接口与websocket连接一致，每条信息以'\\0'结尾"""
+
+    def __init__(self, address, read_fd, write_fd):
+        """
+        :param address: 用于标识这个连接的地址
+        :param read_fd: 读取浏览器数据的文件描述符
+        :param write_fd: 向浏览器写入数据的文件描述符
+        """
+        self.address = address
+        self.browser_id = None  # 浏览器id，启动后获取
+        self._read_fd = read_fd
+        self._write_fd = write_fd
+        self._buffer = b''
+        self._messages = []
+        self._write_lock = Lock()
+        self._read_lock = Lock()
+        self.closed = False
+        PIPES[address] = self
+
+    def send(self, data):
+        """发送一条信息
+        :param data: json字符串或bytes
+        :return: None
+        """
+        if self.closed:
+            raise OSError('管道已关闭。')
+        data = (data.encode() if isinstance(data, str) else data) + b'\0'
+        with self._write_lock:
+            while data:
+                data = data[write(self._write_fd, data):]
+
+    def recv(self, timeout=None):
+        """接收一条信息，阻塞直到收到数据
+        :param timeout: 超时时间（秒），为None表示无限，超时返回None
+        :return: json字符串
+        """
+        end_time = None if timeout is None else perf_counter() + timeout
+        with self._read_lock:
+            while not self._messages:
+                if self.closed:
+                    raise OSError('管道已关闭。')
+                wait = .5 if end_time is None else min(.5, end_time - perf_counter())
+                if wait <= 0:
+                    return None
+                if not select([self._read_fd], [], [], wait)[0]:  # 定时醒来检查是否已关闭
+                    continue
+                chunk = read(self._read_fd, 1048576)
+                if not chunk:
+                    self.close()
+                    raise OSError('浏览器已关闭管道。')
+                *messages, self._buffer = (self._buffer + chunk).split(b'\0')
+                self._messages.extend(messages)
+            return self._messages.pop(0).decode()
+
+    def call(self, method, timeout=30, **params):
+        """在Driver接管连接前同步执行一条cdp指令
+        :param method: cdp方法名
+        :param timeout: 超时时间（秒）
+        :param params: 参数
+        :return: 浏览器返回的数据
+        """
+        try:
+            self.send(dumps({'id': 0, 'method': method, 'params': params}))
+            end_time = perf_counter() + timeout
+            while perf_counter() < end_time:
+                msg = self.recv(end_time - perf_counter())
+                if msg is None:
+                    break
+                msg = loads(msg)
+                if msg.get('id') == 0:
+                    return msg
+        except OSError:
+            self.close()
+            raise BrowserConnectError('浏览器启动失败或已关闭管道，请检查浏览器路径和启动参数。')
+        raise BrowserConnectError('浏览器管道无响应。')
+
+    def close(self):
+        """关闭连接"""
+        if self.closed:
+            return
+        self.closed = True
+        PIPES.pop(self.address, None)
+        for fd in (self._read_fd, self._write_fd):
+            try:
+                close(fd)
+            except OSError:
+                pass
+
+
+def get_pipe(address):
+    """返回地址对应的管道连接
+    :param address: 连接地址
+    :return: PipeConnection对象，不存在时返回None
+    """
+    return PIPES.get(address)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from threading import Lock
+from typing import Dict, List, Optional, Union
+
+PIPES: Dict[str, PipeConnection] = ...
+
+
+class PipeConnection(object):
+    address: str = ...
+    browser_id: Optional[str] = ...
+    closed: bool = ...
+    _read_fd: int = ...
+    _write_fd: int = ...
+    _buffer: bytes = ...
+    _messages: List[bytes] = ...
+    _write_lock: Lock = ...
+    _read_lock: Lock = ...
+
+    def __init__(self, address: str, read_fd: int, write_fd: int): ...
+
+    def send(self, data: Union[str, bytes]) -> None: ...
+
+    def recv(self, timeout: float = None) -> Optional[str]: ...
+
+    def call(self, method: str, timeout: float = 30, **params) -> dict: ...
+
+    def close(self) -> None: ...
+
+
+def get_pipe(address: str) -> Optional[PipeConnection]: ...
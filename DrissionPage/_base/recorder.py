@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from json import loads, dumps
+from pathlib import Path
+from threading import Lock
+from time import perf_counter, sleep
+from urllib.parse import urlparse
+
+from .devtools_server import DevToolsHandler, DevToolsServer
+from .._functions.settings import Settings
+
+
+class Recorder(object):
+    """把Driver收发的cdp数据和/json接口的数据记录到NDJSON文件，每行格式：
+    {"time": 秒, "conn": 连接路径, "type": "send"|"recv"|"http", "data": 原始数据}，http记录另有"url"项"""
+
+    def __init__(self, path, shared=False):
+        """
+        :param path: 记录文件路径
+        :param shared: 是否多个Driver共用，共用的对象不随Driver停止而关闭
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.shared = shared
+        self._file = open(self.path, 'w', encoding='utf-8', buffering=1)  # 按行写入，共用时不必等关闭即可回放
+        self._lock = Lock()
+        self._start_time = perf_counter()
+
+    @property
+    def closed(self):
+        """返回记录文件是否已关闭"""
+        return self._file.closed
+
+    def record(self, _type, data, conn=''):
+        """记录一条数据，data是已序列化的json，直接写入不再解析
+        :param _type: 'send'或'recv'
+        :param data: json字符串或bytes
+        :param conn: 所在连接的路径，如'/devtools/page/xxx'
+        :return: None
+        """
+        if not data:
+            return
+        if isinstance(data, bytes):
+            data = data.decode()
+        self._write(f'{{"time":{perf_counter() - self._start_time:.6f},"conn":{dumps(conn)},'
+                    f'"type":"{_type}","data":{data}}}\n')
+
+    def record_http(self, url, text):
+        """记录一个http接口返回的数据
+        :param url: 请求的网址
+        :param text: 返回的文本
+        :return: None
+        """
+        self._write(f'{{"time":{perf_counter() - self._start_time:.6f},"conn":{dumps(urlparse(url).path)},'
+                    f'"type":"http","url":{dumps(url)},"data":{dumps(text)}}}\n')
+
+    def _write(self, line):
+        """写入一行
+        :param line: 行文本
+        :return: None
+        """
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line)
+
+    def close(self):
+        """关闭记录文件"""
+        with self._lock:
+            self._file.close()
+
+
+_shared_recorder = None
+_shared_lock = Lock()
+
+
+def get_shared_recorder():
+    """返回Settings.cdp_record_path指定的文件对应的共用Recorder对象
+    :return: Recorder对象，没有设置时返回None
+    """
+    global _shared_recorder
+    path = Settings.cdp_record_path
+    if not path:
+        return None
+    with _shared_lock:
+        if _shared_recorder is None or _shared_recorder.closed or _shared_recorder.path != Path(path):
+            _shared_recorder = Recorder(path, shared=True)
+        return _shared_recorder
+
+
+class Replayer(DevToolsHandler):
+    """按Recorder记录的文件回放浏览器数据的DevToolsHandler。每个连接分别回放，客户端每发来一条指令，
+    在同一连接中按sessionId和方法名顺序匹配记录中的指令，返回记录中该指令的结果和其后收到的事件，
+    /json等http接口按顺序返回记录中的数据，用完后重复最后一条"""
+
+    def __init__(self, path, speed=0):
+        """
+        :param path: Recorder记录的文件路径
+        :param speed: 回放速度倍数，为0时不等待，立即返回所有数据
+        """
+        self.speed = speed
+        # 按连接路径分组的数据，没有记录连接的旧文件路径为''，格式：
+        # {conn: {'initial': [(time, msg), ...], 'commands': {(sessionId, method): [(time, msg, events, response), ...]}}}
+        self.conns = {}
+        self.http = {}  # 按路径分组的http数据，格式：{path: [text, ...]}
+        self._address = None  # 记录时的浏览器地址，返回http数据时替换为回放服务器地址
+        self._cursor = {}  # 每个连接每种指令已回放的数量，格式：{(conn, sessionId, method): int}
+        self._lock = Lock()
+        self._load(path)
+
+    def _load(self, path):
+        """读取记录文件
+        :param path: 文件路径
+        :return: None
+        """
+        sends = {}
+        events = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                item = loads(line)
+                conn = item.get('conn', '')
+                if item['type'] == 'http':
+                    self.http.setdefault('/json' if conn == '/json/list' else conn, []).append(item['data'])
+                    self._address = urlparse(item['url']).netloc
+                    continue
+
+                data = self.conns.setdefault(conn, {'initial': [], 'commands': {}})
+                msg = item['data']
+                if item['type'] == 'send':
+                    events[conn] = []
+                    cmd = [item['time'], msg, events[conn], None]
+                    sends[(conn, msg['id'])] = cmd
+                    data['commands'].setdefault((msg.get('sessionId'), msg['method']), []).append(cmd)
+                elif 'id' in msg and 'method' not in msg:
+                    if (conn, msg['id']) in sends:
+                        sends.pop((conn, msg['id']))[3] = (item['time'], msg)
+                else:
+                    events.get(conn, data['initial']).append((item['time'], msg))
+
+    def serve(self, host='127.0.0.1', port=0):
+        """启动回放用的DevToolsServer
+        :param host: 监听的ip
+        :param port: 监听的端口，为0时自动分配
+        :return: 已启动的DevToolsServer对象
+        """
+        return DevToolsServer(self, host, port).start()
+
+    def reset(self):
+        """从头开始回放所有连接和http接口"""
+        with self._lock:
+            self._cursor = {}
+
+    def _conn_data(self, path):
+        """返回连接路径对应的记录数据
+        :param path: 连接路径
+        :return: dict格式数据，没有时返回None
+        """
+        return self.conns.get(path, self.conns.get(''))
+
+    def on_http(self, method, path):
+        if path == '/json/list':
+            path = '/json'
+        texts = self.http.get(path)
+        if not texts:
+            return None
+        with self._lock:
+            index = self._cursor.get(('http', path), 0)
+            self._cursor[('http', path)] = index + 1
+        text = texts[min(index, len(texts) - 1)]
+        return text.replace(self._address, self.server.address) if self._address else text
+
+    def accept(self, path):
+        return self._conn_data(path) is not None
+
+    def on_connect(self, conn):
+        with self._lock:  # 同一路径重新连接时从头回放该连接
+            for k in [k for k in self._cursor if k[0] == conn.path]:
+                self._cursor.pop(k)
+        self._send_all(conn, self._conn_data(conn.path)['initial'], 0)
+
+    def handle(self, conn, msg):
+        key = (msg.get('sessionId'), msg['method'])
+        with self._lock:
+            cmds = self._conn_data(conn.path)['commands'].get(key, ())
+            index = self._cursor.get((conn.path,) + key, 0)
+            cmd = cmds[index] if index < len(cmds) else None
+            self._cursor[(conn.path,) + key] = index + 1
+        if cmd is None:
+            response = {'id': msg['id'], 'error': {'code': -32601, 'message': f"'{msg['method']}' wasn't found"}}
+            if msg.get('sessionId'):
+                response['sessionId'] = msg['sessionId']
+            conn.send(response)
+            return
+
+        send_time, _, events, response = cmd
+        items = list(events)
+        if response:
+            items.append((response[0], dict(response[1], id=msg['id'])))
+            items.sort(key=lambda i: i[0])
+        self._send_all(conn, items, send_time)
+
+    def _send_all(self, conn, items, start_time):
+        """按记录的时间间隔发送数据
+        :param conn: WebSocketConnection对象
+        :param items: [(time, msg), ...]
+        :param start_time: 计时起点
+        :return: None
+        """
+        for t, msg in items:
+            if self.speed:
+                sleep(max(0., t - start_time) / self.speed)
+                start_time = t
+            conn.send(msg)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from pathlib import Path
+from threading import Lock
+from typing import Union, TextIO, Literal, List, Tuple, Dict, Optional
+
+from .devtools_server import DevToolsHandler, DevToolsServer, WebSocketConnection
+
+
+class Recorder(object):
+    path: Path
+    shared: bool
+    _file: TextIO
+    _lock: Lock
+    _start_time: float
+
+    def __init__(self, path: Union[str, Path], shared: bool = False): ...
+
+    @property
+    def closed(self) -> bool: ...
+
+    def record(self, _type: Literal['send', 'recv'], data: Union[str, bytes], conn: str = '') -> None: ...
+
+    def record_http(self, url: str, text: str) -> None: ...
+
+    def _write(self, line: str) -> None: ...
+
+    def close(self) -> None: ...
+
+
+_shared_recorder: Optional[Recorder]
+_shared_lock: Lock
+
+
+def get_shared_recorder() -> Optional[Recorder]: ...
+
+
+class Replayer(DevToolsHandler):
+    speed: float
+    conns: Dict[str, dict]
+    http: Dict[str, List[str]]
+    _address: Optional[str]
+    _cursor: Dict[tuple, int]
+    _lock: Lock
+
+    def __init__(self, path: Union[str, Path], speed: float = 0): ...
+
+    def _load(self, path: Union[str, Path]) -> None: ...
+
+    def serve(self, host: str = '127.0.0.1', port: int = 0) -> DevToolsServer: ...
+
+    def reset(self) -> None: ...
+
+    def _conn_data(self, path: str) -> Optional[dict]: ...
+
+    def on_http(self, method: str, path: str) -> Optional[str]: ...
+
+    def accept(self, path: str) -> bool: ...
+
+    def on_connect(self, conn: WebSocketConnection) -> None: ...
+
+    def handle(self, conn: WebSocketConnection, msg: dict) -> None: ...
+
+    def _send_all(self, conn: WebSocketConnection, items: List[Tuple[float, dict]], start_time: float) -> None: ...
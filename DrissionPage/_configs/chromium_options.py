@@ -47,6 +47,8 @@ class ChromiumOptions(object):
         self._load_mode = options.get('load_mode', 'normal')
         self._system_user_path = options.get('system_user_path', False)
         self._existing_only = options.get('existing_only', False)
+        self._flat_session = options.get('flat_session', False)
+        self._pipe = options.get('pipe', False)
 
         self._proxy = om.proxies.get('http', None) or om.proxies.get('https', None)
 
@@ -149,6 +151,16 @@ class ChromiumOptions(object):
         """返回是否只接管现有浏览器方式"""
         return self._existing_only
 
+    @property
+    def is_flat_session(self):
+        """返回是否所有标签页共用浏览器连接，管道模式下总是为True"""
+        return self._flat_session or self._pipe
+
+    @property
+    def is_pipe(self):
+        """返回是否以管道方式启动并连接浏览器"""
+        return self._pipe
+
     @property
     def is_auto_port(self):
         """返回是否使用自动端口和用户文件，如指定范围则返回范围tuple"""
@@ -493,7 +505,7 @@ class ChromiumOptions(object):
         """自动获取可用端口
         :param on_off: 是否开启自动获取端口号
         :param tmp_path: 临时文件保存路径，为None时保存到系统临时文件夹，on_off为False时此参数无效
-        :param scope: 指定端口范围，不含最后的数字，为None则使用[9600-19600)
+        :param scope: 指定端口范围，不含最后的数字，为None时由系统分配
         :return: 当前对象
         """
         if on_off:
@@ -512,6 +524,23 @@ class ChromiumOptions(object):
         self._existing_only = on_off
         return self
 
+    def flat_session(self, on_off=True):
+        """设置是否所有标签页、frame和监听器共用一个浏览器连接，以flat session方式收发数据
+        :param on_off: 开或关
+        :return: 当前对象
+        """
+        self._flat_session = on_off
+        return self
+
+    def use_pipe(self, on_off=True):
+        """设置是否以--remote-debugging-pipe启动浏览器，通过管道而不是端口通讯，不需要轮询浏览器是否已启动。
+        只能用于启动本地新浏览器，不能接管已有浏览器，开启后所有标签页以flat session方式共用管道连接
+        :param on_off: 开或关
+        :return: 当前对象
+        """
+        self._pipe = on_off
+        return self
+
     def save(self, path=None):
         """保存设置到文件
         :param path: ini文件的路径， None 保存到当前读取的配置文件，传入 'default' 保存到默认ini文件
@@ -538,7 +567,7 @@ class ChromiumOptions(object):
 
         # 设置chromium_options
         attrs = ('address', 'browser_path', 'arguments', 'extensions', 'user', 'load_mode',
-                 'auto_port', 'system_user_path', 'existing_only', 'flags')
+                 'auto_port', 'system_user_path', 'existing_only', 'flat_session', 'pipe', 'flags')
         for i in attrs:
             om.set_item('chromium_options', i, self.__getattribute__(f'_{i}'))
         # 设置代理
@@ -31,6 +31,8 @@ class ChromiumOptions(object):
         self._auto_port: bool = ...
         self._system_user_path: bool = ...
         self._existing_only: bool = ...
+        self._flat_session: bool = ...
+        self._pipe: bool = ...
         self._headless: bool = ...
         self._retry_times: int = ...
         self._retry_interval: float = ...
@@ -80,6 +82,12 @@ class ChromiumOptions(object):
     @property
     def is_existing_only(self) -> bool: ...
 
+    @property
+    def is_flat_session(self) -> bool: ...
+
+    @property
+    def is_pipe(self) -> bool: ...
+
     @property
     def is_auto_port(self) -> Union[bool, Tuple[int, int]]: ...
 
@@ -167,6 +175,10 @@ class ChromiumOptions(object):
 
     def existing_only(self, on_off: bool = True) -> ChromiumOptions: ...
 
+    def flat_session(self, on_off: bool = True) -> ChromiumOptions: ...
+
+    def use_pipe(self, on_off: bool = True) -> ChromiumOptions: ...
+
     def save(self, path: Union[str, Path] = None) -> str: ...
 
     def save_to_default(self) -> str: ...
@@ -17,8 +17,9 @@ from .none_element import NoneElement
 from .session_element import make_session_ele
 from .._base.base import DrissionElement, BaseElement
 from .._functions.keys import input_text_or_keys
-from .._functions.locator import get_loc
+from .._functions.locator import get_loc, locator_cache
 from .._functions.settings import Settings
+from .._functions.tools import raise_error
 from .._functions.web import make_absolute_link, get_ele_txt, format_html, is_js_func, offset_scroll, get_blob
 from .._units.clicker import Clicker
 from .._units.rect import ElementRect
@@ -31,18 +32,25 @@ from ..errors import (ContextLostError, ElementLostError, JavaScriptError, Eleme
                       CDPError, NoResourceError, AlertExistsError)
 
 __FRAME_ELEMENT__ = ('iframe', 'frame')
+_DOC_JS = 'function(){return this.ownerDocument;}'  # 获取节点所在文档
 
 
 class ChromiumElement(DrissionElement):
     """控制浏览器元素的对象"""
 
-    def __init__(self, owner, node_id=None, obj_id=None, backend_id=None):
+    def __init__(self, owner, node_id=None, obj_id=None, backend_id=None, doc_id=None, lazy=None):
         """node_id、obj_id和backend_id必须至少传入一个
         :param owner: 元素所在页面对象
         :param node_id: cdp中的node id
         :param obj_id: js中的object id
         :param backend_id: backend id
+        :param doc_id: 元素所在文档的object id，为None时自动获取
+        :param lazy: 是否只保存传入的id，其它id和文档id首次使用时才获取，为None时使用Settings.lazy_element
         """
+        self._nid = node_id
+        self._oid = obj_id
+        self._bid = backend_id
+        self._did = doc_id if doc_id is not None else False  # False表示未获取，None表示没有所在文档
         super().__init__(owner)
         self.tab = self.owner.tab
         self._select = None
@@ -56,27 +64,32 @@ class ChromiumElement(DrissionElement):
         self._wait = None
         self._type = 'ChromiumElement'
 
+        if not (node_id or obj_id or backend_id):
+            raise ElementLostError
+        if lazy is None:
+            lazy = Settings.lazy_element
+        if lazy:
+            return
+
         if node_id and obj_id and backend_id:
-            self._node_id = node_id
-            self._obj_id = obj_id
-            self._backend_id = backend_id
+            pass
         elif node_id:
-            self._node_id = node_id
-            self._obj_id = self._get_obj_id(node_id)
-            self._backend_id = self._get_backend_id(self._node_id)
+            r = self._run_cdps(('DOM.resolveNode', {'nodeId': node_id}), ('DOM.describeNode', {'nodeId': node_id}))
+            self._oid = r[0]['object']['objectId']
+            self._tag = r[1]['node']['localName']
+            self._bid = r[1]['node']['backendNodeId']
         elif obj_id:
-            self._node_id = self._get_node_id(obj_id)
-            self._obj_id = obj_id
-            self._backend_id = self._get_backend_id(self._node_id)
-        elif backend_id:
-            self._obj_id = self._get_obj_id(backend_id=backend_id)
-            self._node_id = self._get_node_id(obj_id=self._obj_id)
-            self._backend_id = backend_id
+            r = self._run_cdps(('DOM.requestNode', {'objectId': obj_id}), ('DOM.describeNode', {'objectId': obj_id}))
+            self._nid = r[0]['nodeId']
+            self._tag = r[1]['node']['localName']
+            self._bid = r[1]['node']['backendNodeId']
         else:
-            raise ElementLostError
+            self._oid = self._get_obj_id(backend_id=backend_id)
+            self._nid = self._get_node_id(obj_id=self._oid)
 
-        doc = self.run_js('return this.ownerDocument;')
-        self._doc_id = doc['objectId'] if doc else None
+        if doc_id is None:
+            doc = self.run_js('return this.ownerDocument;')
+            self._did = doc['objectId'] if doc else None
 
     def __repr__(self):
         attrs = [f"{k}='{v}'" for k, v in self.attrs.items()]
@@ -101,6 +114,52 @@ class ChromiumElement(DrissionElement):
         a = self.attr(item)
         return a if a is not None else self.property(item)
 
+    @property
+    def _node_id(self):
+        """返回cdp中的node id，未获取时先获取"""
+        if not self._nid:
+            self._nid = self._get_node_id(obj_id=self._obj_id)
+        return self._nid
+
+    @_node_id.setter
+    def _node_id(self, node_id):
+        self._nid = node_id
+
+    @property
+    def _obj_id(self):
+        """返回js中的object id，未获取时先获取"""
+        if not self._oid:
+            self._oid = self._get_obj_id(node_id=self._nid, backend_id=self._bid)
+        return self._oid
+
+    @_obj_id.setter
+    def _obj_id(self, obj_id):
+        self._oid = obj_id
+
+    @property
+    def _backend_id(self):
+        """返回backend id，未获取时先获取"""
+        if not self._bid:
+            if self._nid:
+                self._bid = self._get_backend_id(self._nid)
+            else:
+                n = self.owner.run_cdp('DOM.describeNode', objectId=self._oid)['node']
+                self._tag = n['localName']
+                self._bid = n['backendNodeId']
+        return self._bid
+
+    @_backend_id.setter
+    def _backend_id(self, backend_id):
+        self._bid = backend_id
+
+    @property
+    def _doc_id(self):
+        """返回元素所在文档的object id，未获取时先获取"""
+        if self._did is False:
+            doc = self.run_js('return this.ownerDocument;')
+            self._did = doc['objectId'] if doc else None
+        return self._did
+
     @property
     def tag(self):
         """返回元素tag"""
@@ -740,6 +799,17 @@ class ChromiumElement(DrissionElement):
         self._tag = n['localName']
         return n['backendNodeId']
 
+    def _run_cdps(self, *cmds):
+        """批量执行互不依赖的cdp指令，任一指令出错则抛出异常
+        :param cmds: (cdp方法名, 参数dict)形式的指令
+        :return: 执行结果组成的列表
+        """
+        results = self.owner.driver.run_many(cmds)
+        for r in results:
+            if 'error' in r:
+                raise_error(r)
+        return results
+
     def _refresh_id(self):
         """根据backend id刷新其它id"""
         self._obj_id = self._get_obj_id(backend_id=self._backend_id)
@@ -1194,9 +1264,8 @@ def find_by_xpath(ele, xpath, index, timeout, relative=True):
     js = make_js_for_find_ele_by_xpath(xpath, type_txt, node_txt)
     ele.owner.wait.doc_loaded()
 
-    def do_find():
-        res = ele.owner.run_cdp('Runtime.callFunctionOn', functionDeclaration=js, objectId=ele._obj_id,
-                                returnByValue=False, awaitPromise=True, userGesture=True)
+    def do_find(wait):
+        res = _run_find_js(ele, js, node_txt, wait, abs(index) if index else 1)
         if res['result']['type'] == 'string':
             return res['result']['value']
         if 'exceptionDetails' in res:
@@ -1219,9 +1288,12 @@ def find_by_xpath(ele, xpath, index, timeout, relative=True):
             res = ele.owner.run_cdp('Runtime.getProperties', objectId=res['result']['objectId'],
                                     ownProperties=True)['result'][:-1]
             if index is None:
-                r = [make_chromium_eles(ele.owner, _ids=i['value']['objectId'], is_obj_id=True)
-                     if i['value']['type'] == 'object' else i['value']['value'] for i in res]
-                return None if False in r else r
+                objs = [i['value']['objectId'] for i in res if i['value']['type'] == 'object']
+                objs = make_chromium_eles(ele.owner, _ids=objs, index=None, is_obj_id=True) if objs else []
+                if objs is False:
+                    return None
+                objs = iter(objs)
+                return [next(objs) if i['value']['type'] == 'object' else i['value']['value'] for i in res]
 
             else:
                 eles_count = len(res)
@@ -1237,10 +1309,10 @@ def find_by_xpath(ele, xpath, index, timeout, relative=True):
                 return None if r is False else r
 
     end_time = perf_counter() + timeout
-    result = do_find()
+    result = do_find(timeout)
     while result is None and perf_counter() < end_time:
         sleep(.1)
-        result = do_find()
+        result = do_find(end_time - perf_counter())
 
     if result:
         return result
@@ -1255,16 +1327,14 @@ def find_by_css(ele, selector, index, timeout):
     :param timeout: 超时时间（秒）
     :return: ChromiumElement或其组成的列表
     """
-    selector = selector.replace('"', r'\"')
     find_all = '' if index == 1 else 'All'
     node_txt = 'this.contentDocument' if ele.tag in ('iframe', 'frame', 'shadow-root') else 'this'
-    js = f'function(){{return {node_txt}.querySelector{find_all}("{selector}");}}'
+    js = make_js_for_find_ele_by_css(selector, find_all, node_txt)
 
     ele.owner.wait.doc_loaded()
 
-    def do_find():
-        res = ele.owner.run_cdp('Runtime.callFunctionOn', functionDeclaration=js, objectId=ele._obj_id,
-                                returnByValue=False, awaitPromise=True, userGesture=True)
+    def do_find(wait):
+        res = _run_find_js(ele, js, node_txt, wait, abs(index) if index else 1)
 
         if 'exceptionDetails' in res:
             raise SyntaxError(f'查询语句错误：\n{res}')
@@ -1283,16 +1353,62 @@ def find_by_css(ele, selector, index, timeout):
             return None if r is False else r
 
     end_time = perf_counter() + timeout
-    result = do_find()
+    result = do_find(timeout)
     while result is None and perf_counter() < end_time:
         sleep(.1)
-        result = do_find()
+        result = do_find(end_time - perf_counter())
 
     if result:
         return result
     return NoneElement(ele.owner) if index is not None else []
 
 
+def _run_find_js(ele, js, node_txt, wait, count=1):
+    """在元素中执行查找元素的js，使用observer方式且wait大于0时，在页面中等待到找到或超时才返回
+    :param ele: 在此元素中查找
+    :param js: 查找元素的js
+    :param node_txt: 查找的节点
+    :param wait: 最多等待的秒数
+    :param count: 至少找到多少个结果才返回
+    :return: Runtime.callFunctionOn的返回值
+    """
+    if wait > 0 and Settings.ele_wait_mode == 'observer':
+        return ele.owner.run_cdp('Runtime.callFunctionOn', functionDeclaration=make_js_for_wait_ele(js, node_txt),
+                                 objectId=ele._obj_id, arguments=[{'value': int(wait * 1000)}, {'value': count},
+                                                                  {'value': False}],
+                                 returnByValue=False, awaitPromise=True, userGesture=True,
+                                 _timeout=wait + Settings.cdp_timeout)
+    return ele.owner.run_cdp('Runtime.callFunctionOn', functionDeclaration=js, objectId=ele._obj_id,
+                             returnByValue=False, awaitPromise=True, userGesture=True)
+
+
+def wait_ele_in_page(page, loc, timeout, count=1):
+    """在页面文档中等待符合条件的元素出现，找到或超时才返回，使用poll方式、出错或提前返回时至少等待0.1秒
+    :param page: 页面对象
+    :param loc: 定位元组
+    :param timeout: 最多等待的秒数
+    :param count: 需要的元素数量
+    :return: 是否找到
+    """
+    if timeout > 0 and Settings.ele_wait_mode == 'observer':
+        if loc[0] == 'xpath':
+            js = make_js_for_find_ele_by_xpath(loc[1], '7', 'this')
+        else:
+            js = make_js_for_find_ele_by_css(loc[1], 'All', 'this')
+        begin = perf_counter()
+        r = page.driver.run('Runtime.callFunctionOn', functionDeclaration=make_js_for_wait_ele(js, 'this'),
+                            objectId=page._root_id, arguments=[{'value': int(timeout * 1000)}, {'value': count},
+                                                               {'value': True}],
+                            returnByValue=True, awaitPromise=True, _timeout=timeout + Settings.cdp_timeout)
+        if 'error' not in r and 'exceptionDetails' not in r:
+            if r['result'].get('value', False):
+                return True
+            if perf_counter() - begin >= timeout:
+                return False
+    sleep(.1)
+    return False
+
+
 def make_chromium_eles(page, _ids, index=1, is_obj_id=True, ele_only=False):
     """根据node id或object id生成相应元素对象
     :param page: ChromiumPage对象
@@ -1322,14 +1438,68 @@ def make_chromium_eles(page, _ids, index=1, is_obj_id=True, ele_only=False):
             return get_node_func(page, obj_id, ele_only)
 
     else:  # 获取全部
-        nodes = []
-        for obj_id in _ids:
-            tmp = get_node_func(page, obj_id, ele_only)
-            if tmp is False:
-                return False
-            elif tmp is not None:
-                nodes.append(tmp)
-        return nodes
+        return _make_eles_in_batch(page, _ids, is_obj_id, ele_only)
+
+
+def _make_eles_in_batch(page, _ids, is_obj_id, ele_only):
+    """批量获取节点信息并生成元素对象，每批指令一次发出，元素数量不影响往返次数
+    :param page: ChromiumPage对象
+    :param _ids: 元素的id列表
+    :param is_obj_id: 传入的id是obj id还是node id
+    :param ele_only: 是否只返回ele
+    :return: 浏览器元素对象或文本组成的列表，生成失败返回False
+    """
+    if not all(_ids):
+        return False
+    driver = page.driver
+    count = len(_ids)
+    if Settings.lazy_element:  # 只获取节点信息，用于区分文本节点和frame元素，其它id使用时再获取
+        r = driver.run_many([('DOM.describeNode', {'objectId' if is_obj_id else 'nodeId': i}) for i in _ids])
+        if any('error' in i for i in r):
+            return False
+        infos = r
+        obj_ids = _ids if is_obj_id else [None] * count
+        node_ids = [None] * count if is_obj_id else _ids
+        docs = [None] * count
+
+    elif is_obj_id:  # 一批获取节点信息、node id和所在文档
+        r = driver.run_many([('DOM.describeNode', {'objectId': i}) for i in _ids]
+                            + [('DOM.requestNode', {'objectId': i}) for i in _ids]
+                            + [('Runtime.callFunctionOn', {'functionDeclaration': _DOC_JS, 'objectId': i})
+                               for i in _ids])
+        if any('error' in i for i in r):
+            return False
+        infos = r[:count]
+        obj_ids = _ids
+        node_ids = [i['nodeId'] for i in r[count:count * 2]]
+        docs = r[count * 2:]
+
+    else:  # 第一批获取节点信息和object id，第二批获取所在文档
+        r = driver.run_many([('DOM.describeNode', {'nodeId': i}) for i in _ids]
+                            + [('DOM.resolveNode', {'nodeId': i}) for i in _ids])
+        if any('error' in i for i in r):
+            return False
+        infos = r[:count]
+        obj_ids = [i['object']['objectId'] for i in r[count:]]
+        node_ids = _ids
+        ele_ind = [k for k, node in enumerate(infos) if node['node']['nodeName'] not in ('#text', '#comment')]
+        r = driver.run_many([('Runtime.callFunctionOn', {'functionDeclaration': _DOC_JS, 'objectId': obj_ids[k]})
+                             for k in ele_ind])
+        if any('error' in i for i in r):
+            return False
+        docs = [None] * count
+        for k, doc in zip(ele_ind, r):
+            docs[k] = doc
+
+    nodes = []
+    for obj_id, node_id, node, doc in zip(obj_ids, node_ids, infos, docs):
+        if node['node']['nodeName'] in ('#text', '#comment'):
+            if not ele_only:
+                nodes.append(node['node']['nodeValue'])
+        else:
+            node['node']['nodeId'] = node_id
+            nodes.append(_make_ele(page, obj_id, node, doc['result'].get('objectId') if doc else None))
+    return nodes
 
 
 def _get_node_info(page, id_type, _id):
@@ -1360,6 +1530,8 @@ def _get_node_by_node_id(page, node_id, ele_only):
         return False
     if node['node']['nodeName'] in ('#text', '#comment'):
         return None if ele_only else node['node']['nodeValue']
+    elif Settings.lazy_element:
+        return _make_ele(page, None, node)
     else:
         obj_id = page.driver.run('DOM.resolveNode', nodeId=node_id)
         if 'error' in obj_id:
@@ -1368,22 +1540,85 @@ def _get_node_by_node_id(page, node_id, ele_only):
         return _make_ele(page, obj_id, node)
 
 
-def _make_ele(page, obj_id, node):
-    ele = ChromiumElement(page, obj_id=obj_id, node_id=node['node']['nodeId'],
-                          backend_id=node['node']['backendNodeId'])
+def _make_ele(page, obj_id, node, doc_id=None):
+    """用已获取的节点信息生成元素对象
+    :param page: 元素所在页面对象
+    :param obj_id: 元素的object id
+    :param node: DOM.describeNode返回的节点信息
+    :param doc_id: 元素所在文档的object id，为None时由元素自行获取
+    :return: ChromiumElement或ChromiumFrame对象
+    """
+    ele = ChromiumElement(page, obj_id=obj_id, node_id=node['node']['nodeId'] or None,
+                          backend_id=node['node']['backendNodeId'], doc_id=doc_id)
+    if ele._tag is None:
+        ele._tag = node['node']['localName'].lower()
     if ele.tag in __FRAME_ELEMENT__:
         from .._pages.chromium_frame import ChromiumFrame
         ele = ChromiumFrame(page, ele, node)
     return ele
 
 
+def make_js_for_wait_ele(find_js, node_txt):
+    """把查找元素的js包装成等待元素出现的js，结果会被缓存。
+    生成的js接收(超时毫秒数, 至少找到的结果数, 是否只返回是否找到)三个参数，返回Promise，
+    先查找一次，没找到时用MutationObserver监视dom变化，每次变化后重新查找，找到或超时时返回查找结果
+    :param find_js: 查找元素的js
+    :param node_txt: 查找的节点，用于监视其变化
+    :return: js文本
+    """
+    return locator_cache.get('wait_js', (find_js, node_txt), _make_js_for_wait_ele, find_js, node_txt)
+
+
+def _make_js_for_wait_ele(find_js, node_txt):
+    """生成js文本，参数和返回值与make_js_for_wait_ele()相同"""
+    target = 'this' if node_txt == 'this' else f'{node_txt} || this'
+    return f'''function(timeout, count, test){{
+const find = {find_js};
+const self = this, target = {target};
+const found = r => r !== null && r !== undefined
+    && !((r instanceof NodeList || Array.isArray(r)) && r.length < count);
+let r = find.call(self);
+if(found(r) || !(timeout > 0)){{return test ? found(r) : r;}}
+return new Promise(resolve => {{
+    let t;
+    const ob = new MutationObserver(() => {{r = find.call(self); if(found(r)){{done();}}}});
+    function done(){{ob.disconnect(); clearTimeout(t); resolve(test ? found(r) : r);}}
+    ob.observe(target, {{childList: true, subtree: true, attributes: true, characterData: true}});
+    t = setTimeout(() => {{r = find.call(self); done();}}, timeout);
+}});
+}}'''
+
+
+def make_js_for_find_ele_by_css(selector, find_all, node_txt):
+    """生成用css selector在元素中查找元素的js文本，结果会被缓存
+    :param selector: css selector文本
+    :param find_all: 为'All'时查找全部，为''时查找第一个
+    :param node_txt: 节点类型
+    :return: js文本
+    """
+    return locator_cache.get('css_js', (selector, find_all, node_txt), _make_js_for_find_ele_by_css,
+                             selector, find_all, node_txt)
+
+
+def _make_js_for_find_ele_by_css(selector, find_all, node_txt):
+    """生成js文本，参数和返回值与make_js_for_find_ele_by_css()相同"""
+    selector = selector.replace('"', r'\"')
+    return f'function(){{return {node_txt}.querySelector{find_all}("{selector}");}}'
+
+
 def make_js_for_find_ele_by_xpath(xpath, type_txt, node_txt):
-    """生成用xpath在元素中查找元素的js文本
+    """生成用xpath在元素中查找元素的js文本，结果会被缓存
     :param xpath: xpath文本
     :param type_txt: 查找类型
     :param node_txt: 节点类型
     :return: js文本
     """
+    return locator_cache.get('xpath_js', (xpath, type_txt, node_txt), _make_js_for_find_ele_by_xpath,
+                             xpath, type_txt, node_txt)
+
+
+def _make_js_for_find_ele_by_xpath(xpath, type_txt, node_txt):
+    """生成js文本，参数和返回值与make_js_for_find_ele_by_xpath()相同"""
     for_txt = ''
 
     # 获取第一个元素、节点或属性
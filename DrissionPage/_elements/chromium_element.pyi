@@ -28,16 +28,17 @@ PIC_TYPE = Literal['jpg', 'jpeg', 'png', 'webp', True]
 
 class ChromiumElement(DrissionElement):
 
-    def __init__(self, owner: ChromiumBase, node_id: int = None, obj_id: str = None, backend_id: int = None):
+    def __init__(self, owner: ChromiumBase, node_id: int = None, obj_id: str = None, backend_id: int = None,
+                 doc_id: str = None, lazy: bool = None):
         self._tag: str = ...
         # self.page: Union[ChromiumPage, WebPage] = ...
         self.owner: ChromiumBase = ...
         self.page: Union[ChromiumPage, WebPage] = ...
         self.tab: Union[ChromiumPage, ChromiumTab] = ...
-        self._node_id: int = ...
-        self._obj_id: str = ...
-        self._backend_id: int = ...
-        self._doc_id: str = ...
+        self._nid: Optional[int] = ...
+        self._oid: Optional[str] = ...
+        self._bid: Optional[int] = ...
+        self._did: Union[str, None, Literal[False]] = ...
         self._scroll: ElementScroller = ...
         self._clicker: Clicker = ...
         self._select: SelectElement = ...
@@ -58,6 +59,27 @@ class ChromiumElement(DrissionElement):
 
     def __getattr__(self, item: str) -> str: ...
 
+    @property
+    def _node_id(self) -> int: ...
+
+    @_node_id.setter
+    def _node_id(self, node_id: int) -> None: ...
+
+    @property
+    def _obj_id(self) -> str: ...
+
+    @_obj_id.setter
+    def _obj_id(self, obj_id: str) -> None: ...
+
+    @property
+    def _backend_id(self) -> int: ...
+
+    @_backend_id.setter
+    def _backend_id(self, backend_id: int) -> None: ...
+
+    @property
+    def _doc_id(self) -> Optional[str]: ...
+
     @property
     def tag(self) -> str: ...
 
@@ -243,6 +265,8 @@ class ChromiumElement(DrissionElement):
 
     def _get_backend_id(self, node_id: int) -> int: ...
 
+    def _run_cdps(self, *cmds: Tuple[str, dict]) -> List[dict]: ...
+
     def _refresh_id(self) -> None: ...
 
     def _get_ele_path(self, mode: str) -> str: ...
@@ -361,6 +385,16 @@ def find_by_css(ele: ChromiumElement,
                 timeout: float) -> Union[ChromiumElement, List[ChromiumElement],]: ...
 
 
+def _run_find_js(ele: Union[ChromiumElement, ChromiumFrame],
+                 js: str,
+                 node_txt: str,
+                 wait: float,
+                 count: int = 1) -> dict: ...
+
+
+def wait_ele_in_page(page: ChromiumBase, loc: Tuple[str, str], timeout: float, count: int = 1) -> bool: ...
+
+
 def make_chromium_eles(page: Union[ChromiumBase, ChromiumPage, WebPage, ChromiumTab, ChromiumFrame],
                        _ids: Union[tuple, list, str, int],
                        index: Optional[int] = 1,
@@ -369,9 +403,24 @@ def make_chromium_eles(page: Union[ChromiumBase, ChromiumPage, WebPage, Chromium
                        ) -> Union[ChromiumElement, ChromiumFrame, List[Union[ChromiumElement, ChromiumFrame]]]: ...
 
 
+def make_js_for_wait_ele(find_js: str, node_txt: str) -> str: ...
+
+
+def _make_js_for_wait_ele(find_js: str, node_txt: str) -> str: ...
+
+
+def make_js_for_find_ele_by_css(selector: str, find_all: str, node_txt: str) -> str: ...
+
+
+def _make_js_for_find_ele_by_css(selector: str, find_all: str, node_txt: str) -> str: ...
+
+
 def make_js_for_find_ele_by_xpath(xpath: str, type_txt: str, node_txt: str) -> str: ...
 
 
+def _make_js_for_find_ele_by_xpath(xpath: str, type_txt: str, node_txt: str) -> str: ...
+
+
 def run_js(page_or_ele: Union[ChromiumBase, ChromiumElement, ShadowRoot],
            script: str,
            as_expr: bool,
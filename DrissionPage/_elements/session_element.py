@@ -8,12 +8,13 @@
 from html import unescape
 from re import match, sub, DOTALL
 
-from lxml.etree import tostring
+from lxml.cssselect import CSSSelector
+from lxml.etree import tostring, XPath
 from lxml.html import HtmlElement, fromstring
 
 from .none_element import NoneElement
 from .._base.base import DrissionElement, BasePage, BaseElement
-from .._functions.locator import get_loc
+from .._functions.locator import get_loc, locator_cache
 from .._functions.web import get_ele_txt, make_absolute_link
 
 
@@ -380,10 +381,10 @@ def make_session_ele(html_or_ele, loc=None, index=1):
 
     # ---------------执行查找-----------------
     try:
-        if loc[0] == 'xpath':  # 用lxml内置方法获取lxml的元素对象列表
-            eles = html_or_ele.xpath(loc[1])
-        else:  # 用css selector获取元素对象列表
-            eles = html_or_ele.cssselect(loc[1])
+        if loc[0] == 'xpath':  # 用编译后的xpath获取lxml的元素对象列表
+            eles = locator_cache.get('lxml_xpath', loc[1], XPath, loc[1])(html_or_ele)
+        else:  # 用编译后的css selector获取元素对象列表
+            eles = locator_cache.get('lxml_css', loc[1], CSSSelector, loc[1], None, 'html')(html_or_ele)
 
         if not isinstance(eles, list):  # 结果不是列表，如数字
             return eles
@@ -16,6 +16,7 @@ from time import perf_counter, sleep
 from requests import get as requests_get
 
 from .tools import port_is_using
+from .._base.driver import record_http
 from .._configs.options_manage import OptionsManager
 from ..errors import BrowserConnectError
 
@@ -25,6 +26,10 @@ def connect_browser(option):
     :param option: ChromiumOptions对象
     :return: 返回是否接管的浏览器
     """
+    if option.is_pipe:
+        _connect_pipe(option)
+        return False
+
     address = option.address.replace('localhost', '127.0.0.1').lstrip('http://').lstrip('https://')
     browser_path = option.browser_path
 
@@ -58,6 +63,33 @@ def connect_browser(option):
     return False
 
 
+def _connect_pipe(option):
+    """以管道方式启动浏览器，并把地址设为管道连接的地址
+    :param option: ChromiumOptions对象
+    :return: None
+    """
+    args = get_launch_args(option)
+    set_prefs(option)
+    set_flags(option)
+    try:
+        conn = _run_browser_pipe(option.browser_path, args)
+    except FileNotFoundError:
+        browser_path = get_chrome_path(option.ini_path)
+        if not browser_path:
+            raise FileNotFoundError('无法找到浏览器可执行文件路径，请手动配置。')
+        conn = _run_browser_pipe(browser_path, args)
+
+    try:
+        r = conn.call('Target.getTargetInfo')  # 浏览器能响应即已可用，不需轮询
+    except BrowserConnectError:
+        conn.close()
+        raise BrowserConnectError('\n浏览器管道连接失败。\n请确认：\n1、用户文件夹没有和已打开的浏览器冲突\n'
+                                  '2、如为无界面系统，请添加\'--headless=new\'参数\n'
+                                  '3、如果是Linux系统，可能还要添加\'--no-sandbox\'启动参数')
+    conn.browser_id = r.get('result', {}).get('targetInfo', {}).get('targetId') or conn.address
+    option._address = conn.address
+
+
 def get_launch_args(opt):
     """从ChromiumOptions获取命令行启动参数
     :param opt: ChromiumOptions
@@ -202,8 +234,10 @@ def test_connect(ip, port, timeout=30):
     end_time = perf_counter() + timeout
     while perf_counter() < end_time:
         try:
-            tabs = requests_get(f'http://{ip}:{port}/json', timeout=10, headers={'Connection': 'close'},
-                                proxies={'http': None, 'https': None}).json()
+            url = f'http://{ip}:{port}/json'
+            r = requests_get(url, timeout=10, headers={'Connection': 'close'}, proxies={'http': None, 'https': None})
+            tabs = r.json()
+            record_http(url, r)
             for tab in tabs:
                 if tab['type'] in ('page', 'webview'):
                     return
@@ -235,6 +269,54 @@ def _run_browser(port, path: str, args) -> Popen:
         raise FileNotFoundError('未找到浏览器，请手动指定浏览器可执行文件路径。')
 
 
+# 管道模式浏览器的启动包装，把argv[1]、argv[2]两个描述符重定向到3、4后执行浏览器
+_PIPE_EXEC = ('import os, sys; r, w = int(sys.argv[1]), int(sys.argv[2]); os.dup2(r, 3); os.dup2(w, 4); '
+              'os.close(r); os.close(w); os.execv(sys.argv[3], sys.argv[3:])')
+
+
+def _run_browser_pipe(path, args):
+    """以--remote-debugging-pipe参数创建浏览器进程，浏览器从文件描述符3读取指令，向4写入数据
+    :param path: 浏览器路径
+    :param args: 启动参数
+    :return: PipeConnection对象
+    """
+    if system().lower() == 'windows':
+        raise RuntimeError('管道模式暂不支持Windows系统。')
+    from fcntl import fcntl, F_DUPFD
+    from os import pipe, close
+    from shutil import which
+    from sys import executable
+    from .._base.pipe import PipeConnection
+
+    p = Path(path)
+    p = str(p / 'chrome') if p.is_dir() else str(path)
+    # 经包装进程启动，找不到浏览器时无法得到FileNotFoundError，须事先检查；execv不搜索PATH，须传入完整路径
+    p = which(p)
+    if not p:
+        raise FileNotFoundError('未找到浏览器，请手动指定浏览器可执行文件路径。')
+
+    to_browser_r, to_browser_w = pipe()
+    from_browser_r, from_browser_w = pipe()
+    # 把子进程要用的两端复制到不小于10的描述符，避免重定向到3、4时互相覆盖
+    r, w = fcntl(to_browser_r, F_DUPFD, 10), fcntl(from_browser_w, F_DUPFD, 10)
+    close(to_browser_r)
+    close(from_browser_w)
+    # 由一个python进程把两端重定向到3、4再exec浏览器，不使用preexec_fn，多线程下也安全
+    arguments = [executable, '-I', '-S', '-c', _PIPE_EXEC, str(r), str(w), p, '--remote-debugging-pipe']
+    arguments.extend(args)
+
+    try:
+        proc = Popen(arguments, shell=False, stdout=DEVNULL, stderr=DEVNULL, close_fds=True, pass_fds=(r, w))
+    except Exception:
+        close(to_browser_w)
+        close(from_browser_r)
+        raise
+    finally:
+        close(r)
+        close(w)
+    return PipeConnection(f'cdp-pipe:{proc.pid}', from_browser_r, to_browser_w)
+
+
 def _make_leave_in_dict(target_dict: dict, src: list, num: int, end: int) -> None:
     """把prefs中a.b.c形式的属性转为a['b']['c']形式
     :param target_dict: 要处理的字典
@@ -0,0 +1,193 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from json import dumps
+from time import perf_counter, sleep
+
+from .locator import get_loc
+from .web import make_absolute_link, format_html, NOWRAP_TAGS, WRAP_AFTER_TAGS, NO_TEXT_TAGS, TAB_TAGS
+from .._elements.session_element import make_session_ele
+
+# 字段取值方式，与元素对象同名属性的返回值一致
+_KINDS = ('text', 'raw_text', 'html', 'inner_html', 'tag')
+# attr()中不按attribute处理的属性名
+_ATTR_KINDS = {'text': 'text', 'innerText': 'raw_text', 'html': 'html', 'outerHTML': 'html',
+               'innerHTML': 'inner_html'}
+
+# 在页面中一次取得所有字段，text与get_ele_txt()处理方式相同，href和src返回原值和baseURI，由python转为绝对链接
+_EXTRACT_JS = '''function(q){
+const NOWRAP = new Set(%s), WRAP = new Set(%s), NO_TEXT = new Set(%s), TAB = new Set(%s);
+function tagOf(el){return el.localName.toLowerCase();}
+function find(root, by, loc, all){
+    if(by === 'css selector'){
+        if(loc.trim().startsWith('>')){loc = ':scope ' + loc;}
+        return all ? Array.from(root.querySelectorAll(loc)) : root.querySelector(loc);
+    }
+    if(root.nodeType !== 9 && loc.trim().startsWith('/')){loc = '.' + loc;}
+    let r = (root.ownerDocument || root).evaluate(loc, root, null, 7, null), a = [];
+    for(let i = 0; i < r.snapshotLength; i++){
+        let n = r.snapshotItem(i);
+        if(n.nodeType === 1){if(!all){return n;} a.push(n);}
+    }
+    return all ? a : null;
+}
+function nodeTxt(el, pre){
+    let tag = tagOf(el), a = [], prev = '';
+    if(tag === 'br'){return [true];}
+    if(!pre && tag === 'pre'){pre = true;}
+    if(NO_TEXT.has(tag) && !pre){return a;}
+    for(const n of el.childNodes){
+        if(n.nodeType === 3){
+            if(pre){a.push(n.data);}
+            else if(/[^ \\n\\t\\r]/.test(n.data)){
+                a.push(n.data.replace(/\\r\\n/g, ' ').replace(/\\n/g, ' ').replace(/^ +| +$/g, '').replace(/ {2,}/g, ' '));
+            }
+        }else if(n.nodeType === 1){
+            let t = tagOf(n);
+            if(!NOWRAP.has(t) && a.length && a[a.length - 1] !== '\\n'){a.push('\\n');}
+            if(TAB.has(t) && TAB.has(prev)){a.push('\\t');}
+            a.push(...nodeTxt(n, pre));
+            prev = t;
+        }
+    }
+    if(WRAP.has(tag) && a.length && a[a.length - 1] !== '\\n' && a[a.length - 1] !== true){a.push('\\n');}
+    return a;
+}
+function text(el){
+    if(NO_TEXT.has(tagOf(el))){return el.textContent;}
+    let a = nodeTxt(el, false);
+    if(a.length && a[a.length - 1] === '\\n'){a.pop();}
+    return a.map(i => i === true ? '\\n' : i).join('');
+}
+function get(el, kind, name){
+    if(!el){return null;}
+    switch(kind){
+        case 'text': return text(el);
+        case 'raw_text': return el.innerText;
+        case 'html': return el.outerHTML;
+        case 'inner_html': return el.innerHTML;
+        case 'tag': return tagOf(el);
+    }
+    let v = el.getAttribute(name);
+    return name === 'href' || name === 'src' ? [v, el.baseURI] : v;
+}
+return find(this, q.by, q.loc, true).map(el => q.fields.map(f => get(f[0] ? find(el, f[0], f[1], false) : el, f[2], f[3])));
+}''' % (dumps(NOWRAP_TAGS), dumps(WRAP_AFTER_TAGS), dumps(NO_TEXT_TAGS), dumps(TAB_TAGS))
+
+
+def parse_spec(spec):
+    """把字段说明转换为统一格式
+    :param spec: dict，key为字段名，value为取值方式，或(定位符, 取值方式)表示取内部第一个符合条件的元素的值。
+                 取值方式可以是'text'、'raw_text'、'html'、'inner_html'、'tag'或'@属性名'
+    :return: [(字段名, 定位元组或None, 取值方式, 属性名), ...]
+    """
+    if not isinstance(spec, dict) or not spec:
+        raise TypeError('spec参数只能是非空的dict。')
+
+    fields = []
+    for name, value in spec.items():
+        loc = None
+        if isinstance(value, (tuple, list)):
+            if len(value) != 2:
+                raise ValueError(f'字段{name}的格式应为(定位符, 取值方式)，现在是：{value}')
+            loc, value = get_loc(value[0]), value[1]
+
+        if not isinstance(value, str):
+            raise TypeError(f'字段{name}的取值方式只能是str，现在是：{value}')
+        if value in _KINDS:
+            fields.append((name, loc, value, None))
+        elif value.startswith('@') and len(value) > 1:
+            attr = value[1:]
+            kind = _ATTR_KINDS.get(attr, 'attr')
+            fields.append((name, loc, kind, attr if kind == 'attr' else None))
+        else:
+            raise ValueError(f"字段{name}的取值方式只能是{'、'.join(_KINDS)}或'@属性名'，现在是：{value}")
+
+    return fields
+
+
+def chromium_extract(page, locator, spec, columns=False, timeout=None):
+    """在浏览器页面中执行一次js，获取所有符合条件的元素的多个字段
+    :param page: ChromiumBase对象
+    :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+    :param spec: 字段说明，格式见parse_spec()
+    :param columns: 为True时返回{字段名: 值列表}，为False时返回每个元素一个dict组成的列表
+    :param timeout: 等待出现符合条件元素的超时时间（秒），为None时使用页面timeout属性值
+    :return: 结果列表或dict
+    """
+    fields = parse_spec(spec)
+    loc = get_loc(locator)
+    arg = {'by': loc[0], 'loc': loc[1],
+           'fields': [[i[1][0], i[1][1], i[2], i[3]] if i[1] else [None, None, i[2], i[3]] for i in fields]}
+
+    page.wait.doc_loaded()
+    timeout = timeout if timeout is not None else page.timeout
+    end_time = perf_counter() + timeout
+    while True:
+        res = page.run_cdp('Runtime.callFunctionOn', functionDeclaration=_EXTRACT_JS, objectId=page._root_id,
+                           arguments=[{'value': arg}], returnByValue=True, awaitPromise=False)
+        if 'exceptionDetails' in res:
+            raise SyntaxError(f'查询语句错误：\n{res}')
+        rows = res['result']['value']
+        if rows or perf_counter() >= end_time:
+            break
+        sleep(.1)
+
+    for row in rows:
+        for k, (_, _, kind, attr) in enumerate(fields):
+            v = row[k]
+            if v is None:
+                continue
+            if kind == 'text':
+                row[k] = format_html(v)
+            elif attr == 'href':
+                link, base = v
+                row[k] = link if not link or link.lower().startswith(('javascript:', 'mailto:')) \
+                    else make_absolute_link(link, base)
+            elif attr == 'src':
+                row[k] = make_absolute_link(v[0], v[1])
+
+    return _make_result(rows, fields, columns)
+
+
+def session_extract(page_or_ele, locator, spec, columns=False):
+    """在静态html中获取所有符合条件的元素的多个字段，返回格式与chromium_extract()相同
+    :param page_or_ele: SessionPage、SessionElement对象或html文本
+    :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+    :param spec: 字段说明，格式见parse_spec()
+    :param columns: 为True时返回{字段名: 值列表}，为False时返回每个元素一个dict组成的列表
+    :return: 结果列表或dict
+    """
+    fields = parse_spec(spec)
+    rows = []
+    for ele in make_session_ele(page_or_ele, locator, index=None):
+        if isinstance(ele, str):
+            continue
+        row = []
+        for _, loc, kind, attr in fields:
+            e = ele.ele(loc) if loc else ele
+            if not e:
+                row.append(None)
+            elif kind == 'attr':
+                row.append(e.attr(attr))
+            else:
+                row.append(getattr(e, kind))
+        rows.append(row)
+    return _make_result(rows, fields, columns)
+
+
+def _make_result(rows, fields, columns):
+    """把每行的值列表转换为返回格式
+    :param rows: 每个元素的字段值列表组成的列表
+    :param fields: parse_spec()返回的字段列表
+    :param columns: 是否按列返回
+    :return: 结果列表或dict
+    """
+    names = [i[0] for i in fields]
+    if columns:
+        return {name: [row[k] for row in rows] for k, name in enumerate(names)}
+    return [dict(zip(names, row)) for row in rows]
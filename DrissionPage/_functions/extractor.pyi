@@ -0,0 +1,39 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from typing import Union, Tuple, List, Dict, Any, Optional
+
+from .._elements.session_element import SessionElement
+from .._pages.chromium_base import ChromiumBase
+from .._pages.session_page import SessionPage
+
+_KINDS: Tuple[str, ...] = ...
+_ATTR_KINDS: Dict[str, str] = ...
+_EXTRACT_JS: str = ...
+
+SPEC = Dict[str, Union[str, Tuple[Union[Tuple[str, str], str], str]]]
+FIELD = Tuple[str, Optional[Tuple[str, str]], str, Optional[str]]
+RESULT = Union[List[Dict[str, Any]], Dict[str, List[Any]]]
+
+
+def parse_spec(spec: SPEC) -> List[FIELD]: ...
+
+
+def chromium_extract(page: ChromiumBase,
+                     locator: Union[Tuple[str, str], str],
+                     spec: SPEC,
+                     columns: bool = False,
+                     timeout: float = None) -> RESULT: ...
+
+
+def session_extract(page_or_ele: Union[SessionPage, SessionElement, str],
+                    locator: Union[Tuple[str, str], str],
+                    spec: SPEC,
+                    columns: bool = False) -> RESULT: ...
+
+
+def _make_result(rows: List[list], fields: List[FIELD], columns: bool) -> RESULT: ...
@@ -5,8 +5,74 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
+from collections import OrderedDict
 from re import split
+from threading import Lock
+
 from .by import By
+from .settings import Settings
+
+
+class LocatorCache(object):
+    """保存解析或编译后的定位符，数量超过Settings.locator_cache_size时丢弃最久未使用的，可被多个线程共用"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._items = OrderedDict()
+        self._stats = {}
+
+    @property
+    def stats(self):
+        """返回缓存统计
+        :return: {'size': 当前条数, 'max_size': 最大条数, 'hits': 命中次数, 'misses': 未命中次数, 'hit_rate': 命中率,
+                  'kinds': {类型: {'hits': 命中次数, 'misses': 未命中次数}}}
+        """
+        with self._lock:
+            kinds = {k: {'hits': v[0], 'misses': v[1]} for k, v in self._stats.items()}
+            size = len(self._items)
+        hits = sum(i['hits'] for i in kinds.values())
+        misses = sum(i['misses'] for i in kinds.values())
+        return {'size': size, 'max_size': Settings.locator_cache_size, 'hits': hits, 'misses': misses,
+                'hit_rate': hits / (hits + misses) if hits + misses else 0., 'kinds': kinds}
+
+    def get(self, kind, key, maker, *args):
+        """获取缓存的结果，没有时调用maker(*args)生成并保存
+        :param kind: 结果类型，用于区分不同用途和分类统计
+        :param key: 能hash的缓存键
+        :param maker: 生成结果的方法
+        :param args: 传给maker的参数
+        :return: 缓存的或新生成的结果
+        """
+        max_size = Settings.locator_cache_size
+        if not max_size:
+            return maker(*args)
+        try:
+            key = kind, key
+            with self._lock:
+                r = self._items.get(key)
+                if r is not None:
+                    self._items.move_to_end(key)
+                    self._stats.setdefault(kind, [0, 0])[0] += 1
+                    return r
+        except TypeError:  # key不能hash
+            return maker(*args)
+
+        r = maker(*args)
+        with self._lock:
+            self._stats.setdefault(kind, [0, 0])[1] += 1
+            self._items[key] = r
+            while len(self._items) > max_size:
+                self._items.popitem(last=False)
+        return r
+
+    def clear(self):
+        """清空缓存和统计数据"""
+        with self._lock:
+            self._items.clear()
+            self._stats.clear()
+
+
+locator_cache = LocatorCache()  # 所有页面和元素共用的定位符缓存
 
 
 def is_loc(text):
@@ -16,12 +82,17 @@ def is_loc(text):
 
 
 def get_loc(loc, translate_css=False, css_mode=False):
-    """接收本库定位语法或selenium定位元组，转换为标准定位元组，可翻译css selector为xpath
+    """接收本库定位语法或selenium定位元组，转换为标准定位元组，可翻译css selector为xpath，结果会被缓存
     :param loc: 本库定位语法或selenium定位元组
     :param translate_css: 是否翻译css selector为xpath，用于相对定位
     :param css_mode: 是否尽量用css selector方式
     :return: DrissionPage定位元组
     """
+    return locator_cache.get('loc', (loc, translate_css, css_mode), _get_loc, loc, translate_css, css_mode)
+
+
+def _get_loc(loc, translate_css=False, css_mode=False):
+    """执行定位符转换，参数和返回值与get_loc()相同"""
     if isinstance(loc, tuple):
         loc = translate_css_loc(loc) if css_mode else translate_loc(loc)
 
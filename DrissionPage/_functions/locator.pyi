@@ -5,7 +5,26 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
-from typing import Union
+from collections import OrderedDict
+from threading import Lock
+from typing import Union, Any, Callable, Dict, Hashable, List
+
+
+class LocatorCache(object):
+    def __init__(self):
+        self._lock: Lock = ...
+        self._items: OrderedDict = ...
+        self._stats: Dict[str, List[int]] = ...
+
+    @property
+    def stats(self) -> dict: ...
+
+    def get(self, kind: str, key: Hashable, maker: Callable, *args) -> Any: ...
+
+    def clear(self) -> None: ...
+
+
+locator_cache: LocatorCache = ...
 
 
 def is_loc(text: str) -> bool: ...
@@ -14,6 +33,9 @@ def is_loc(text: str) -> bool: ...
 def get_loc(loc: Union[tuple, str], translate_css: bool = False, css_mode: bool = False) -> tuple: ...
 
 
+def _get_loc(loc: Union[tuple, str], translate_css: bool = False, css_mode: bool = False) -> tuple: ...
+
+
 def str_to_xpath_loc(loc: str) -> tuple: ...
 
 
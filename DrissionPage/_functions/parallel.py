@@ -0,0 +1,178 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from copy import deepcopy
+from itertools import count
+from multiprocessing import get_context
+from os import cpu_count
+from pickle import dumps
+from queue import Empty
+from time import perf_counter
+
+from .._configs.chromium_options import ChromiumOptions
+from .._pages.chromium_page import ChromiumPage
+from ..errors import WorkerExitedError
+
+
+def run_parallel(func, urls, workers=None, options=None, ordered=True, retries=1, max_restarts=3):
+    """在多个进程中并行处理网址，每个进程启动一个自动分配端口的浏览器，网址逐个分发给空闲的进程。
+    使用spawn方式创建进程，调用的脚本须有if __name__ == '__main__'保护
+    :param func: 处理方法，接收(page, url)两个参数，须是模块顶层定义的方法，返回值须能被pickle
+    :param urls: 网址列表或可迭代对象，按需读取
+    :param workers: 进程数，为None时使用cpu核数
+    :param options: 启动浏览器使用的ChromiumOptions对象，每个进程使用它的副本并自动分配端口
+    :param ordered: 是否按输入顺序返回结果，为False时按完成顺序返回
+    :param retries: 进程意外退出时，正在处理的网址重新分发的次数
+    :param max_restarts: 进程意外退出时最多补充启动多少个新进程
+    :return: 生成器，每项为(url, 结果)，func抛出的异常作为结果返回，重试后仍失败的为WorkerExitedError
+    """
+    ctx = get_context('spawn')
+    options = options or ChromiumOptions()
+    results = ctx.Queue()
+    urls = enumerate(urls)
+    workers = workers or cpu_count() or 1
+    ids = count()
+
+    procs = {}  # 格式：{worker_id: (Process, Queue)}
+    current = {}  # 每个进程正在处理的任务，格式：{worker_id: (index, url)}
+    retry = []  # 等待重新分发的任务
+    tries = {}  # 每个任务被重新分发的次数
+    done = {}  # 按顺序返回时已完成但未返回的结果
+    next_index = 0
+    exhausted = False
+    restarts = 0
+    error = None  # 最近一次浏览器启动失败的异常
+
+    def start():
+        wid = next(ids)
+        tasks = ctx.Queue()
+        proc = ctx.Process(target=_work, args=(wid, func, options, tasks, results))
+        proc.daemon = True
+        proc.start()
+        procs[wid] = (proc, tasks)
+
+    def assign(wid):
+        nonlocal exhausted
+        task = None
+        if retry:
+            task = retry.pop(0)
+        elif not exhausted:
+            try:
+                task = next(urls)
+            except StopIteration:
+                exhausted = True
+        if task is not None:
+            current[wid] = task
+        procs[wid][1].put(task)
+
+    for _ in range(workers):
+        start()
+
+    try:
+        check_time = perf_counter()
+        while procs:
+            finished = []
+            try:
+                msg = results.get(timeout=.5)
+            except Empty:
+                msg = None
+
+            if msg is None or perf_counter() - check_time > 1:  # 检查是否有进程意外退出
+                check_time = perf_counter()
+                for wid, (proc, _) in list(procs.items()):
+                    if proc.is_alive():
+                        continue
+                    procs.pop(wid)
+                    task = current.pop(wid, None)
+                    if proc.exitcode == 0 and task is None:
+                        continue
+                    if task is not None:
+                        tries[task[0]] = tries.get(task[0], 0) + 1
+                        if tries[task[0]] <= retries:
+                            retry.append(task)
+                        else:
+                            finished.append((task, WorkerExitedError(f'工作进程意外退出（退出码{proc.exitcode}）。')))
+                    if restarts < max_restarts and (retry or not exhausted):
+                        restarts += 1
+                        start()
+
+            if msg is None:
+                pass
+            elif msg[0] == 'failed':  # 浏览器启动失败，进程随后退出，由上面的检查补充新进程
+                error = msg[2]
+            elif msg[1] not in procs:  # 已判定退出的进程发来的结果不再使用，其任务已重新分发
+                pass
+            elif msg[0] == 'ready':
+                assign(msg[1])
+            elif msg[0] == 'done':
+                finished.append((current.pop(msg[1]), msg[2]))
+                assign(msg[1])
+
+            for (index, url), result in finished:
+                if not ordered:
+                    yield url, result
+                    continue
+                done[index] = (url, result)
+                while next_index in done:
+                    yield done.pop(next_index)
+                    next_index += 1
+
+            if not procs and (retry or not exhausted):
+                raise error or WorkerExitedError('所有工作进程都已退出，还有网址未处理。')
+
+    finally:
+        for _, tasks in procs.values():
+            tasks.put(None)
+        for proc, _ in procs.values():
+            proc.join(10)
+            if proc.is_alive():
+                proc.terminate()
+
+
+def _work(worker_id, func, options, tasks, results):
+    """工作进程执行的方法，启动浏览器后逐个处理分发来的网址
+    :param worker_id: 进程编号
+    :param func: 处理方法
+    :param options: ChromiumOptions对象
+    :param tasks: 接收任务的队列，收到None时退出
+    :param results: 发送结果的队列
+    :return: None
+    """
+    opt = deepcopy(options)
+    if not opt.is_auto_port:
+        opt.auto_port()
+    try:
+        page = ChromiumPage(opt)
+    except Exception as e:
+        results.put(('failed', worker_id, _picklable(e)))
+        raise
+
+    try:
+        results.put(('ready', worker_id))
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            try:
+                r = func(page, task[1])
+            except Exception as e:
+                r = e
+            results.put(('done', worker_id, _picklable(r)))
+    finally:
+        page.quit()
+
+
+def _picklable(obj):
+    """返回能被pickle的对象，不能的转换为RuntimeError
+    :param obj: 要发送的对象
+    :return: 原对象或RuntimeError
+    """
+    try:
+        dumps(obj)
+        return obj
+    except Exception as e:
+        return RuntimeError(f'结果无法序列化：{obj!r}（{e}）')
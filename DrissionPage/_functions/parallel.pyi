@@ -0,0 +1,31 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from multiprocessing import Queue
+from typing import Callable, Iterable, Optional, Any, Generator, Tuple
+
+from .._configs.chromium_options import ChromiumOptions
+from .._pages.chromium_page import ChromiumPage
+
+
+def run_parallel(func: Callable[[ChromiumPage, str], Any],
+                 urls: Iterable[str],
+                 workers: Optional[int] = None,
+                 options: Optional[ChromiumOptions] = None,
+                 ordered: bool = True,
+                 retries: int = 1,
+                 max_restarts: int = 3) -> Generator[Tuple[str, Any], None, None]: ...
+
+
+def _work(worker_id: int,
+          func: Callable[[ChromiumPage, str], Any],
+          options: ChromiumOptions,
+          tasks: Queue,
+          results: Queue) -> None: ...
+
+
+def _picklable(obj: Any) -> Any: ...
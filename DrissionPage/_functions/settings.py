@@ -14,3 +14,15 @@ class Settings(object):
     singleton_tab_obj = True
     cdp_timeout = 30
     auto_handle_alert = None
+    event_workers = 4  # 并发执行cdp事件订阅者的线程池大小
+    event_queue_size = 0  # 每个标签页事件队列的最大长度，0为不限制
+    event_queue_policy = 'block'  # 事件队列满时的处理策略，可选'block'、'drop_oldest'、'drop_type'、'coalesce'
+    event_queue_events = None  # drop_type和coalesce策略适用的事件名称
+    reconnect_times = 0  # 与浏览器的连接断开时自动重连的次数，0为不重连
+    reconnect_interval = .1  # 第一次重连前等待的秒数，之后每次加倍
+    cdp_metrics = False  # 是否让新建的Driver把性能数据记录到DrissionPage._base.metrics.cdp_metrics
+    cdp_record_path = None  # 不为None时，新建的Driver把收发的cdp数据和/json接口数据记录到此文件，可用Replayer回放
+    lazy_element = False  # 是否只保存查找时得到的元素id，其它id和所在文档首次使用时才获取
+    locator_cache_size = 1024  # 解析和编译后的定位符最多缓存多少条，0为不缓存
+    ele_wait_mode = 'observer'  # 等待元素的方式，'observer'为在页面中用MutationObserver等待，'poll'为每0.1秒查找一次
+    json_codec = None  # 与浏览器通讯使用的json库，None为自动选择，可选'orjson'、'ujson'、'json'或(dumps, loads)
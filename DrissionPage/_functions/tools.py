@@ -5,10 +5,13 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
+from contextlib import contextmanager
+from os import getpid
 from pathlib import Path
 from platform import system
+from random import randint
 from shutil import rmtree
-from tempfile import gettempdir, TemporaryDirectory
+from tempfile import gettempdir
 from threading import Lock
 from time import perf_counter, sleep
 
@@ -18,8 +21,10 @@ from ..errors import (ContextLostError, ElementLostError, CDPError, PageDisconne
 
 
 class PortFinder(object):
-    used_port = {}
+    """分配自动端口和用户文件夹，多个进程共用同一临时文件夹时通过文件锁协调，不会分配到相同端口"""
     lock = Lock()
+    _cleaned = set()  # 本进程已清理过的临时文件夹
+    OWNER_FILE = 'DrissionPage.pid'
 
     def __init__(self, path=None):
         """
@@ -28,35 +33,112 @@ class PortFinder(object):
         tmp = Path(path) if path else Path(gettempdir()) / 'DrissionPage'
         self.tmp_dir = tmp / 'UserTempFolder'
         self.tmp_dir.mkdir(parents=True, exist_ok=True)
-        if not PortFinder.used_port:
-            clean_folder(self.tmp_dir)
+        if str(self.tmp_dir) not in PortFinder._cleaned:
+            PortFinder._cleaned.add(str(self.tmp_dir))
+            with self._locked():
+                for f in self.tmp_dir.iterdir():
+                    if f.is_dir() and self._is_stale(f):
+                        rmtree(f, True)
 
     def get_port(self, scope=None):
-        """查找一个可用端口
-        :param scope: 指定端口范围，不含最后的数字，为None则使用[9600-19600)
+        """获取一个可用端口，并以端口号为名创建用户文件夹
+        :param scope: 指定端口范围，不含最后的数字，为None或True时由系统分配
         :return: 可以使用的端口和用户文件夹路径组成的元组
         """
-        with PortFinder.lock:
+        with self._locked():
             if scope in (True, None):
-                scope = (9600, 19600)
-            for i in range(scope[0], scope[1]):
-                if i in PortFinder.used_port:
-                    continue
-                elif port_is_using('127.0.0.1', i):
-                    PortFinder.used_port[i] = None
-                    continue
-                path = TemporaryDirectory(dir=self.tmp_dir).name
-                PortFinder.used_port[i] = path
-                return i, path
-
-            for i in range(scope[0], scope[1]):
-                if port_is_using('127.0.0.1', i):
-                    continue
-                rmtree(PortFinder.used_port[i], ignore_errors=True)
-                return i, TemporaryDirectory(dir=self.tmp_dir).name
+                for _ in range(100):
+                    port = _free_port()
+                    if self._claim(port):
+                        return port, str(self.tmp_dir / str(port))
+
+            else:
+                size = scope[1] - scope[0]
+                start = randint(0, size - 1) if size > 0 else 0
+                for i in range(size):  # 从随机位置开始，减少多个进程同时争用同一端口
+                    port = scope[0] + (start + i) % size
+                    if _free_port(port) and self._claim(port):
+                        return port, str(self.tmp_dir / str(port))
 
         raise OSError('未找到可用端口。')
 
+    def _claim(self, port):
+        """以端口号为名创建用户文件夹并写入当前进程id，文件夹已被存活的进程占用时返回False
+        :param port: 端口号
+        :return: 是否成功
+        """
+        path = self.tmp_dir / str(port)
+        try:
+            path.mkdir()
+        except FileExistsError:
+            if not self._is_stale(path):
+                return False
+            rmtree(path, True)
+            try:
+                path.mkdir()
+            except FileExistsError:
+                return False
+        (path / self.OWNER_FILE).write_text(str(getpid()), encoding='utf-8')
+        return True
+
+    def _is_stale(self, path):
+        """判断一个用户文件夹是否已无人使用：创建它的进程已退出，且对应端口没有浏览器在监听
+        :param path: 用户文件夹路径
+        :return: bool
+        """
+        from psutil import pid_exists
+        try:
+            pid = int((path / self.OWNER_FILE).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            pid = None
+        if pid is not None and pid_exists(pid):
+            return False
+        return not (path.name.isdigit() and port_is_using('127.0.0.1', path.name))
+
+    @contextmanager
+    def _locked(self):
+        """在进程内和进程间独占临时文件夹"""
+        with PortFinder.lock, open(self.tmp_dir / '.lock', 'a+b') as f:
+            if system().lower() == 'windows':
+                from msvcrt import locking, LK_LOCK, LK_UNLCK
+                f.seek(0)
+                while True:
+                    try:
+                        locking(f.fileno(), LK_LOCK, 1)
+                        break
+                    except OSError:  # LK_LOCK重试10秒后仍失败时抛出
+                        continue
+                try:
+                    yield
+                finally:
+                    f.seek(0)
+                    locking(f.fileno(), LK_UNLCK, 1)
+            else:
+                from fcntl import flock, LOCK_EX, LOCK_UN
+                flock(f.fileno(), LOCK_EX)
+                try:
+                    yield
+                finally:
+                    flock(f.fileno(), LOCK_UN)
+
+
+def _free_port(port=0):
+    """绑定本机端口以检查其是否可用，port为0时由系统分配一个空闲端口
+    :param port: 端口号
+    :return: 可用时返回端口号，否则返回None
+    """
+    from socket import socket, AF_INET, SOCK_STREAM, SOL_SOCKET, SO_REUSEADDR
+    s = socket(AF_INET, SOCK_STREAM)
+    if system().lower() != 'windows':  # 与浏览器一致，忽略TIME_WAIT状态的连接
+        s.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+    try:
+        s.bind(('127.0.0.1', port))
+        return s.getsockname()[1]
+    except OSError:
+        return None
+    finally:
+        s.close()
+
 
 def port_is_using(ip, port):
     """检查端口是否被占用
@@ -139,6 +221,50 @@ def get_browser_progress_id(progress, address):
     return txt.split(' ')[-1]
 
 
+def get_browser_memory(browser):
+    """返回浏览器所有进程占用的内存（MB）
+    :param browser: Browser对象
+    :return: 内存大小，获取失败返回0
+    """
+    from psutil import Process
+    try:
+        pids = [i['id'] for i in browser.run_cdp('SystemInfo.getProcessInfo')['processInfo']]
+    except Exception:
+        return 0
+    total = 0
+    for pid in pids:
+        try:
+            total += Process(pid).memory_info().rss
+        except Exception:
+            pass
+    return total / 1048576
+
+
+def wait_pids_exit(pids, timeout=5):
+    """等待多个进程退出，已退出但未被回收的进程视为已退出
+    :param pids: 进程id组成的列表
+    :param timeout: 超时时间（秒）
+    :return: 是否都已退出
+    """
+    from psutil import Process, NoSuchProcess, STATUS_ZOMBIE
+    end_time = perf_counter() + timeout
+    while True:
+        ok = True
+        for pid in pids:
+            try:
+                if Process(pid).status() != STATUS_ZOMBIE:
+                    ok = False
+                    break
+            except NoSuchProcess:
+                pass
+
+        if ok:
+            return True
+        if perf_counter() >= end_time:
+            return False
+        sleep(.05)
+
+
 def get_hwnds_from_pid(pid, title):
     """通过PID查询句柄ID
     :param pid: 进程id
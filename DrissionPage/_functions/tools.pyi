@@ -8,21 +8,31 @@
 from os import popen
 from pathlib import Path
 from threading import Lock
-from typing import Union, Tuple
+from typing import Union, Tuple, Set, Optional, ContextManager
 
 from ..errors import BaseError
+from .._base.browser import Browser
 from .._pages.chromium_base import ChromiumBase
 
 
 class PortFinder(object):
-    used_port: dict = ...
     lock: Lock = ...
+    _cleaned: Set[str] = ...
+    OWNER_FILE: str = ...
     tmp_dir: Path = ...
 
     def __init__(self, path: Union[str, Path] = None): ...
 
-    @staticmethod
-    def get_port(scope: Tuple[int, int] = None) -> Tuple[int, str]: ...
+    def get_port(self, scope: Union[Tuple[int, int], bool] = None) -> Tuple[int, str]: ...
+
+    def _claim(self, port: int) -> bool: ...
+
+    def _is_stale(self, path: Path) -> bool: ...
+
+    def _locked(self) -> ContextManager[None]: ...
+
+
+def _free_port(port: int = 0) -> Optional[int]: ...
 
 
 def port_is_using(ip: str, port: Union[str, int]) -> bool: ...
@@ -37,6 +47,12 @@ def show_or_hide_browser(page: ChromiumBase, hide: bool = True) -> None: ...
 def get_browser_progress_id(progress: Union[popen, None], address: str) -> Union[str, None]: ...
 
 
+def get_browser_memory(browser: Browser) -> float: ...
+
+
+def wait_pids_exit(pids: Union[list, tuple], timeout: float = 5) -> bool: ...
+
+
 def get_hwnds_from_pid(pid: Union[str, int], title: str) -> list: ...
 
 
@@ -14,24 +14,25 @@ from urllib.parse import urlparse, urljoin, urlunparse
 from tldextract import extract
 
 
+# 前面无须换行的元素
+NOWRAP_TAGS = ('br', 'sub', 'sup', 'em', 'strong', 'a', 'font', 'b', 'span', 's', 'i', 'del', 'ins', 'img', 'td',
+               'th', 'abbr', 'bdi', 'bdo', 'cite', 'code', 'data', 'dfn', 'kbd', 'mark', 'q', 'rp', 'rt', 'ruby',
+               'samp', 'small', 'time', 'u', 'var', 'wbr', 'button', 'slot', 'content')
+# 后面添加换行的元素
+WRAP_AFTER_TAGS = ('p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ol', 'li', 'blockquote', 'header',
+                   'footer', 'address' 'article', 'aside', 'main', 'nav', 'section', 'figcaption', 'summary')
+# 不获取文本的元素
+NO_TEXT_TAGS = ('script', 'style', 'video', 'audio', 'iframe', 'embed', 'noscript', 'canvas', 'template')
+# 用/t分隔的元素
+TAB_TAGS = ('td', 'th')
+
+
 def get_ele_txt(e):
     """获取元素内所有文本
     :param e: 元素对象
     :return: 元素内所有文本
     """
-    # 前面无须换行的元素
-    nowrap_list = ('br', 'sub', 'sup', 'em', 'strong', 'a', 'font', 'b', 'span', 's', 'i', 'del', 'ins', 'img', 'td',
-                   'th', 'abbr', 'bdi', 'bdo', 'cite', 'code', 'data', 'dfn', 'kbd', 'mark', 'q', 'rp', 'rt', 'ruby',
-                   'samp', 'small', 'time', 'u', 'var', 'wbr', 'button', 'slot', 'content')
-    # 后面添加换行的元素
-    wrap_after_list = ('p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ol', 'li', 'blockquote', 'header',
-                       'footer', 'address' 'article', 'aside', 'main', 'nav', 'section', 'figcaption', 'summary')
-    # 不获取文本的元素
-    noText_list = ('script', 'style', 'video', 'audio', 'iframe', 'embed', 'noscript', 'canvas', 'template')
-    # 用/t分隔的元素
-    tab_list = ('td', 'th')
-
-    if e.tag in noText_list:
+    if e.tag in NO_TEXT_TAGS:
         return e.raw_text
 
     def get_node_txt(ele, pre: bool = False):
@@ -42,7 +43,7 @@ def get_ele_txt(e):
             pre = True
 
         str_list = []
-        if tag in noText_list and not pre:  # 标签内的文本不返回
+        if tag in NO_TEXT_TAGS and not pre:  # 标签内的文本不返回
             return str_list
 
         nodes = ele.eles('xpath:./text() | *')
@@ -61,15 +62,15 @@ def get_ele_txt(e):
                         str_list.append(txt)
 
             else:  # 元素节点
-                if el.tag not in nowrap_list and str_list and str_list[-1] != '\n':  # 元素间换行的情况
+                if el.tag not in NOWRAP_TAGS and str_list and str_list[-1] != '\n':  # 元素间换行的情况
                     str_list.append('\n')
-                if el.tag in tab_list and prev_ele in tab_list:  # 表格的行
+                if el.tag in TAB_TAGS and prev_ele in TAB_TAGS:  # 表格的行
                     str_list.append('\t')
 
                 str_list.extend(get_node_txt(el, pre))
                 prev_ele = el.tag
 
-        if tag in wrap_after_list and str_list and str_list[-1] not in ('\n', True):  # 有些元素后面要添加回车
+        if tag in WRAP_AFTER_TAGS and str_list and str_list[-1] not in ('\n', True):  # 有些元素后面要添加回车
             str_list.append('\n')
 
         return str_list
@@ -6,7 +6,7 @@
 @License  : BSD 3-Clause.
 """
 from http.cookiejar import Cookie
-from typing import Union
+from typing import Union, Tuple
 
 from requests import Session
 from requests.cookies import RequestsCookieJar
@@ -15,6 +15,11 @@ from .._base.base import DrissionElement, BaseParser
 from .._elements.chromium_element import ChromiumElement
 from .._pages.chromium_base import ChromiumBase
 
+NOWRAP_TAGS: Tuple[str, ...] = ...
+WRAP_AFTER_TAGS: Tuple[str, ...] = ...
+NO_TEXT_TAGS: Tuple[str, ...] = ...
+TAB_TAGS: Tuple[str, ...] = ...
+
 
 def get_ele_txt(e: DrissionElement) -> str: ...
 
@@ -0,0 +1,203 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from contextlib import contextmanager
+from copy import deepcopy
+from queue import Queue, Empty
+from threading import Thread, Lock, Event
+
+from .chromium_page import ChromiumPage
+from .._configs.chromium_options import ChromiumOptions
+from .._functions.settings import Settings
+from .._functions.tools import get_browser_memory
+from ..errors import WaitTimeoutError
+
+
+class BrowserPool(object):
+    """在后台保持若干个已启动并连接的浏览器，用lease()借出，用release()归还"""
+
+    def __init__(self, size=2, options=None, max_uses=0, max_memory=0):
+        """
+        :param size: 池中浏览器数量
+        :param options: 启动浏览器使用的ChromiumOptions对象，每个浏览器使用它的副本并自动分配端口
+        :param max_uses: 每个浏览器最多被借出多少次，达到后退出并启动新的，0为不限制
+        :param max_memory: 浏览器占用内存（MB）超过多少时退出并启动新的，在归还时检查，0为不限制
+        """
+        self.size = size
+        self.max_uses = max_uses
+        self.max_memory = max_memory
+        self._options = options or ChromiumOptions()
+        self._idle = Queue()
+        self._uses = {}  # 每个浏览器被借出的次数，格式：{ChromiumPage: int}
+        self._leased = set()
+        self._starting = 0
+        self._lock = Lock()
+        self._closed = Event()
+        self._fill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def idle_count(self):
+        """返回可借出的浏览器数量"""
+        return self._idle.qsize()
+
+    @property
+    def leased_count(self):
+        """返回已借出的浏览器数量"""
+        return len(self._leased)
+
+    def lease(self, timeout=None):
+        """借出一个浏览器，没有可用浏览器时等待
+        :param timeout: 等待超时时间（秒），为None时无限等待
+        :return: ChromiumPage对象，超时返回None
+        """
+        if self._closed.is_set():
+            raise RuntimeError('浏览器池已关闭。')
+        self._fill()
+        try:
+            page = self._idle.get(timeout=timeout)
+        except Empty:
+            if Settings.raise_when_wait_failed is True:
+                raise WaitTimeoutError(f'等待可用浏览器失败（等待{timeout}秒）。')
+            return None
+        if isinstance(page, Exception):  # 启动浏览器失败
+            raise page
+
+        with self._lock:
+            self._leased.add(page)
+            self._uses[page] = self._uses.get(page, 0) + 1
+        return page
+
+    def release(self, page):
+        """归还一个浏览器，关闭多余标签页并清除缓存和cookies，达到使用次数或内存上限时退出并换新
+        :param page: lease()借出的ChromiumPage对象
+        :return: None
+        """
+        with self._lock:
+            if page not in self._leased:
+                return
+            self._leased.discard(page)
+
+        if self._closed.is_set():
+            self._retire(page)
+            return
+
+        if ((self.max_uses and self._uses.get(page, 0) >= self.max_uses)
+                or (self.max_memory and self._memory(page) > self.max_memory)):
+            self._retire(page)
+            return
+
+        try:
+            self._reset(page)
+        except Exception:
+            self._retire(page)
+            return
+        self._idle.put(page)
+
+    @contextmanager
+    def page(self, timeout=None):
+        """以上下文管理器方式借出一个浏览器，退出时自动归还
+        :param timeout: 等待超时时间（秒），为None时无限等待
+        :return: ChromiumPage对象
+        """
+        page = self.lease(timeout)
+        try:
+            yield page
+        finally:
+            if page is not None:
+                self.release(page)
+
+    def close(self):
+        """退出池中所有浏览器，已借出的浏览器在归还时退出"""
+        self._closed.set()
+        while True:
+            try:
+                page = self._idle.get_nowait()
+            except Empty:
+                break
+            if not isinstance(page, Exception):
+                self._quit(page)
+
+    def _fill(self):
+        """在后台启动浏览器，直到总数达到size"""
+        with self._lock:
+            need = self.size - self._idle.qsize() - len(self._leased) - self._starting
+            self._starting += max(need, 0)
+        for _ in range(need):
+            th = Thread(target=self._start_one)
+            th.daemon = True
+            th.start()
+
+    def _start_one(self):
+        """启动一个浏览器并放入池中，启动失败时把异常放入池中，由lease()抛出"""
+        try:
+            page = self._launch()
+        except Exception as e:
+            page = e
+        with self._lock:
+            self._starting -= 1
+        if self._closed.is_set():
+            if not isinstance(page, Exception):
+                self._quit(page)
+        else:
+            self._idle.put(page)
+
+    def _launch(self):
+        """启动一个浏览器
+        :return: ChromiumPage对象
+        """
+        opt = deepcopy(self._options)
+        if not opt.is_auto_port:
+            opt.auto_port()
+        return ChromiumPage(opt)
+
+    def _reset(self, page):
+        """重置浏览器状态，只保留一个空白标签页
+        :param page: ChromiumPage对象
+        :return: None
+        """
+        page.close_tabs(others=True)
+        page.clear_cache(session_storage=False, local_storage=False)
+        page.get('about:blank')
+
+    def _retire(self, page):
+        """在后台退出一个浏览器，并启动新的补充
+        :param page: ChromiumPage对象
+        :return: None
+        """
+        with self._lock:
+            self._uses.pop(page, None)
+        th = Thread(target=self._quit, args=(page,))
+        th.daemon = True
+        th.start()
+        if not self._closed.is_set():
+            self._fill()
+
+    def _quit(self, page):
+        """退出一个浏览器
+        :param page: ChromiumPage对象
+        :return: None
+        """
+        with self._lock:
+            self._uses.pop(page, None)
+        try:
+            page.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _memory(page):
+        """返回浏览器所有进程占用的内存（MB）
+        :param page: ChromiumPage对象
+        :return: 内存大小
+        """
+        return get_browser_memory(page.browser)
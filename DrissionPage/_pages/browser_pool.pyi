@@ -0,0 +1,65 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from queue import Queue
+from threading import Lock, Event
+from typing import Optional, Dict, Set, Union, ContextManager
+
+from .chromium_page import ChromiumPage
+from .._configs.chromium_options import ChromiumOptions
+
+
+class BrowserPool(object):
+    size: int
+    max_uses: int
+    max_memory: float
+    _options: ChromiumOptions
+    _idle: Queue
+    _uses: Dict[ChromiumPage, int]
+    _leased: Set[ChromiumPage]
+    _starting: int
+    _lock: Lock
+    _closed: Event
+
+    def __init__(self,
+                 size: int = 2,
+                 options: Optional[ChromiumOptions] = None,
+                 max_uses: int = 0,
+                 max_memory: float = 0): ...
+
+    def __enter__(self) -> BrowserPool: ...
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    @property
+    def idle_count(self) -> int: ...
+
+    @property
+    def leased_count(self) -> int: ...
+
+    def lease(self, timeout: Optional[float] = None) -> Optional[ChromiumPage]: ...
+
+    def release(self, page: ChromiumPage) -> None: ...
+
+    def page(self, timeout: Optional[float] = None) -> ContextManager[Optional[ChromiumPage]]: ...
+
+    def close(self) -> None: ...
+
+    def _fill(self) -> None: ...
+
+    def _start_one(self) -> None: ...
+
+    def _launch(self) -> ChromiumPage: ...
+
+    def _reset(self, page: ChromiumPage) -> None: ...
+
+    def _retire(self, page: ChromiumPage) -> None: ...
+
+    def _quit(self, page: ChromiumPage) -> None: ...
+
+    @staticmethod
+    def _memory(page: ChromiumPage) -> float: ...
@@ -15,9 +15,10 @@ from time import perf_counter, sleep
 from DataRecorder.tools import make_valid_name
 
 from .._base.base import BasePage
-from .._elements.chromium_element import run_js, make_chromium_eles
+from .._elements.chromium_element import run_js, make_chromium_eles, wait_ele_in_page
 from .._elements.none_element import NoneElement
 from .._elements.session_element import make_session_ele
+from .._functions.extractor import chromium_extract
 from .._functions.locator import get_loc, is_loc
 from .._functions.settings import Settings
 from .._functions.tools import raise_error
@@ -93,7 +94,7 @@ class ChromiumBase(BasePage):
         self._is_reading = False
 
         if not tab_id:
-            tabs = self.browser.driver.get(f'http://{self.address}/json').json()
+            tabs = self.browser._get_targets()
             tabs = [(i['id'], i['url']) for i in tabs
                     if i['type'] in ('page', 'webview') and not i['url'].startswith('devtools://')]
             dialog = None
@@ -130,11 +131,11 @@ class ChromiumBase(BasePage):
         self._driver.set_callback('Page.javascriptDialogOpening', self._on_alert_open, immediate=True)
         self._driver.set_callback('Page.javascriptDialogClosed', self._on_alert_close)
 
-        self._driver.run('DOM.enable')
-        self._driver.run('Page.enable')
-        self._driver.run('Emulation.setFocusEmulationEnabled', enabled=True)
-
-        r = self.run_cdp('Page.getFrameTree')
+        r = self._driver.run_many([('DOM.enable',), ('Page.enable',),
+                                   ('Emulation.setFocusEmulationEnabled', {'enabled': True}),
+                                   ('Page.getFrameTree',)])[-1]
+        if __ERROR__ in r:
+            raise_error(r)
         for i in findall(r"'id': '(.*?)'", str(r)):
             self.browser._frames[i] = self.tab_id
         if not hasattr(self, '_frame_id'):
@@ -148,6 +149,21 @@ class ChromiumBase(BasePage):
         self._driver.set_callback('Page.frameAttached', self._onFrameAttached)
         self._driver.set_callback('Page.frameDetached', self._onFrameDetached)
 
+    def _rebind(self, tab_id):
+        """改为控制另一个标签页，用于换新或恢复标签页，旧标签页关闭时不再影响当前对象
+        :param tab_id: 新标签页id
+        :return: None
+        """
+        if self._listener is not None and self._listener.listening:
+            try:
+                self._listener.stop()
+            except Exception:
+                self._listener = None
+        if self._driver is not None:
+            self._driver.owner = None
+        self._driver_init(tab_id)
+        self._frame_id = self.run_cdp('Page.getFrameTree')['frameTree']['frame']['id']
+
     def _get_document(self, timeout=10):
         """获取页面文档
         :param timeout: 超时时间（秒）
@@ -236,6 +252,11 @@ class ChromiumBase(BasePage):
                 self._get_document(self._load_end_time - perf_counter() - .1)
             self._ready_state = 'complete'
 
+    def _on_reconnect(self):
+        """与页面的连接自动重连后执行，重新获取页面文档"""
+        self._is_reading = False
+        self._get_document()
+
     def _onFileChooserOpened(self, **kwargs):
         """文件选择框打开时执行"""
         if self._upload_list:
@@ -533,6 +554,17 @@ class ChromiumBase(BasePage):
         """
         return make_session_ele(self, locator, index=None)
 
+    def extract(self, locator, spec, columns=False, timeout=None):
+        """在页面中执行一次js，获取所有符合条件的元素的多个字段，比逐个读取元素属性快得多
+        :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+        :param spec: 字段说明dict，key为字段名，value为取值方式，或(定位符, 取值方式)表示取元素内第一个符合条件的元素的值，
+                     取值方式可以是'text'、'raw_text'、'html'、'inner_html'、'tag'或'@属性名'，找不到的值为None
+        :param columns: 为True时返回{字段名: 值列表}，为False时返回每个元素一个dict组成的列表
+        :param timeout: 等待出现符合条件元素的超时时间（秒），为None时使用页面timeout属性值
+        :return: dict组成的列表，或值列表组成的dict
+        """
+        return chromium_extract(self, locator, spec, columns, timeout)
+
     def _find_elements(self, locator, timeout=None, index=1, relative=False, raise_err=None):
         """执行元素查找
         :param locator: 定位符或元素对象
@@ -543,7 +575,8 @@ class ChromiumBase(BasePage):
         :return: ChromiumElement对象或元素对象组成的列表
         """
         if isinstance(locator, (str, tuple)):
-            loc = get_loc(locator)[1]
+            loc_tuple = get_loc(locator)
+            loc = loc_tuple[1]
         elif locator._type in ('ChromiumElement', 'ChromiumFrame'):
             return locator
         else:
@@ -562,6 +595,7 @@ class ChromiumBase(BasePage):
             num = result['resultCount']
             search_ids.append(result['searchId'])
 
+        waited = False
         while True:
             if num > 0:
                 from_index = index_arg = 0
@@ -588,7 +622,9 @@ class ChromiumBase(BasePage):
             if perf_counter() >= end_time:
                 return NoneElement(self) if index is not None else []
 
-            sleep(.1)
+            if waited:  # 上次等到了元素但仍未取得结果时，避免空转
+                sleep(.1)
+            waited = wait_ele_in_page(self, loc_tuple, min(end_time - perf_counter(), .5), abs(index) if index else 1)
             timeout = end_time - perf_counter()
             timeout = .5 if timeout <= 0 else timeout
             result = self.driver.run('DOM.performSearch', query=loc, _timeout=timeout, includeUserAgentShadowDOM=True)
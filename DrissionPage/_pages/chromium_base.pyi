@@ -6,7 +6,7 @@
 @License  : BSD 3-Clause.
 """
 from pathlib import Path
-from typing import Union, Tuple, List, Any, Optional, Literal
+from typing import Union, Tuple, List, Any, Optional, Literal, Dict
 
 from .chromium_tab import ChromiumTab
 from .._base.base import BasePage
@@ -68,6 +68,8 @@ class ChromiumBase(BasePage):
 
     def _driver_init(self, tab_id: str) -> None: ...
 
+    def _rebind(self, tab_id: str) -> None: ...
+
     def _get_document(self, timeout: float = 10) -> bool: ...
 
     def _wait_loaded(self, timeout: float = None) -> bool: ...
@@ -86,6 +88,8 @@ class ChromiumBase(BasePage):
 
     def _onFrameStoppedLoading(self, **kwargs): ...
 
+    def _on_reconnect(self) -> None: ...
+
     def _onFileChooserOpened(self, **kwargs): ...
 
     def _wait_to_stop(self): ...
@@ -195,6 +199,12 @@ class ChromiumBase(BasePage):
 
     def s_eles(self, locator: Union[Tuple[str, str], str]) -> List[SessionElement]: ...
 
+    def extract(self,
+                locator: Union[Tuple[str, str], str],
+                spec: Dict[str, Union[str, Tuple[Union[Tuple[str, str], str], str]]],
+                columns: bool = False,
+                timeout: float = None) -> Union[List[Dict[str, Any]], Dict[str, List[Any]]]: ...
+
     def _find_elements(self,
                        locator: Union[Tuple[str, str], str, ChromiumElement, ChromiumFrame],
                        timeout: float = None,
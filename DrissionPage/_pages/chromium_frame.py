@@ -98,7 +98,7 @@ class ChromiumFrame(ChromiumBase):
         try:
             super()._driver_init(tab_id)
         except:
-            self.browser.driver.get(f'http://{self.address}/json')
+            self.browser._sync_targets()
             super()._driver_init(tab_id)
         self._driver.set_callback('Inspector.detached', self._onInspectorDetached, immediate=True)
         self._driver.set_callback('Page.frameDetached', None)
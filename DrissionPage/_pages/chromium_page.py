@@ -7,18 +7,24 @@
 """
 from pathlib import Path
 from threading import Lock
-from time import sleep, perf_counter
+from time import sleep
 
 from requests import get
 
 from .._base.browser import Browser
+from .._base.driver import record_http
+from .._base.pipe import get_pipe
 from .._configs.chromium_options import ChromiumOptions
 from .._functions.browser import connect_browser
 from .._functions.settings import Settings
-from .._functions.tools import PortFinder
+from .._functions.tools import PortFinder, wait_pids_exit
 from .._pages.chromium_base import ChromiumBase, get_mhtml, get_pdf, Timeout
 from .._pages.chromium_tab import ChromiumTab
+from .._units.context_pool import ContextPool
+from .._units.governor import Governor
 from .._units.setter import ChromiumPageSetter
+from .._units.supervisor import Supervisor
+from .._units.tab_pool import TabPool
 from .._units.waiter import PageWaiter
 from ..errors import BrowserConnectError
 
@@ -65,6 +71,10 @@ class ChromiumPage(ChromiumBase):
         super().__init__(self.address, tab_id)
         self._type = 'ChromiumPage'
         self._lock = Lock()
+        self._tab_pool = None
+        self._governor = None
+        self._supervisor = None
+        self._context_pool = None
         self.set.timeouts(base=timeout)
         self._page_init()
 
@@ -76,7 +86,9 @@ class ChromiumPage(ChromiumBase):
         if self._is_exist and self._chromium_options._headless is False and 'headless' in r['userAgent'].lower():
             self._browser.quit(3)
             connect_browser(self._chromium_options)
-            ws = get(f'http://{self._chromium_options.address}/json/version', headers={'Connection': 'close'})
+            url = f'http://{self._chromium_options.address}/json/version'
+            ws = get(url, headers={'Connection': 'close'})
+            record_http(url, ws)
             ws = ws.json()['webSocketDebuggerUrl'].split('/')[-1]
             self._browser = Browser(self._chromium_options.address, ws, self)
 
@@ -97,6 +109,21 @@ class ChromiumPage(ChromiumBase):
         """浏览器相关设置"""
         self._browser.connect_to_page()
 
+    def _relaunch(self):
+        """浏览器退出后用同样的配置重新启动并连接，当前对象改为控制新浏览器的第一个标签页"""
+        if self._driver is not None:
+            self._driver.owner = None  # 避免旧连接断开时移除新的对象记录
+        if self._browser.process_id:  # 旧进程仍占用端口或用户文件夹时，用同样配置启动会失败
+            wait_pids_exit((self._browser.process_id,))
+        opt = handle_options(self._chromium_options)
+        self._is_exist, self._browser_id = run_browser(opt)
+        self._d_set_start_options(opt.address)
+        ChromiumPage._PAGES[self._browser_id] = self
+        self._run_browser()
+        self._page_init()
+        tabs = self._browser.tab_ids
+        self._rebind(tabs[0] if tabs else self._browser.new_tab())
+
     # ----------挂件----------
 
     @property
@@ -113,6 +140,34 @@ class ChromiumPage(ChromiumBase):
             self._wait = PageWaiter(self)
         return self._wait
 
+    @property
+    def tab_pool(self):
+        """返回标签页池，用于重复使用标签页对象"""
+        if self._tab_pool is None:
+            self._tab_pool = TabPool(self)
+        return self._tab_pool
+
+    @property
+    def context_pool(self):
+        """返回上下文池，用于在同一浏览器中管理多个互相隔离的会话"""
+        if self._context_pool is None:
+            self._context_pool = ContextPool(self)
+        return self._context_pool
+
+    @property
+    def governor(self):
+        """返回用于限制资源占用并自动换新标签页的对象"""
+        if self._governor is None:
+            self._governor = Governor(self)
+        return self._governor
+
+    @property
+    def supervisor(self):
+        """返回用于在浏览器或标签页崩溃后自动恢复的对象"""
+        if self._supervisor is None:
+            self._supervisor = Supervisor(self)
+        return self._supervisor
+
     # ----------挂件----------
 
     @property
@@ -134,6 +189,8 @@ class ChromiumPage(ChromiumBase):
     def latest_tab(self):
         """返回最新的标签页，最新标签页指最后创建或最后被激活的
         当Settings.singleton_tab_obj==True时返回Tab对象，否则返回tab id"""
+        if not self.browser._pipe:  # 手动切换标签页没有事件通知，从浏览器获取激活顺序
+            self.browser._sync_targets()
         return self.get_tab(self.tab_ids[0], as_id=not Settings.singleton_tab_obj)
 
     @property
@@ -207,19 +264,33 @@ class ChromiumPage(ChromiumBase):
         with self._lock:
             return [ChromiumTab(self, tab['id']) for tab in self._browser.find_tabs(title, url, tab_type)]
 
-    def new_tab(self, url=None, new_window=False, background=False, new_context=False):
+    def new_tab(self, url=None, new_window=False, background=False, new_context=False, context=None):
         """新建一个标签页
         :param url: 新标签页跳转到的网址
         :param new_window: 是否在新窗口打开标签页
         :param background: 是否不激活新标签页，如new_window为True则无效
-        :param new_context: 是否创建新的上下文
+        :param new_context: 是否创建新的上下文，标签页关闭时自动销毁
+        :param context: 在指定id的上下文中创建，new_context为True时无效
         :return: 新标签页对象
         """
-        tab = ChromiumTab(self, tab_id=self.browser.new_tab(new_window, background, new_context))
+        tab = ChromiumTab(self, tab_id=self.browser.new_tab(new_window, background, new_context, context))
         if url:
             tab.get(url)
         return tab
 
+    def new_tabs(self, count=None, urls=None, new_window=False, background=False, new_context=False, context=None):
+        """同时新建多个标签页，各标签页在创建时即开始加载网址，不等待加载完成
+        :param count: 要新建的标签页数量，为None时与urls数量相同
+        :param urls: 各标签页打开的网址组成的列表，不足count个的打开空白页
+        :param new_window: 是否在新窗口打开标签页
+        :param background: 是否不激活新标签页，如new_window为True则无效
+        :param new_context: 是否为每个标签页创建新的上下文，标签页关闭时自动销毁
+        :param context: 在指定id的上下文中创建，new_context为True时无效
+        :return: 新标签页对象组成的列表
+        """
+        return [ChromiumTab(self, tab_id=i)
+                for i in self.browser.new_tabs(count, urls, new_window, background, new_context, context)]
+
     def close(self):
         """关闭Page管理的标签页"""
         self.close_tabs(self.tab_id)
@@ -250,12 +321,7 @@ class ChromiumPage(ChromiumBase):
             self.quit()
             return
 
-        for tab in tabs:
-            self.browser.close_tab(tab)
-            sleep(.2)
-        end_time = perf_counter() + 3
-        while self.tabs_count != end_len and perf_counter() < end_time:
-            sleep(.1)
+        self.browser.close_tabs(tabs)
 
     def quit(self, timeout=5, force=True):
         """关闭浏览器
@@ -335,8 +401,12 @@ def handle_options(addr_or_opts):
 def run_browser(chromium_options):
     """连接浏览器"""
     is_exist = connect_browser(chromium_options)
+    if chromium_options.is_pipe:
+        return is_exist, get_pipe(chromium_options.address).browser_id
     try:
-        ws = get(f'http://{chromium_options.address}/json/version', headers={'Connection': 'close'})
+        url = f'http://{chromium_options.address}/json/version'
+        ws = get(url, headers={'Connection': 'close'})
+        record_http(url, ws)
         if not ws:
             raise BrowserConnectError('\n浏览器连接失败，如使用全局代理，须设置不代理127.0.0.1地址。')
         browser_id = ws.json()['webSocketDebuggerUrl'].split('/')[-1]
@@ -14,7 +14,11 @@ from .._configs.chromium_options import ChromiumOptions
 from .._pages.chromium_base import ChromiumBase
 from .._pages.chromium_tab import ChromiumTab
 from .._units.rect import TabRect
+from .._units.context_pool import ContextPool
+from .._units.governor import Governor
+from .._units.supervisor import Supervisor
 from .._units.setter import ChromiumPageSetter
+from .._units.tab_pool import TabPool
 from .._units.waiter import PageWaiter
 
 
@@ -38,6 +42,10 @@ class ChromiumPage(ChromiumBase):
         self._is_exist: bool = ...
         self._lock: Lock = ...
         self._browser_version: str = ...
+        self._tab_pool: Optional[TabPool] = ...
+        self._governor: Optional[Governor] = ...
+        self._supervisor: Optional[Supervisor] = ...
+        self._context_pool: Optional[ContextPool] = ...
 
     def _handle_options(self, addr_or_opts: Union[str, ChromiumOptions]) -> str: ...
 
@@ -45,6 +53,8 @@ class ChromiumPage(ChromiumBase):
 
     def _page_init(self) -> None: ...
 
+    def _relaunch(self) -> None: ...
+
     @property
     def browser(self) -> Browser: ...
 
@@ -69,6 +79,18 @@ class ChromiumPage(ChromiumBase):
     @property
     def set(self) -> ChromiumPageSetter: ...
 
+    @property
+    def tab_pool(self) -> TabPool: ...
+
+    @property
+    def context_pool(self) -> ContextPool: ...
+
+    @property
+    def governor(self) -> Governor: ...
+
+    @property
+    def supervisor(self) -> Supervisor: ...
+
     def save(self,
              path: Union[str, Path] = None,
              name: str = None,
@@ -104,7 +126,15 @@ class ChromiumPage(ChromiumBase):
                  as_id: bool = False) -> Union[List[ChromiumTab], List[str]]: ...
 
     def new_tab(self, url: str = None, new_window: bool = False, background: bool = False,
-                new_context: bool = False) -> ChromiumTab: ...
+                new_context: bool = False, context: str = None) -> ChromiumTab: ...
+
+    def new_tabs(self,
+                 count: int = None,
+                 urls: List[str] = None,
+                 new_window: bool = False,
+                 background: bool = False,
+                 new_context: bool = False,
+                 context: str = None) -> List[ChromiumTab]: ...
 
     def close(self) -> None: ...
 
@@ -14,6 +14,7 @@ from .._functions.settings import Settings
 from .._functions.web import set_session_cookies, set_browser_cookies
 from .._pages.chromium_base import ChromiumBase, get_mhtml, get_pdf
 from .._pages.session_page import SessionPage
+from .._units.governor import Governor
 from .._units.setter import TabSetter, WebPageTabSetter
 from .._units.waiter import TabWaiter
 
@@ -50,6 +51,7 @@ class ChromiumTab(ChromiumBase):
         self._browser = page.browser
         super().__init__(page.address, tab_id, page.timeout)
         self._rect = None
+        self._governor = None
         self._type = 'ChromiumTab'
 
     def _d_set_runtime_settings(self):
@@ -60,6 +62,17 @@ class ChromiumTab(ChromiumBase):
         self._load_mode = self.page._load_mode
         self._download_path = self.page.download_path
 
+    def _rebind(self, tab_id):
+        """改为控制另一个标签页，同时更新对象记录
+        :param tab_id: 新标签页id
+        :return: None
+        """
+        old_id = self.tab_id
+        super()._rebind(tab_id)
+        if ChromiumTab._TABS.get(old_id) is self:
+            ChromiumTab._TABS.pop(old_id)
+        ChromiumTab._TABS[tab_id] = self
+
     def close(self):
         """关闭当前标签页"""
         self.page.close_tabs(self.tab_id)
@@ -83,6 +96,13 @@ class ChromiumTab(ChromiumBase):
             self._wait = TabWaiter(self)
         return self._wait
 
+    @property
+    def governor(self):
+        """返回用于限制资源占用并自动换新标签页的对象"""
+        if self._governor is None:
+            self._governor = Governor(self)
+        return self._governor
+
     def save(self, path=None, name=None, as_pdf=False, **kwargs):
         """把当前页面保存为文件，如果path和name参数都为None，只返回文本
         :param path: 保存路径，为None且name不为None时保存在当前路径
@@ -97,7 +117,11 @@ class ChromiumTab(ChromiumBase):
         return f'<ChromiumTab browser_id={self.browser.id} tab_id={self.tab_id}>'
 
     def _on_disconnect(self):
-        ChromiumTab._TABS.pop(self.tab_id, None)
+        tab_id = self._driver.id  # 连接断开后tab_id为空
+        ChromiumTab._TABS.pop(tab_id, None)
+        browser = self.browser
+        if browser._supervisor is not None and not browser._quitting and tab_id in browser._targets:
+            browser._supervisor._on_tab_disconnect(self)  # 连接断开但标签页未关闭，交给Supervisor在重启后恢复
 
 
 class WebPageTab(SessionPage, ChromiumTab, BasePage):
@@ -301,6 +325,20 @@ class WebPageTab(SessionPage, ChromiumTab, BasePage):
         elif self._mode == 'd':
             return super(SessionPage, self).s_eles(locator)
 
+    def extract(self, locator, spec, columns=False, timeout=None):
+        """获取页面中所有符合条件的元素的多个字段，d模式在页面中执行一次js完成
+        :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+        :param spec: 字段说明dict，key为字段名，value为取值方式，或(定位符, 取值方式)表示取元素内第一个符合条件的元素的值，
+                     取值方式可以是'text'、'raw_text'、'html'、'inner_html'、'tag'或'@属性名'，找不到的值为None
+        :param columns: 为True时返回{字段名: 值列表}，为False时返回每个元素一个dict组成的列表
+        :param timeout: d模式等待出现符合条件元素的超时时间（秒），为None时使用页面timeout属性值
+        :return: dict组成的列表，或值列表组成的dict
+        """
+        if self._mode == 's':
+            return super().extract(locator, spec, columns)
+        elif self._mode == 'd':
+            return super(SessionPage, self).extract(locator, spec, columns, timeout)
+
     def change_mode(self, mode=None, go=True, copy_cookies=True):
         """切换模式，接收's'或'd'，除此以外的字符串会切换为 d 模式
         如copy_cookies为True，切换时会把当前模式的cookies复制到目标模式
@@ -6,7 +6,7 @@
 @License  : BSD 3-Clause.
 """
 from pathlib import Path
-from typing import Union, Tuple, Any, List, Optional
+from typing import Union, Tuple, Any, List, Optional, Dict
 
 from requests import Session, Response
 
@@ -19,6 +19,7 @@ from .._base.browser import Browser
 from .._elements.chromium_element import ChromiumElement
 from .._elements.session_element import SessionElement
 from .._units.rect import TabRect
+from .._units.governor import Governor
 from .._units.setter import TabSetter, WebPageTabSetter
 from .._units.waiter import TabWaiter
 
@@ -32,9 +33,12 @@ class ChromiumTab(ChromiumBase):
         self._page: ChromiumPage = ...
         self._browser: Browser = ...
         self._rect: Optional[TabRect] = ...
+        self._governor: Optional[Governor] = ...
 
     def _d_set_runtime_settings(self) -> None: ...
 
+    def _rebind(self, tab_id: str) -> None: ...
+
     def close(self) -> None: ...
 
     @property
@@ -46,6 +50,9 @@ class ChromiumTab(ChromiumBase):
     @property
     def wait(self) -> TabWaiter: ...
 
+    @property
+    def governor(self) -> Governor: ...
+
     def save(self,
              path: Union[str, Path] = None,
              name: str = None,
@@ -158,6 +165,12 @@ class WebPageTab(SessionPage, ChromiumTab):
 
     def s_eles(self, locator: Union[Tuple[str, str], str]) -> List[SessionElement]: ...
 
+    def extract(self,
+                locator: Union[Tuple[str, str], str],
+                spec: Dict[str, Union[str, Tuple[Union[Tuple[str, str], str], str]]],
+                columns: bool = False,
+                timeout: float = None) -> Union[List[Dict[str, Any]], Dict[str, List[Any]]]: ...
+
     def change_mode(self, mode: str = None, go: bool = True, copy_cookies: bool = True) -> None: ...
 
     def cookies_to_session(self, copy_user_agent: bool = True) -> None: ...
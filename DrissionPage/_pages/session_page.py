@@ -18,6 +18,7 @@ from tldextract import extract
 from .._base.base import BasePage
 from .._configs.session_options import SessionOptions
 from .._elements.session_element import SessionElement, make_session_ele
+from .._functions.extractor import session_extract
 from .._functions.web import cookie_to_dict, format_headers
 from .._units.setter import SessionPageSetter
 
@@ -210,6 +211,17 @@ class SessionPage(BasePage):
         """
         return self._ele(locator, index=None)
 
+    def extract(self, locator, spec, columns=False, timeout=None):
+        """获取页面中所有符合条件的元素的多个字段，返回格式与ChromiumPage.extract()相同
+        :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+        :param spec: 字段说明dict，key为字段名，value为取值方式，或(定位符, 取值方式)表示取元素内第一个符合条件的元素的值，
+                     取值方式可以是'text'、'raw_text'、'html'、'inner_html'、'tag'或'@属性名'，找不到的值为None
+        :param columns: 为True时返回{字段名: 值列表}，为False时返回每个元素一个dict组成的列表
+        :param timeout: 不起实际作用，用于和ChromiumPage对应，便于无差别调用
+        :return: dict组成的列表，或值列表组成的dict
+        """
+        return session_extract(self, locator, spec, columns)
+
     def _find_elements(self, locator, timeout=None, index=1, relative=True, raise_err=None):
         """返回页面中符合条件的元素、属性或节点文本，默认返回第一个
         :param locator: 元素的定位信息，可以是元素对象，loc元组，或查询字符串
@@ -6,7 +6,7 @@
 @License  : BSD 3-Clause.
 """
 from pathlib import Path
-from typing import Any, Union, Tuple, List, Optional
+from typing import Any, Union, Tuple, List, Optional, Dict
 
 from requests import Session, Response
 from requests.structures import CaseInsensitiveDict
@@ -105,6 +105,12 @@ class SessionPage(BasePage):
 
     def s_eles(self, loc: Union[Tuple[str, str], str]) -> List[SessionElement]: ...
 
+    def extract(self,
+                locator: Union[Tuple[str, str], str],
+                spec: Dict[str, Union[str, Tuple[Union[Tuple[str, str], str], str]]],
+                columns: bool = False,
+                timeout: float = None) -> Union[List[Dict[str, Any]], Dict[str, List[Any]]]: ...
+
     def _find_elements(self,
                        locator: Union[Tuple[str, str], str, SessionElement],
                        timeout: float = None,
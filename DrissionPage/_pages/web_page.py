@@ -235,6 +235,20 @@ class WebPage(SessionPage, ChromiumPage, BasePage):
         elif self._mode == 'd':
             return super(SessionPage, self).s_eles(locator)
 
+    def extract(self, locator, spec, columns=False, timeout=None):
+        """获取页面中所有符合条件的元素的多个字段，d模式在页面中执行一次js完成
+        :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+        :param spec: 字段说明dict，key为字段名，value为取值方式，或(定位符, 取值方式)表示取元素内第一个符合条件的元素的值，
+                     取值方式可以是'text'、'raw_text'、'html'、'inner_html'、'tag'或'@属性名'，找不到的值为None
+        :param columns: 为True时返回{字段名: 值列表}，为False时返回每个元素一个dict组成的列表
+        :param timeout: d模式等待出现符合条件元素的超时时间（秒），为None时使用页面timeout属性值
+        :return: dict组成的列表，或值列表组成的dict
+        """
+        if self._mode == 's':
+            return super().extract(locator, spec, columns)
+        elif self._mode == 'd':
+            return super(SessionPage, self).extract(locator, spec, columns, timeout)
+
     def change_mode(self, mode=None, go=True, copy_cookies=True):
         """切换模式，接收's'或'd'，除此以外的字符串会切换为 d 模式
         如copy_cookies为True，切换时会把当前模式的cookies复制到目标模式
@@ -354,15 +368,16 @@ class WebPage(SessionPage, ChromiumPage, BasePage):
         with self._lock:
             return [WebPageTab(self, tab['id']) for tab in self._browser.find_tabs(title, url, tab_type)]
 
-    def new_tab(self, url=None, new_window=False, background=False, new_context=False):
+    def new_tab(self, url=None, new_window=False, background=False, new_context=False, context=None):
         """新建一个标签页
         :param url: 新标签页跳转到的网址
         :param new_window: 是否在新窗口打开标签页
         :param background: 是否不激活新标签页，如new_window为True则无效
-        :param new_context: 是否创建新的上下文
+        :param new_context: 是否创建新的上下文，标签页关闭时自动销毁
+        :param context: 在指定id的上下文中创建，new_context为True时无效
         :return: 新标签页对象
         """
-        tab = WebPageTab(self, tab_id=self.browser.new_tab(new_window, background, new_context))
+        tab = WebPageTab(self, tab_id=self.browser.new_tab(new_window, background, new_context, context))
         if url:
             tab.get(url)
         return tab
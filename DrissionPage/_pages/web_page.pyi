@@ -5,7 +5,7 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
-from typing import Union, Tuple, List, Any, Optional
+from typing import Union, Tuple, List, Any, Optional, Dict
 
 from requests import Session, Response
 
@@ -116,6 +116,12 @@ class WebPage(SessionPage, ChromiumPage, BasePage):
 
     def s_eles(self, locator: Union[Tuple[str, str], str]) -> List[SessionElement]: ...
 
+    def extract(self,
+                locator: Union[Tuple[str, str], str],
+                spec: Dict[str, Union[str, Tuple[Union[Tuple[str, str], str], str]]],
+                columns: bool = False,
+                timeout: float = None) -> Union[List[Dict[str, Any]], Dict[str, List[Any]]]: ...
+
     def change_mode(self, mode: str = None, go: bool = True, copy_cookies: bool = True) -> None: ...
 
     def cookies_to_session(self, copy_user_agent: bool = True) -> None: ...
@@ -144,7 +150,8 @@ class WebPage(SessionPage, ChromiumPage, BasePage):
                 url: str = None,
                 new_window: bool = False,
                 background: bool = False,
-                new_context: bool = False) -> WebPageTab: ...
+                new_context: bool = False,
+                context: str = None) -> WebPageTab: ...
 
     def close_driver(self) -> None: ...
 
@@ -0,0 +1,164 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from contextlib import contextmanager
+from threading import Condition
+
+from .._functions.settings import Settings
+from ..errors import WaitTimeoutError
+
+
+class ContextPool(object):
+    """管理一组浏览器上下文，每个上下文的cookies、缓存和存储互相隔离，相当于同一浏览器中的独立会话，比启动多个浏览器节省资源"""
+
+    def __init__(self, page, max_contexts=0):
+        """
+        :param page: ChromiumPage对象
+        :param max_contexts: 最多同时存在多少个上下文，包括空闲和已借出的，0为不限制
+        """
+        self._page = page
+        self.max_contexts = max_contexts
+        self._idle = []
+        self._leased = set()
+        self._creating = 0  # 正在新建的上下文数量，新建时不持有锁
+        self._changed = Condition()
+
+    @property
+    def idle_count(self):
+        """返回空闲上下文数量"""
+        return len(self._idle)
+
+    @property
+    def leased_count(self):
+        """返回已借出的上下文数量"""
+        return len(self._leased)
+
+    def fill(self, count):
+        """批量预先新建空闲上下文，不超过max_contexts
+        :param count: 要达到的空闲上下文数量
+        :return: None
+        """
+        with self._changed:
+            need = count - len(self._idle) - self._creating
+            if self.max_contexts:
+                need = min(need, self.max_contexts - len(self._idle) - len(self._leased) - self._creating)
+            if need <= 0:
+                return
+            self._creating += need
+
+        contexts = []
+        try:
+            contexts = self._page.browser.new_contexts(need)
+        finally:
+            with self._changed:
+                self._creating -= need
+                self._idle.extend(contexts)
+                self._changed.notify_all()
+
+    def lease(self, timeout=None):
+        """借出一个上下文，优先使用空闲的，没有时新建，已达到max_contexts时等待归还
+        :param timeout: 等待超时时间（秒），为None时无限等待
+        :return: 上下文id，超时返回None
+        """
+        with self._changed:
+            ok = self._changed.wait_for(lambda: self._idle or not self.max_contexts
+                                        or len(self._leased) + self._creating < self.max_contexts, timeout)
+            if not ok:
+                if Settings.raise_when_wait_failed is True:
+                    raise WaitTimeoutError(f'等待可用上下文失败（等待{timeout}秒）。')
+                return None
+            if self._idle:
+                context_id = self._idle.pop()
+                self._leased.add(context_id)
+                return context_id
+            self._creating += 1  # 先占用名额，在锁外新建，不阻塞其它线程借出和归还
+
+        context_id = None
+        try:
+            context_id = self._page.browser.new_contexts(1)[0]
+        finally:
+            with self._changed:
+                self._creating -= 1
+                if context_id is not None:
+                    self._leased.add(context_id)
+                self._changed.notify_all()
+        return context_id
+
+    def release(self, context_id, dispose=True):
+        """归还一个上下文
+        :param context_id: lease()借出的上下文id
+        :param dispose: 为True时销毁上下文，清除其中所有数据；为False时只关闭其中的标签页，保留cookies等数据放回池中复用
+        :return: None
+        """
+        with self._changed:
+            if context_id not in self._leased:
+                return
+            self._leased.discard(context_id)
+
+        browser = self._page.browser
+        try:
+            if dispose:
+                browser.dispose_contexts((context_id,))
+            else:
+                tabs = self.tab_ids(context_id)
+                if tabs:
+                    browser.close_tabs(tabs)
+                with self._changed:
+                    self._idle.append(context_id)
+        finally:
+            with self._changed:
+                self._changed.notify_all()
+
+    @contextmanager
+    def context(self, timeout=None, dispose=True):
+        """以上下文管理器方式借出一个上下文，退出时自动归还
+        :param timeout: 等待超时时间（秒），为None时无限等待
+        :param dispose: 归还时是否销毁上下文
+        :return: 上下文id
+        """
+        context_id = self.lease(timeout)
+        try:
+            yield context_id
+        finally:
+            if context_id is not None:
+                self.release(context_id, dispose)
+
+    def new_tab(self, context_id, url=None, background=False):
+        """在指定上下文中新建一个标签页
+        :param context_id: 上下文id
+        :param url: 新标签页跳转到的网址
+        :param background: 是否不激活新标签页
+        :return: ChromiumTab对象
+        """
+        return self._page.new_tab(url, background=background, context=context_id)
+
+    def new_tabs(self, context_id, count=None, urls=None, background=False):
+        """在指定上下文中同时新建多个标签页
+        :param context_id: 上下文id
+        :param count: 要新建的标签页数量，为None时与urls数量相同
+        :param urls: 各标签页打开的网址组成的列表，不足count个的打开空白页
+        :param background: 是否不激活新标签页
+        :return: ChromiumTab对象组成的列表
+        """
+        return self._page.new_tabs(count, urls, background=background, context=context_id)
+
+    def tab_ids(self, context_id):
+        """返回指定上下文中所有标签页的id
+        :param context_id: 上下文id
+        :return: 标签页id组成的列表
+        """
+        return [i['targetId'] for i in self._page.browser.run_cdp('Target.getTargets')['targetInfos']
+                if i.get('browserContextId') == context_id and i['type'] in ('page', 'webview')]
+
+    def clear(self):
+        """销毁所有空闲上下文，已借出的上下文不受影响"""
+        with self._changed:
+            contexts = self._idle
+            self._idle = []
+            self._changed.notify_all()
+        if contexts:
+            self._page.browser.dispose_contexts(contexts)
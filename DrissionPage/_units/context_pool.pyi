@@ -0,0 +1,48 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from threading import Condition
+from typing import List, Optional, Set, ContextManager
+
+from .._pages.chromium_page import ChromiumPage
+from .._pages.chromium_tab import ChromiumTab
+
+
+class ContextPool(object):
+    def __init__(self, page: ChromiumPage, max_contexts: int = 0):
+        self._page: ChromiumPage = ...
+        self.max_contexts: int = ...
+        self._idle: List[str] = ...
+        self._leased: Set[str] = ...
+        self._creating: int = ...
+        self._changed: Condition = ...
+
+    @property
+    def idle_count(self) -> int: ...
+
+    @property
+    def leased_count(self) -> int: ...
+
+    def fill(self, count: int) -> None: ...
+
+    def lease(self, timeout: float = None) -> Optional[str]: ...
+
+    def release(self, context_id: str, dispose: bool = True) -> None: ...
+
+    def context(self, timeout: float = None, dispose: bool = True) -> ContextManager[Optional[str]]: ...
+
+    def new_tab(self, context_id: str, url: str = None, background: bool = False) -> ChromiumTab: ...
+
+    def new_tabs(self,
+                 context_id: str,
+                 count: int = None,
+                 urls: List[str] = None,
+                 background: bool = False) -> List[ChromiumTab]: ...
+
+    def tab_ids(self, context_id: str) -> List[str]: ...
+
+    def clear(self) -> None: ...
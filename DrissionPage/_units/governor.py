@@ -0,0 +1,165 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from threading import Thread, Event, Lock, current_thread
+
+from .._functions.tools import get_browser_memory
+
+METRICS = {'js_heap': 'JSHeapUsedSize', 'nodes': 'Nodes', 'listeners': 'JSEventListeners'}
+
+
+class Governor(object):
+    """定期检查标签页占用的资源，超过限制时换用新标签页并恢复网址和sessionStorage；
+    浏览器内存超过限制时经Supervisor重启浏览器"""
+
+    def __init__(self, owner):
+        """
+        :param owner: ChromiumPage或ChromiumTab对象
+        """
+        self._owner = owner
+        self.limits = {'js_heap': 0, 'nodes': 0, 'listeners': 0, 'rss': 0}
+        self.recycled = 0  # 已换新的次数（含重启浏览器）
+        self.last_sample = None  # 最近一次采样结果
+        self.on_recycle = None  # 换新后调用的方法，参数为(owner, reason)
+        self._perf_enabled = None  # 已启用Performance域的标签页id
+        self._stop_event = Event()
+        self._thread = None
+        self._lock = Lock()
+
+    def set_limits(self, js_heap=None, nodes=None, listeners=None, rss=None):
+        """设置资源上限，为None的项不修改，为0的项不检查
+        :param js_heap: js堆已用大小（MB）
+        :param nodes: DOM节点数量
+        :param listeners: js事件监听器数量
+        :param rss: 浏览器所有进程占用的内存（MB），超过时重启整个浏览器
+        :return: None
+        """
+        for k, v in (('js_heap', js_heap), ('nodes', nodes), ('listeners', listeners), ('rss', rss)):
+            if v is not None:
+                self.limits[k] = v
+
+    @property
+    def running(self):
+        """返回是否正在后台定期检查"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval=30):
+        """开始在后台定期检查，超限时自动换新。换新时正在执行的操作可能失败，要在安全时机换新可改为自行调用check()
+        :param interval: 检查间隔（秒）
+        :return: None
+        """
+        self.stop()
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, args=(interval,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """停止后台检查"""
+        self._stop_event.set()
+        if self._thread is not None and self._thread.is_alive() and self._thread is not current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def sample(self):
+        """采集一次资源数据
+        :return: {'js_heap': MB, 'nodes': int, 'listeners': int, 'rss': MB或None}，rss在未设置上限时为None
+        """
+        owner = self._owner
+        if self._perf_enabled != owner.tab_id:
+            owner.run_cdp('Performance.enable')
+            self._perf_enabled = owner.tab_id
+        metrics = {i['name']: i['value'] for i in owner.run_cdp('Performance.getMetrics')['metrics']}
+        r = {k: metrics.get(v, 0) for k, v in METRICS.items()}
+        r['js_heap'] /= 1048576
+        r['rss'] = get_browser_memory(owner.browser) if self.limits['rss'] else None
+        self.last_sample = r
+        return r
+
+    def check(self):
+        """采集一次资源数据，有任何一项超过上限时换新标签页，rss超限时重启浏览器
+        :return: 超限的项目名称，没有超限返回None
+        """
+        sample = self.sample()
+        for k, limit in self.limits.items():
+            if limit and sample[k] is not None and sample[k] > limit:
+                if k == 'rss':  # rss是整个浏览器的内存，换新一个标签页无法使其下降
+                    self.restart_browser(k)
+                else:
+                    self.recycle(k)
+                return k
+        return None
+
+    def restart_browser(self, reason=None):
+        """经所属ChromiumPage的Supervisor重启浏览器，所有页面对象绑定到新标签页并恢复网址
+        :param reason: 重启原因，传给on_recycle
+        :return: None
+        """
+        owner = self._owner
+        page = getattr(owner, 'page', owner)  # ChromiumTab的page属性是所属的ChromiumPage
+        with self._lock:
+            record = page.supervisor.restart()
+            self._perf_enabled = None
+            self.recycled += 1
+        if record['error']:
+            raise record['error']
+
+        if self.on_recycle:
+            self.on_recycle(owner, reason)
+
+    def recycle(self, reason=None):
+        """在同一上下文中新建标签页代替当前标签页，恢复网址和sessionStorage，然后关闭旧标签页。
+        cookies和localStorage属于上下文，不受影响；监听器会停止，初始化脚本不会保留
+        :param reason: 换新原因，传给on_recycle
+        :return: None
+        """
+        with self._lock:
+            owner = self._owner
+            browser = owner.browser
+            old_id = owner.tab_id
+            url = owner.url
+            try:
+                session = owner.run_js('return JSON.stringify(Object.entries(sessionStorage));')
+            except Exception:
+                session = None
+            context = browser.run_cdp('Target.getTargetInfo', targetId=old_id)['targetInfo'].get('browserContextId')
+
+            kwargs = {'url': '', 'background': True}
+            if context:
+                kwargs['browserContextId'] = context
+            new_id = browser.run_cdp('Target.createTarget', **kwargs)['targetId']
+
+            owner._rebind(new_id)
+            self._perf_enabled = None
+
+            if url and url != 'about:blank':
+                js_id = None
+                if session and session != '[]':
+                    js = (f'if(!sessionStorage.length){{for(const [k,v] of {session})'
+                          f'{{sessionStorage.setItem(k,v);}}}}')
+                    js_id = owner.run_cdp('Page.addScriptToEvaluateOnNewDocument', source=js)['identifier']
+                owner.get(url)
+                if js_id:
+                    owner.run_cdp('Page.removeScriptToEvaluateOnNewDocument', identifier=js_id)
+
+            browser.close_tabs((old_id,), timeout=0)
+            self.recycled += 1
+
+        if self.on_recycle:
+            self.on_recycle(owner, reason)
+
+    def _run(self, interval):
+        """后台检查的线程方法
+        :param interval: 检查间隔（秒）
+        :return: None
+        """
+        while not self._stop_event.wait(interval):
+            try:
+                self.check()
+            except Exception:
+                if self._owner.driver._stopped.is_set():  # 标签页已关闭
+                    break
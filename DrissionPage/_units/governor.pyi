@@ -0,0 +1,50 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from threading import Thread, Event, Lock
+from typing import Union, Optional, Callable, Dict, Any
+
+from .._pages.chromium_page import ChromiumPage
+from .._pages.chromium_tab import ChromiumTab
+
+METRICS: Dict[str, str] = ...
+
+
+class Governor(object):
+    def __init__(self, owner: Union[ChromiumPage, ChromiumTab]):
+        self._owner: Union[ChromiumPage, ChromiumTab] = ...
+        self.limits: Dict[str, float] = ...
+        self.recycled: int = ...
+        self.last_sample: Optional[Dict[str, Any]] = ...
+        self.on_recycle: Optional[Callable[[Union[ChromiumPage, ChromiumTab], Optional[str]], Any]] = ...
+        self._perf_enabled: Optional[str] = ...
+        self._stop_event: Event = ...
+        self._thread: Optional[Thread] = ...
+        self._lock: Lock = ...
+
+    def set_limits(self,
+                   js_heap: float = None,
+                   nodes: int = None,
+                   listeners: int = None,
+                   rss: float = None) -> None: ...
+
+    @property
+    def running(self) -> bool: ...
+
+    def start(self, interval: float = 30) -> None: ...
+
+    def stop(self) -> None: ...
+
+    def sample(self) -> Dict[str, Optional[float]]: ...
+
+    def check(self) -> Optional[str]: ...
+
+    def restart_browser(self, reason: str = None) -> None: ...
+
+    def recycle(self, reason: str = None) -> None: ...
+
+    def _run(self, interval: float) -> None: ...
@@ -0,0 +1,251 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from threading import Thread, Lock, Condition
+from time import perf_counter, time
+
+from .._functions.settings import Settings
+from ..errors import WaitTimeoutError
+
+
+class Supervisor(object):
+    """监视浏览器，标签页渲染进程崩溃时换用新标签页，浏览器进程退出时用同样的配置重启，
+    并把已有的ChromiumPage和ChromiumTab对象重新绑定到新标签页，恢复原来的网址"""
+
+    def __init__(self, page):
+        """
+        :param page: ChromiumPage对象
+        """
+        self._page = page
+        self.max_restarts = 3  # 最多自动重启浏览器的次数，0为不限制
+        self.restore_urls = True  # 恢复后是否重新访问原来的网址
+        self.on_recover = None  # 每次恢复后调用的方法，参数为(page, record)
+        self.records = []  # 恢复记录，每项格式见_new_record()
+        self._restarts = 0
+        self._running = False
+        self._pending = 0
+        self._changed = Condition()
+        self._lock = Lock()
+        self._detached = {}  # 连接断开但标签页未关闭的对象，格式：{ChromiumTab: url}
+
+    @property
+    def running(self):
+        """返回是否正在监视"""
+        return self._running
+
+    @property
+    def stats(self):
+        """返回恢复统计，耗时单位为秒，只统计成功的恢复
+        :return: {'crashes': 标签页崩溃次数, 'restarts': 浏览器重启次数, 'failed': 失败次数,
+                  'last_latency': 最近耗时, 'avg_latency': 平均耗时, 'max_latency': 最大耗时}
+        """
+        records = list(self.records)
+        latencies = [i['latency'] for i in records if i['error'] is None]
+        return {'crashes': len([i for i in records if i['type'] == 'crash']),
+                'restarts': len([i for i in records if i['type'] == 'restart' and i['error'] is None]),
+                'failed': len(records) - len(latencies),
+                'last_latency': latencies[-1] if latencies else None,
+                'avg_latency': sum(latencies) / len(latencies) if latencies else None,
+                'max_latency': max(latencies) if latencies else None}
+
+    def start(self):
+        """开始监视"""
+        self._running = True
+        self._page.browser._supervisor = self
+
+    def stop(self):
+        """停止监视，正在进行的恢复不受影响"""
+        self._running = False
+        if self._page.browser._supervisor is self:
+            self._page.browser._supervisor = None
+
+    def wait(self, timeout=None):
+        """等待正在进行的恢复完成
+        :param timeout: 超时时间（秒），为None时无限等待
+        :return: 是否等待成功
+        """
+        with self._changed:
+            ok = self._changed.wait_for(lambda: not self._pending, timeout)
+        if not ok and Settings.raise_when_wait_failed is True:
+            raise WaitTimeoutError(f'等待恢复完成失败（等待{timeout}秒）。')
+        return ok
+
+    def restart(self):
+        """立即关闭浏览器，用同样的配置重启并恢复所有页面对象
+        :return: 本次恢复的记录
+        """
+        urls = self._snapshot()
+        self._page.browser.quit()
+        return self._restart('manual', urls)
+
+    def _on_target_crashed(self, target_id, status=None):
+        """标签页渲染进程崩溃时由Browser调用
+        :param target_id: 崩溃的标签页id
+        :param status: 浏览器给出的终止状态
+        :return: None
+        """
+        if not self._running:
+            return
+        owner = self._owner_of(target_id)
+        if owner is not None:
+            self._run_in_thread(self._recover_tab, owner, target_id, status)
+
+    def _on_browser_exit(self, browser):
+        """浏览器连接断开且不是主动退出时由Browser调用
+        :param browser: 已断开的Browser对象
+        :return: None
+        """
+        if self._running and browser is self._page.browser:
+            self._run_in_thread(self._restart, 'exit', self._snapshot())
+
+    def _on_tab_disconnect(self, tab):
+        """标签页对象的连接断开但标签页未关闭时由ChromiumTab调用，记录下来以便重启后恢复
+        :param tab: ChromiumTab对象
+        :return: None
+        """
+        if tab.page is self._page:
+            with self._lock:
+                self._detached[tab] = tab.browser._targets.get(tab._driver.id, {}).get('url')
+
+    def _recover_tab(self, owner, target_id, status):
+        """在同一上下文中新建标签页代替崩溃的标签页，恢复网址，然后关闭崩溃的标签页
+        :param owner: 控制崩溃标签页的ChromiumPage或ChromiumTab对象
+        :param target_id: 崩溃的标签页id
+        :param status: 浏览器给出的终止状态
+        :return: 本次恢复的记录
+        """
+        record = self._new_record('crash', target_id, status)
+        begin = perf_counter()
+        with self._lock:
+            try:
+                browser = owner.browser
+                info = browser.run_cdp('Target.getTargetInfo', targetId=target_id)['targetInfo']
+                url = info['url']
+                kwargs = {'url': '', 'background': True}
+                if info.get('browserContextId'):
+                    kwargs['browserContextId'] = info['browserContextId']
+                owner._rebind(browser.run_cdp('Target.createTarget', **kwargs)['targetId'])
+                if self.restore_urls and url and url != 'about:blank':
+                    owner.get(url)
+                browser.close_tabs((target_id,), timeout=0)
+                record['latency'] = perf_counter() - begin
+            except Exception as e:
+                record['error'] = e
+        self._add_record(record)
+        return record
+
+    def _restart(self, reason, urls):
+        """用同样的配置重启浏览器，把页面对象绑定到新标签页并恢复网址
+        :param reason: 重启原因，'exit'或'manual'
+        :param urls: 重启前的页面对象和网址，格式：{ChromiumPage或ChromiumTab: url}
+        :return: 本次恢复的记录
+        """
+        page = self._page
+        record = self._new_record('restart', page.browser.id, reason)
+        begin = perf_counter()
+        with self._lock:
+            if reason != 'manual' and self.max_restarts and self._restarts >= self.max_restarts:
+                record['error'] = RuntimeError(f'已达到最多重启次数（{self.max_restarts}）。')
+                self._add_record(record)
+                return record
+            self._restarts += 1
+
+            try:
+                for obj in urls:
+                    if obj._driver is not None:
+                        obj._driver.owner = None  # 避免旧连接断开时移除新的对象记录
+                page._relaunch()
+                browser = page.browser
+                browser._supervisor = self
+
+                tabs = [i for i in urls if i is not page]
+                if tabs:
+                    for tab, tab_id in zip(tabs, browser.new_tabs(len(tabs), background=True)):
+                        tab._browser = browser
+                        tab._d_set_start_options(page.address)
+                        tab._rebind(tab_id)
+
+                if self.restore_urls:
+                    for obj, url in urls.items():
+                        if url and url != 'about:blank':
+                            obj.get(url)
+                record['latency'] = perf_counter() - begin
+            except Exception as e:
+                record['error'] = e
+        self._add_record(record)
+        return record
+
+    def _snapshot(self):
+        """收集属于当前浏览器的页面对象及其网址
+        :return: {ChromiumPage或ChromiumTab: url}
+        """
+        from .._pages.chromium_tab import ChromiumTab
+        page = self._page
+        browser = page.browser
+        with self._lock:
+            r = self._detached
+            self._detached = {}
+        r[page] = browser._targets.get(page._driver.id, {}).get('url')  # 连接断开后tab_id为空，从driver获取
+        for tab in list(ChromiumTab._TABS.values()):
+            if tab.page is page and tab._browser is browser and tab not in r:
+                r[tab] = browser._targets.get(tab._driver.id, {}).get('url')
+        return r
+
+    def _owner_of(self, target_id):
+        """返回控制指定标签页的页面对象
+        :param target_id: 标签页id
+        :return: ChromiumPage或ChromiumTab对象，没有时返回None
+        """
+        from .._pages.chromium_tab import ChromiumTab
+        if self._page.tab_id == target_id:
+            return self._page
+        tab = ChromiumTab._TABS.get(target_id)
+        return tab if tab is not None and tab.page is self._page else None
+
+    def _run_in_thread(self, func, *args):
+        """在新线程中执行恢复，并记录正在进行的数量
+        :param func: 要执行的方法
+        :param args: 参数
+        :return: None
+        """
+        with self._changed:
+            self._pending += 1
+
+        def run():
+            try:
+                func(*args)
+            finally:
+                with self._changed:
+                    self._pending -= 1
+                    self._changed.notify_all()
+
+        th = Thread(target=run)
+        th.daemon = True
+        th.start()
+
+    @staticmethod
+    def _new_record(record_type, target, reason):
+        """新建一条恢复记录
+        :param record_type: 'crash'为标签页崩溃，'restart'为浏览器重启
+        :param target: 崩溃的标签页id或退出的浏览器id
+        :param reason: 崩溃状态或重启原因
+        :return: dict格式的记录
+        """
+        return {'type': record_type, 'target': target, 'reason': reason, 'time': time(),
+                'latency': None, 'error': None, 'callback_error': None}
+
+    def _add_record(self, record):
+        """保存记录并调用回调方法，回调方法出错时把异常保存到记录的callback_error项
+        :param record: 恢复记录
+        :return: None
+        """
+        self.records.append(record)
+        if self.on_recover:
+            try:
+                self.on_recover(self._page, record)
+            except Exception as e:  # 在恢复线程中执行，出错时记录下来，不影响恢复结果
+                record['callback_error'] = e
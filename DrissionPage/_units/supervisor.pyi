@@ -0,0 +1,63 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from threading import Lock, Condition
+from typing import Union, Optional, Callable, Dict, List, Any
+
+from .._base.browser import Browser
+from .._pages.chromium_page import ChromiumPage
+from .._pages.chromium_tab import ChromiumTab
+
+
+class Supervisor(object):
+    def __init__(self, page: ChromiumPage):
+        self._page: ChromiumPage = ...
+        self.max_restarts: int = ...
+        self.restore_urls: bool = ...
+        self.on_recover: Optional[Callable[[ChromiumPage, dict], Any]] = ...
+        self.records: List[dict] = ...
+        self._restarts: int = ...
+        self._running: bool = ...
+        self._pending: int = ...
+        self._changed: Condition = ...
+        self._lock: Lock = ...
+        self._detached: Dict[ChromiumTab, Optional[str]] = ...
+
+    @property
+    def running(self) -> bool: ...
+
+    @property
+    def stats(self) -> Dict[str, Optional[float]]: ...
+
+    def start(self) -> None: ...
+
+    def stop(self) -> None: ...
+
+    def wait(self, timeout: float = None) -> bool: ...
+
+    def restart(self) -> dict: ...
+
+    def _on_target_crashed(self, target_id: str, status: str = None) -> None: ...
+
+    def _on_browser_exit(self, browser: Browser) -> None: ...
+
+    def _on_tab_disconnect(self, tab: ChromiumTab) -> None: ...
+
+    def _recover_tab(self, owner: Union[ChromiumPage, ChromiumTab], target_id: str, status: Optional[str]) -> dict: ...
+
+    def _restart(self, reason: str, urls: Dict[Union[ChromiumPage, ChromiumTab], Optional[str]]) -> dict: ...
+
+    def _snapshot(self) -> Dict[Union[ChromiumPage, ChromiumTab], Optional[str]]: ...
+
+    def _owner_of(self, target_id: str) -> Union[ChromiumPage, ChromiumTab, None]: ...
+
+    def _run_in_thread(self, func: Callable, *args) -> None: ...
+
+    @staticmethod
+    def _new_record(record_type: str, target: str, reason: Optional[str]) -> dict: ...
+
+    def _add_record(self, record: dict) -> None: ...
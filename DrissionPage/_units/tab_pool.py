@@ -0,0 +1,166 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from contextlib import contextmanager
+from threading import Lock
+from urllib.parse import urlparse
+
+# 归还标签页时清除标签页级设置的指令，执行结果不检查
+_RESET_CMDS = (('Network.setExtraHTTPHeaders', {'headers': {}}),
+               ('Network.setBlockedURLs', {'urls': []}),
+               ('Network.setCacheDisabled', {'cacheDisabled': False}),
+               ('Emulation.setUserAgentOverride', {'userAgent': ''}),
+               'Emulation.clearDeviceMetricsOverride',
+               'Emulation.clearGeolocationOverride',
+               'Emulation.clearIdleOverride',
+               ('Emulation.setEmulatedMedia', {'media': '', 'features': []}),
+               ('Emulation.setTimezoneOverride', {'timezoneId': ''}),
+               'Emulation.setLocaleOverride',
+               ('Emulation.setScriptExecutionDisabled', {'value': False}),
+               ('Emulation.setCPUThrottlingRate', {'rate': 1}))
+
+
+class TabPool(object):
+    """保持若干个停在about:blank的空闲标签页，借出时直接使用，归还时重置后放回，避免反复新建和关闭标签页"""
+
+    def __init__(self, page, max_idle=8, isolated=True):
+        """
+        :param page: ChromiumPage对象
+        :param max_idle: 最多保留多少个空闲标签页，超出的在归还时关闭
+        :param isolated: 是否每个标签页使用单独的上下文，为True时归还时清除cookies和存储，
+                         为False时与主页面共用cookies和存储，归还时不清除
+        """
+        self._page = page
+        self.max_idle = max_idle
+        self.isolated = isolated
+        self._idle = []
+        self._leased = set()
+        self._lock = Lock()
+
+    @property
+    def idle_count(self):
+        """返回空闲标签页数量"""
+        return len(self._idle)
+
+    @property
+    def leased_count(self):
+        """返回已借出的标签页数量"""
+        return len(self._leased)
+
+    def fill(self, count=None):
+        """预先新建空闲标签页
+        :param count: 要达到的空闲标签页数量，为None时使用max_idle
+        :return: None
+        """
+        count = (self.max_idle if count is None else count) - self.idle_count
+        if count > 0:
+            tabs = self._page.new_tabs(count, background=True, new_context=self.isolated)
+            with self._lock:
+                self._idle.extend(tabs)
+
+    def lease(self, url=None):
+        """借出一个标签页，没有空闲标签页时新建
+        :param url: 借出后要访问的网址
+        :return: ChromiumTab对象
+        """
+        tab = None
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                tab = self._idle.pop()
+            if self._alive(tab):
+                break
+            tab = None
+
+        if tab is None:
+            tab = self._page.new_tab(background=True, new_context=self.isolated)
+        with self._lock:
+            self._leased.add(tab)
+        if url:
+            tab.get(url)
+        return tab
+
+    def release(self, tab):
+        """归还一个标签页，重置后放回池中，空闲标签页已满或重置失败时关闭它
+        :param tab: lease()借出的ChromiumTab对象
+        :return: None
+        """
+        with self._lock:
+            if tab not in self._leased:
+                return
+            self._leased.discard(tab)
+            full = len(self._idle) >= self.max_idle
+
+        if full or not self._alive(tab):
+            self._close(tab)
+            return
+        try:
+            self._reset(tab)
+        except Exception:
+            self._close(tab)
+            return
+        with self._lock:
+            self._idle.append(tab)
+
+    @contextmanager
+    def tab(self, url=None):
+        """以上下文管理器方式借出一个标签页，退出时自动归还
+        :param url: 借出后要访问的网址
+        :return: ChromiumTab对象
+        """
+        tab = self.lease(url)
+        try:
+            yield tab
+        finally:
+            self.release(tab)
+
+    def clear(self):
+        """关闭所有空闲标签页，已借出的标签页不受影响"""
+        with self._lock:
+            tabs = self._idle
+            self._idle = []
+        alive = [t.tab_id for t in tabs if self._alive(t)]
+        if alive:
+            self._page.close_tabs(alive)
+
+    def _reset(self, tab):
+        """把标签页恢复到空白状态，清除额外请求头和各种模拟设置，使用单独上下文时清除cookies和当前网站的存储
+        :param tab: ChromiumTab对象
+        :return: None
+        """
+        if tab._listener is not None and tab._listener.listening:
+            tab._listener.stop()
+        url = urlparse(tab.url)
+        tab.get('about:blank')
+        cmds = list(_RESET_CMDS)
+        cmds.append('Page.resetNavigationHistory')
+        if self.isolated:
+            cmds.append('Network.clearBrowserCookies')
+            if url.scheme in ('http', 'https'):
+                cmds.append(('Storage.clearDataForOrigin', {'origin': f'{url.scheme}://{url.netloc}',
+                                                            'storageTypes': 'all'}))
+        tab.driver.run_many(cmds)
+
+    def _close(self, tab):
+        """关闭一个标签页
+        :param tab: ChromiumTab对象
+        :return: None
+        """
+        if self._alive(tab):
+            try:
+                self._page.close_tabs(tab)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _alive(tab):
+        """返回标签页是否仍然连接
+        :param tab: ChromiumTab对象
+        :return: bool
+        """
+        return tab._driver is not None and not tab._driver._stopped.is_set()
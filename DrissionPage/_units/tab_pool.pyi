@@ -0,0 +1,47 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from threading import Lock
+from typing import ContextManager, List, Optional, Set, Tuple, Union
+
+from .._pages.chromium_page import ChromiumPage
+from .._pages.chromium_tab import ChromiumTab
+
+_RESET_CMDS: Tuple[Union[str, Tuple[str, dict]], ...]
+
+
+class TabPool(object):
+    def __init__(self, page: ChromiumPage, max_idle: int = 8, isolated: bool = True):
+        self._page: ChromiumPage = ...
+        self.max_idle: int = ...
+        self.isolated: bool = ...
+        self._idle: List[ChromiumTab] = ...
+        self._leased: Set[ChromiumTab] = ...
+        self._lock: Lock = ...
+
+    @property
+    def idle_count(self) -> int: ...
+
+    @property
+    def leased_count(self) -> int: ...
+
+    def fill(self, count: Optional[int] = None) -> None: ...
+
+    def lease(self, url: str = None) -> ChromiumTab: ...
+
+    def release(self, tab: ChromiumTab) -> None: ...
+
+    def tab(self, url: str = None) -> ContextManager[ChromiumTab]: ...
+
+    def clear(self) -> None: ...
+
+    def _reset(self, tab: ChromiumTab) -> None: ...
+
+    def _close(self, tab: ChromiumTab) -> None: ...
+
+    @staticmethod
+    def _alive(tab: ChromiumTab) -> bool: ...
@@ -11,6 +11,26 @@ from .._functions.locator import get_loc
 from .._functions.settings import Settings
 from ..errors import WaitTimeoutError, NoRectError
 
+# 在页面中等待元素显示状态变成mode，判断方式与ElementStates.is_displayed相同。
+# dom变化时立即检查，另每0.1秒检查一次以覆盖样式表、动画等不产生dom变化的情况
+_DISPLAYED_JS = '''function(mode, timeout){
+const el = this;
+const state = () => {
+    const s = window.getComputedStyle(el);
+    return !(s.getPropertyValue('visibility') === 'hidden' || el.offsetParent === null
+             || s.getPropertyValue('display') === 'none' || el.hidden) === mode;
+};
+if(state()){return true;}
+return new Promise(resolve => {
+    let t, i;
+    const ob = new MutationObserver(() => {if(state()){done(true);}});
+    function done(r){ob.disconnect(); clearTimeout(t); clearInterval(i); resolve(r);}
+    ob.observe(el.ownerDocument, {childList: true, subtree: true, attributes: true, characterData: true});
+    i = setInterval(() => {if(state()){done(true);}}, 100);
+    t = setTimeout(() => done(state()), timeout);
+});
+}'''
+
 
 class OriginWaiter(object):
     def __call__(self, second, scope=None):
@@ -514,7 +534,13 @@ class ElementWaiter(OriginWaiter):
         err_text = err_text or '等待元素状态改变失败（等待{}秒）。'
         if timeout is None:
             timeout = self._owner.timeout
-        end_time = perf_counter() + timeout
+        if (attr == 'is_displayed' and Settings.ele_wait_mode == 'observer'
+                and getattr(self._ele, '_type', None) == 'ChromiumElement'):
+            if self._ele.run_js(_DISPLAYED_JS, mode, int(timeout * 1000), timeout=timeout + Settings.cdp_timeout):
+                return True
+            end_time = perf_counter()
+        else:
+            end_time = perf_counter() + timeout
         while perf_counter() < end_time:
             a = self._ele.states.__getattribute__(attr)
             if (a and mode) or (not a and not mode):
@@ -13,6 +13,8 @@ from .._pages.chromium_base import ChromiumBase
 from .._pages.chromium_frame import ChromiumFrame
 from .._pages.chromium_page import ChromiumPage
 
+_DISPLAYED_JS: str = ...
+
 
 class OriginWaiter(object):
     def __call__(self, second: float, scope: float = None) -> None: ...
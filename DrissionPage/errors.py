@@ -93,3 +93,7 @@ class CookieFormatError(BaseError):
 
 class TargetNotFoundError(BaseError):
     _info = '找不到指定页面。'
+
+
+class WorkerExitedError(BaseError):
+    _info = '工作进程意外退出。'